@@ -0,0 +1,223 @@
+"""
+End-to-end performance benchmark of FleetIQ on a seeded database (see
+generate_fleet_data.py). Measures wall time and SQL query count of:
+
+* every GET /fleetflow/* endpoint and the main JSON-RPC ones, through a
+  werkzeug test client against the in-process WSGI application;
+* the dashboard aggregation, the Command Center KPIs, the vehicle stored
+  computes and the dispatch matcher;
+* the cost report values and HTML rendering, over a year for the whole fleet;
+* a full trip CSV export job.
+
+    FLEETFLOW_BENCH_OUTPUT=bench-10k.json \\
+        odoo-bin shell -c odoo.conf -d <db> < benchmarks/bench_fleetflow.py
+
+Settings (environment variables):
+
+* FLEETFLOW_BENCH_ROUNDS: runs per case, the best one is kept (default 3)
+* FLEETFLOW_BENCH_LOGIN / FLEETFLOW_BENCH_PASSWORD: user for auth='user'
+  routes (default admin / admin)
+* FLEETFLOW_BENCH_OUTPUT: write the results as JSON to this file
+* FLEETFLOW_BENCH_BASELINE: JSON results of a previous run; any case more
+  than FLEETFLOW_BENCH_TOLERANCE (default 0.2, i.e. 20%) slower, or running
+  more queries, is reported and the script exits non-zero
+
+Run it once per scale (1k / 10k / 100k vehicles, one database each) and
+keep the JSON files: the "scale" field records the vehicle count. Write
+operations run inside transactions that are rolled back, so the seeded data
+is left as it is.
+
+The query and time budgets every change must meet are enforced by the
+fleetflow_perf tests (tests/test_performance.py):
+
+    odoo-bin -c odoo.conf -d <db> -u fleetflow --test-tags fleetflow_perf --stop-after-init
+"""
+import datetime
+import json
+import os
+import sys
+import time
+
+from werkzeug.test import Client
+
+import odoo
+from odoo import sql_db
+
+
+def _count_queries():
+    return sql_db.sql_counter
+
+
+class Bench:
+    def __init__(self, env, rounds):
+        self.env = env
+        self.rounds = rounds
+        self.results = {}
+
+    def measure(self, name, func):
+        """Run ``func`` ``rounds`` times; keep the fastest run."""
+        best = None
+        for _round in range(self.rounds):
+            self.env.invalidate_all()
+            queries = _count_queries()
+            started = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - started) * 1000
+            queries = _count_queries() - queries
+            if best is None or elapsed < best[0]:
+                best = (elapsed, queries)
+        self.results[name] = {'ms': round(best[0], 2), 'queries': best[1]}
+        print(f'  {name:<48} {best[0]:>10.1f} ms {best[1]:>8} queries', flush=True)
+
+    def rollback(self, func):
+        """Wrap ``func`` so its writes are rolled back afterwards."""
+        def wrapper():
+            with self.env.cr.savepoint(flush=False) as savepoint:
+                func()
+                self.env.flush_all()
+                savepoint.rollback()
+        return wrapper
+
+
+class HttpBench:
+    """Calls routes on the in-process WSGI app; each request runs in its own
+    cursor, as in production."""
+
+    def __init__(self, dbname, login, password):
+        self.client = Client(odoo.http.root)
+        self.dbname = dbname
+        self.login = login
+        self.password = password
+
+    def authenticate(self):
+        response = self.post('/web/session/authenticate', {
+            'db': self.dbname, 'login': self.login, 'password': self.password,
+        })
+        return 'error' not in response
+
+    def get(self, path, **query):
+        def call():
+            response = self.client.get(path, query_string=dict(query, db=self.dbname))
+            assert response.status_code in (200, 304), f'{path}: {response.status_code}'
+            response.get_data()
+        return call
+
+    def post(self, path, params):
+        response = self.client.post(path, json={'jsonrpc': '2.0', 'id': 1, 'params': params},
+                                    query_string={'db': self.dbname})
+        return json.loads(response.get_data() or b'{}')
+
+    def rpc(self, path, params):
+        def call():
+            result = self.post(path, params)
+            assert 'error' not in result, f'{path}: {result["error"]}'
+            payload = result.get('result')
+            assert not (isinstance(payload, dict) and payload.get('status') == 'error'), f'{path}: {payload}'
+        return call
+
+
+def run(env, rounds, login, password):
+    env = env(su=True)
+    bench = Bench(env, rounds)
+    http = HttpBench(env.cr.dbname, login, password)
+    Vehicle = env['fleetflow.vehicle']
+    companies = Vehicle.search([]).company_id
+    company = companies[:1]
+    scale = Vehicle.search_count([])
+    print(f'FleetIQ benchmark: {scale} vehicles, {env["fleetflow.trip"].search_count([])} trips, '
+          f'{rounds} rounds')
+
+    print('\nAPI')
+    for path in ('/fleetflow/vehicles', '/fleetflow/drivers', '/fleetflow/trips',
+                 '/fleetflow/maintenance', '/fleetflow/expenses'):
+        bench.measure(f'GET {path}', http.get(path))
+        bench.measure(f'GET {path}?limit=1000', http.get(path, limit=1000))
+    for path in ('/fleetflow/trips', '/fleetflow/maintenance', '/fleetflow/expenses'):
+        bench.measure(f'GET {path}?format=ndjson', http.get(path, format='ndjson'))
+    bench.measure('GET /fleetflow/analytics/costs?interval=month',
+                  http.get('/fleetflow/analytics/costs', interval='month',
+                           date_from=str(datetime.date.today() - datetime.timedelta(days=365))))
+    bench.measure('POST /fleetflow/sync (all collections)', http.rpc('/fleetflow/sync', {'limit': 1000}))
+    if http.authenticate():
+        bench.measure('POST /fleetflow/command_center/data', http.rpc('/fleetflow/command_center/data', {}))
+    else:
+        print(f'  (skipping auth=user routes: cannot log in as {login})')
+
+    print('\nModels')
+    bench.measure('dashboard _aggregate_dashboard_data',
+                  lambda: env['fleetflow.dashboard']._aggregate_dashboard_data(company))
+    bench.measure('command center _compute_command_center_data',
+                  lambda: Vehicle.with_company(company)._compute_command_center_data(None, None))
+    sample = Vehicle.search([], limit=1000)
+    fnames = ['trip_count', 'total_revenue', 'total_fuel_cost', 'total_liters',
+              'total_maintenance_cost', 'total_operational_cost', 'fuel_efficiency', 'roi']
+
+    def recompute_vehicles():
+        for fname in fnames:
+            env.add_to_compute(Vehicle._fields[fname], sample)
+        sample._recompute_recordset(fnames)
+    bench.measure(f'vehicle stored computes ({len(sample)} vehicles)', bench.rollback(recompute_vehicles))
+    drafts = env['fleetflow.trip'].search_count([('company_id', '=', company.id), ('state', '=', 'draft')])
+    bench.measure(f'dispatch matcher ({drafts} draft trips)',
+                  lambda: env['fleetflow.trip']._match_draft_trips(company))
+
+    print('\nReports and exports')
+    Report = env['report.fleetflow.report_vehicle_monthly_cost_template']
+    data = {
+        'date_from': str(datetime.date.today() - datetime.timedelta(days=365)),
+        'date_to': str(datetime.date.today()),
+        'grouping': 'month',
+        'all_vehicles': True,
+    }
+    bench.measure('cost report values (fleet, 12 months)', lambda: Report._get_report_values([], data))
+    sample_ids = sample[:100].ids
+    bench.measure('cost report HTML (100 vehicles, 12 months)', lambda: env['ir.actions.report']._render_qweb_html(
+        'fleetflow.action_report_vehicle_monthly_cost_summary', sample_ids, data=dict(data, all_vehicles=False)))
+
+    def export_trips():
+        job = env['fleetflow.export.job']._enqueue(env['fleetflow.trip'])
+        job._run_slice(deadline=float('inf'))
+        job._remove_file()
+    bench.measure('trip CSV export job (all trips)', bench.rollback(export_trips))
+
+    return {'scale': scale, 'date': datetime.datetime.now().isoformat(), 'results': bench.results}
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in results['results'].items():
+        previous = baseline['results'].get(name)
+        if not previous:
+            continue
+        if current['ms'] > previous['ms'] * (1 + tolerance) or current['queries'] > previous['queries']:
+            regressions.append((name, previous, current))
+    for name, previous, current in regressions:
+        print(f"REGRESSION {name}: {previous['ms']} ms / {previous['queries']} queries "
+              f"-> {current['ms']} ms / {current['queries']} queries")
+    return not regressions
+
+
+def main(env):
+    rounds = int(os.environ.get('FLEETFLOW_BENCH_ROUNDS', 3))
+    login = os.environ.get('FLEETFLOW_BENCH_LOGIN', 'admin')
+    password = os.environ.get('FLEETFLOW_BENCH_PASSWORD', 'admin')
+    results = run(env, rounds, login, password)
+    env.cr.rollback()
+
+    output = os.environ.get('FLEETFLOW_BENCH_OUTPUT')
+    if output:
+        with open(output, 'w') as fp:
+            json.dump(results, fp, indent=2)
+    baseline = os.environ.get('FLEETFLOW_BENCH_BASELINE')
+    if baseline:
+        with open(baseline) as fp:
+            baseline_results = json.load(fp)
+        if baseline_results.get('scale') != results['scale']:
+            print(f"warning: baseline scale {baseline_results.get('scale')} != {results['scale']}")
+        return compare(results, baseline_results, float(os.environ.get('FLEETFLOW_BENCH_TOLERANCE', 0.2)))
+    return True
+
+
+if 'env' in globals():
+    if not main(env):  # noqa: F821 - provided by odoo-bin shell
+        sys.exit(1)
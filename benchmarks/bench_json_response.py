@@ -0,0 +1,104 @@
+"""
+Compare the old and new JSON response paths of the FleetIQ API.
+
+    python benchmarks/bench_json_response.py [rows ...]
+
+"before" is the original ``json.dumps(data, default=str)``; "after" is
+controllers/encoding.py (orjson when installed, stdlib otherwise) with and
+without gzip. Payloads mimic the /fleetflow/vehicles and /fleetflow/trips
+list envelopes. Runs without Odoo.
+"""
+import datetime
+import gzip
+import importlib.util
+import json
+import os
+import random
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+spec = importlib.util.spec_from_file_location(
+    'fleetflow_encoding', os.path.join(HERE, '..', 'controllers', 'encoding.py'))
+encoding = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(encoding)
+
+STATUSES = ['available', 'in_use', 'maintenance']
+TYPES = ['car', 'truck', 'van', 'bus', 'other']
+
+
+def vehicle_rows(n, rnd):
+    return [{
+        'id': i,
+        'name': f'Vehicle {i:06d}',
+        'license_plate': f'PL-{i:06d}',
+        'vin': f'VIN{i:014d}',
+        'vehicle_type': rnd.choice(TYPES),
+        'fuel_type': 'diesel',
+        'capacity': rnd.randint(2, 60),
+        'max_capacity': round(rnd.uniform(1, 40), 2),
+        'odometer': round(rnd.uniform(0, 400000), 1),
+        'status': rnd.choice(STATUSES),
+        'driver': f'Driver {i % 997}',
+        'driver_id': i % 997,
+        'total_revenue': round(rnd.uniform(0, 1e6), 2),
+        'total_operational_cost': round(rnd.uniform(0, 5e5), 2),
+        'roi': round(rnd.uniform(-1, 3), 4),
+    } for i in range(1, n + 1)]
+
+
+def trip_rows(n, rnd):
+    today = datetime.date.today()
+    return [{
+        'id': i,
+        'name': f'TRP2610-{i:05d}',
+        'vehicle': f'Vehicle {i % 5000:06d}',
+        'vehicle_id': i % 5000,
+        'driver': f'Driver {i % 997}',
+        'driver_id': i % 997,
+        'origin': rnd.choice(['Lyon', 'Paris', 'Marseille', 'Lille']),
+        'destination': rnd.choice(['Nantes', 'Bordeaux', 'Nice', 'Rennes']),
+        'cargo_weight': round(rnd.uniform(0, 30), 2),
+        'revenue': round(rnd.uniform(100, 9000), 2),
+        'state': rnd.choice(['draft', 'dispatched', 'done', 'cancelled']),
+        'start_odometer': round(rnd.uniform(0, 400000), 1),
+        'end_odometer': round(rnd.uniform(0, 400000), 1),
+        'date': today - datetime.timedelta(days=i % 365),
+    } for i in range(1, n + 1)]
+
+
+def envelope(rows):
+    return {'status': 'ok', 'count': len(rows), 'limit': len(rows), 'next_cursor': None, 'data': rows}
+
+
+def best_ms(func, number=5):
+    return min(timeit.repeat(func, number=1, repeat=number)) * 1000
+
+
+def bench(label, data):
+    before = json.dumps(data, default=str).encode()
+    after = encoding.dumps(data)
+    after_gz = gzip.compress(after, compresslevel=encoding.COMPRESS_LEVEL)
+    results = [
+        ('before  json.dumps(default=str)', len(before),
+         best_ms(lambda: json.dumps(data, default=str).encode())),
+        ('after   encoding.dumps', len(after),
+         best_ms(lambda: encoding.dumps(data))),
+        ('after   encoding.dumps + gzip', len(after_gz),
+         best_ms(lambda: encoding.compress(encoding.dumps(data), 'gzip'))),
+    ]
+    print(f'\n{label}')
+    for name, size, ms in results:
+        print(f'  {name:<34} {size:>12,} B {ms:>10.2f} ms')
+
+
+def main(sizes):
+    rnd = random.Random(42)
+    print(f"encoder: {'orjson' if encoding.orjson else 'stdlib json'}")
+    for n in sizes:
+        bench(f'/fleetflow/vehicles  {n:,} rows', envelope(vehicle_rows(n, rnd)))
+        bench(f'/fleetflow/trips     {n:,} rows', envelope(trip_rows(n, rnd)))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000])
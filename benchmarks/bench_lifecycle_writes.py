@@ -0,0 +1,185 @@
+"""
+Count the rows written by each step of the trip and maintenance lifecycle,
+per table, on a seeded database (see generate_fleet_data.py).
+
+    odoo-bin shell -c odoo.conf -d <db> < benchmarks/bench_lifecycle_writes.py
+
+The steps run on the available vehicle with the longest maintenance history
+and a driver licensed for it:
+
+* create a trip, dispatch it, log a fuel expense on it, complete it;
+* log a maintenance job (the vehicle goes to the shop), make the vehicle
+  available again;
+* dispatch a second trip and cancel it.
+
+Every INSERT, UPDATE and DELETE is counted with the number of rows it
+touched, including the work of the precommit hooks (daily cost rollup,
+dashboard snapshot). Writes whose count grows with the vehicle's history
+are the fan-out this benchmark is meant to catch. Everything is rolled back.
+
+Settings (environment variables):
+
+* FLEETFLOW_BENCH_OUTPUT: write the counts as JSON to this file
+* FLEETFLOW_BENCH_BASELINE: JSON counts of a previous run (for instance on
+  an older commit), printed side by side with the current ones; the script
+  exits non-zero if a step writes more rows than in the baseline
+"""
+import datetime
+import json
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+WRITE_RE = re.compile(r'^\s*(INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+@contextmanager
+def count_writes():
+    """Count ``{table: [statements, rows]}`` of the writes of this thread."""
+    counts = {}
+
+    def hook(cr, query, params, start, delay):
+        text = query.code if hasattr(query, 'code') else str(query)
+        match = WRITE_RE.match(text)
+        if match:
+            entry = counts.setdefault(match.group(2), [0, 0])
+            entry[0] += 1
+            entry[1] += max(cr.rowcount, 0)
+
+    thread = threading.current_thread()
+    hooks = getattr(thread, 'query_hooks', None)
+    if hooks is None:
+        hooks = thread.query_hooks = []
+    hooks.append(hook)
+    try:
+        yield counts
+    finally:
+        hooks.remove(hook)
+
+
+def pick_vehicle_and_driver(env):
+    """Return the available vehicle with the most maintenance jobs and an
+    idle driver licensed for it."""
+    groups = env['fleetflow.maintenance']._read_group(
+        [('vehicle_id.status', '=', 'available'), ('vehicle_id.active', '=', True)],
+        ['vehicle_id'], ['__count'], order='__count DESC', limit=20,
+    )
+    for vehicle, _count in groups:
+        drivers = env['fleetflow.driver'].search([
+            ('company_id', '=', vehicle.company_id.id),
+            ('license_category', '=', vehicle.vehicle_type),
+            '|', ('license_expiry', '=', False), ('license_expiry', '>=', datetime.date.today()),
+        ], limit=50)
+        busy = {driver for [driver] in env['fleetflow.trip']._read_group(
+            [('driver_id', 'in', drivers.ids), ('state', '=', 'dispatched')], ['driver_id'])}
+        idle = drivers.filtered(lambda d: d not in busy)
+        if idle:
+            return vehicle, idle[0]
+    return None, None
+
+
+def steps(env, vehicle, driver):
+    """Yield ``(name, callable)``; each step builds on the previous ones."""
+    Trip = env['fleetflow.trip']
+    trip_vals = {
+        'vehicle_id': vehicle.id,
+        'driver_id': driver.id,
+        'origin': 'Lyon',
+        'destination': 'Paris',
+        'revenue': 500.0,
+    }
+    trips = []
+
+    yield 'trip create', lambda: trips.append(Trip.create(trip_vals))
+    yield 'trip dispatch', lambda: trips[0].action_dispatch()
+    yield 'expense create', lambda: env['fleetflow.expense'].create({
+        'vehicle_id': vehicle.id, 'trip_id': trips[0].id, 'liters': 40.0, 'fuel_cost': 75.0,
+    })
+
+    def complete():
+        trips[0].end_odometer = trips[0].start_odometer + 460.0
+        trips[0].action_complete()
+    yield 'trip complete', complete
+    yield 'maintenance create', lambda: env['fleetflow.maintenance'].create({
+        'vehicle_id': vehicle.id, 'issue': 'Brake pads', 'cost': 320.0,
+    })
+    yield 'vehicle back to available', lambda: vehicle.write({'status': 'available'})
+
+    def dispatch_second():
+        trips.append(Trip.create(trip_vals))
+        trips[1].action_dispatch()
+    yield 'second trip create + dispatch', dispatch_second
+    yield 'trip cancel', lambda: trips[1].action_cancel()
+
+
+def run(env):
+    env = env(su=True)
+    vehicle, driver = pick_vehicle_and_driver(env)
+    if not vehicle:
+        print('No available vehicle with maintenance history and a licensed idle driver found.')
+        return None
+    history = {
+        'maintenance': env['fleetflow.maintenance'].search_count([('vehicle_id', '=', vehicle.id)]),
+        'expenses': env['fleetflow.expense'].search_count([('vehicle_id', '=', vehicle.id)]),
+        'trips': env['fleetflow.trip'].search_count([('vehicle_id', '=', vehicle.id)]),
+    }
+    print(f'Vehicle {vehicle.display_name} ({history["trips"]} trips, {history["expenses"]} expenses, '
+          f'{history["maintenance"]} maintenance jobs), driver {driver.display_name}')
+
+    results = {}
+    with env.cr.savepoint(flush=False) as savepoint:
+        for name, func in steps(env, vehicle, driver):
+            with count_writes() as counts:
+                func()
+                # Flush and run the precommit hooks, as the commit would.
+                env.cr.flush()
+            results[name] = {
+                'statements': sum(statements for statements, _rows in counts.values()),
+                'rows': sum(rows for _statements, rows in counts.values()),
+                'tables': {table: {'statements': statements, 'rows': rows}
+                           for table, (statements, rows) in sorted(counts.items())},
+            }
+        savepoint.rollback()
+    env.cr.rollback()
+    return {'history': history, 'results': results}
+
+
+def report(results, baseline=None):
+    previous = baseline['results'] if baseline else {}
+    for name, current in results['results'].items():
+        line = f"{name:<32} {current['rows']:>7} rows {current['statements']:>5} statements"
+        if name in previous:
+            line += f"   (baseline {previous[name]['rows']} rows, {previous[name]['statements']} statements)"
+        print(line)
+        tables = Counter({table: entry['rows'] for table, entry in current['tables'].items()})
+        for table, rows in tables.most_common():
+            before = previous.get(name, {}).get('tables', {}).get(table, {}).get('rows')
+            print(f"    {table:<36} {rows:>7}" + (f"   (baseline {before})" if before is not None else ''))
+    return [name for name, current in results['results'].items()
+            if name in previous and current['rows'] > previous[name]['rows']]
+
+
+def main(env):
+    results = run(env)
+    if results is None:
+        return False
+    baseline = None
+    if os.environ.get('FLEETFLOW_BENCH_BASELINE'):
+        with open(os.environ['FLEETFLOW_BENCH_BASELINE']) as fp:
+            baseline = json.load(fp)
+    regressions = report(results, baseline)
+    output = os.environ.get('FLEETFLOW_BENCH_OUTPUT')
+    if output:
+        with open(output, 'w') as fp:
+            json.dump(results, fp, indent=2)
+    for name in regressions:
+        print(f'REGRESSION {name}: more rows written than in the baseline')
+    return not regressions
+
+
+if 'env' in globals():
+    if not main(env):  # noqa: F821 - provided by odoo-bin shell
+        sys.exit(1)
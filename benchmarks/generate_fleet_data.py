@@ -0,0 +1,266 @@
+"""
+Seed a database with a synthetic, reproducible FleetIQ fleet.
+
+    FLEETFLOW_VEHICLES=10000 FLEETFLOW_COMPANIES=2 \\
+        odoo-bin shell -c odoo.conf -d <db> < benchmarks/generate_fleet_data.py
+
+Settings (environment variables):
+
+* FLEETFLOW_VEHICLES: vehicles in total (default 1000), split over companies
+* FLEETFLOW_COMPANIES: companies to create (default 1)
+* FLEETFLOW_SEED: random seed (default 42); the same seed and sizes always
+  produce the same rows
+* FLEETFLOW_DAYS: history length in days (default 365)
+
+Companies are created with the ORM and named "FleetIQ Bench <n>". Vehicles,
+drivers, trips, expenses and maintenance are bulk-inserted with SQL; only
+a 100k-vehicle fleet with millions of trips makes that necessary. Afterwards
+the stored computes, the daily cost rollup and the dashboard snapshots are
+rebuilt through the ORM. Per vehicle:
+
+* trips: a Poisson-like count (mean 2 per week of history). 80% are
+  completed, 5% cancelled and 15% draft. Vehicles on a trip get one
+  dispatched trip.
+* revenue: lognormal, median around 600. Distance is lognormal with a
+  median around 180 km.
+* expenses: one fuel expense per completed trip at a realistic consumption
+  for the vehicle type.
+* maintenance: about one job every 60 days, lognormal cost.
+
+Commits after every chunk. Remove the data by deleting the bench companies'
+vehicles and drivers, which cascades to the rest.
+"""
+import datetime
+import math
+import os
+import random
+import time
+
+from psycopg2.extras import execute_values
+
+CHUNK_SIZE = 1000
+
+VEHICLE_TYPES = [('car', 30), ('van', 30), ('truck', 30), ('bus', 5), ('other', 5)]
+FUEL_TYPES = [('diesel', 60), ('petrol', 25), ('hybrid', 8), ('electric', 5), ('cng', 2)]
+VEHICLE_STATUSES = [('available', 70), ('on_trip', 15), ('in_shop', 6), ('in_service', 4),
+                    ('inactive', 3), ('retired', 2)]
+DRIVER_STATUSES = [('available', 60), ('off_duty', 20), ('on_leave', 10), ('suspended', 5), ('on_duty', 5)]
+TRIP_STATES = [('completed', 80), ('cancelled', 5), ('draft', 15)]
+# (capacity, max tons, litres per 100 km, acquisition cost) per vehicle type.
+TYPE_PROFILE = {
+    'car': (4, 0.5, 7.0, 25000),
+    'van': (3, 1.5, 10.0, 40000),
+    'truck': (2, 25.0, 32.0, 120000),
+    'bus': (50, 5.0, 28.0, 250000),
+    'other': (2, 3.0, 15.0, 50000),
+}
+CITIES = ['Lyon', 'Paris', 'Marseille', 'Lille', 'Nantes', 'Bordeaux', 'Nice', 'Rennes',
+          'Toulouse', 'Strasbourg', 'Montpellier', 'Dijon', 'Grenoble', 'Brest']
+ISSUES = ['Oil change', 'Brake pads', 'Tyre replacement', 'Battery', 'Gearbox', 'Inspection',
+          'Windshield', 'Suspension', 'Coolant leak', 'Clutch']
+
+
+def weighted(rnd, choices):
+    values, weights = zip(*choices)
+    return rnd.choices(values, weights)[0]
+
+
+def poisson(rnd, mean):
+    # Knuth for small means, normal approximation above.
+    if mean > 30:
+        return max(0, int(rnd.gauss(mean, math.sqrt(mean)) + 0.5))
+    limit, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rnd.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def insert(cr, table, columns, rows, returning=False):
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+    if returning:
+        query += " RETURNING id"
+    result = execute_values(cr, query, rows, page_size=CHUNK_SIZE, fetch=returning)
+    return [row[0] for row in result] if returning else None
+
+
+def create_companies(env, count, tag):
+    currency = env.ref('base.EUR', raise_if_not_found=False) or env.company.currency_id
+    companies = env['res.company'].create([
+        {'name': f'FleetIQ Bench {tag}-{n + 1}', 'currency_id': currency.id}
+        for n in range(count)
+    ])
+    env.user.company_ids |= companies
+    return companies
+
+
+def generate(env, vehicles=1000, companies=1, seed=42, days=365):
+    rnd = random.Random(seed)
+    cr = env.cr
+    uid = env.uid
+    now = datetime.datetime.utcnow().replace(microsecond=0)
+    today = now.date()
+    start_day = today - datetime.timedelta(days=days)
+    audit = (uid, now, uid, now)
+    audit_cols = ['create_uid', 'create_date', 'write_uid', 'write_date']
+
+    company_records = create_companies(env, companies, f'{seed}-{vehicles}')
+    env.cr.commit()
+    counts = dict.fromkeys(['vehicles', 'drivers', 'trips', 'expenses', 'maintenance'], 0)
+    trip_seq = 0
+
+    sizes = [vehicles // companies + (1 if n < vehicles % companies else 0) for n in range(companies)]
+    for company, per_company in zip(company_records, sizes):
+        prefix = f'{seed}-{company.id}'
+        for offset in range(0, per_company, CHUNK_SIZE):
+            size = min(CHUNK_SIZE, per_company - offset)
+
+            # ── Drivers: about one per vehicle ──
+            driver_rows = []
+            for n in range(offset, offset + size):
+                expiry = today + datetime.timedelta(days=rnd.randint(-120, 1500))
+                driver_rows.append((
+                    f'Driver {prefix}-{n:06d}', f'LIC-{prefix}-{n:06d}', expiry,
+                    weighted(rnd, VEHICLE_TYPES), f'+33 6 {rnd.randint(0, 99999999):08d}',
+                    f'driver{n}@{prefix}.example.com', weighted(rnd, DRIVER_STATUSES),
+                    True, company.id, *audit,
+                ))
+            driver_ids = insert(cr, 'fleetflow_driver', [
+                'name', 'license_number', 'license_expiry', 'license_category', 'phone', 'email',
+                'status', 'active', 'company_id', *audit_cols,
+            ], driver_rows, returning=True)
+
+            # ── Vehicles ──
+            vehicle_rows, profiles = [], []
+            for index, n in enumerate(range(offset, offset + size)):
+                vehicle_type = weighted(rnd, VEHICLE_TYPES)
+                capacity, max_tons, consumption, price = TYPE_PROFILE[vehicle_type]
+                status = weighted(rnd, VEHICLE_STATUSES)
+                profiles.append((vehicle_type, status, consumption))
+                vehicle_rows.append((
+                    f'Vehicle {prefix}-{n:06d}', f'PL-{prefix}-{n:06d}', f'VIN{prefix}{n:08d}',
+                    vehicle_type, weighted(rnd, FUEL_TYPES), capacity, max_tons,
+                    0.0, round(price * rnd.uniform(0.7, 1.3), 2), status,
+                    status != 'retired', company.id, company.currency_id.id,
+                    driver_ids[index], *audit,
+                ))
+            vehicle_ids = insert(cr, 'fleetflow_vehicle', [
+                'name', 'license_plate', 'vin', 'vehicle_type', 'fuel_type', 'capacity',
+                'max_capacity', 'odometer', 'acquisition_cost', 'status', 'active', 'company_id',
+                'currency_id', 'driver_id', *audit_cols,
+            ], vehicle_rows, returning=True)
+
+            # ── Trips, fuel expenses and maintenance ──
+            trip_rows, trip_meta, maintenance_rows, odometers = [], [], [], []
+            for vehicle_id, driver_id, row, (vehicle_type, status, consumption) in zip(
+                    vehicle_ids, driver_ids, vehicle_rows, profiles):
+                max_tons = row[6]
+                odometer = rnd.uniform(0, 50000)
+                states = [weighted(rnd, TRIP_STATES) for _i in range(poisson(rnd, 2 * days / 7))]
+                if status == 'on_trip':
+                    states.append('dispatched')
+                for state in states:
+                    trip_seq += 1
+                    distance = rnd.lognormvariate(math.log(180), 0.6)
+                    completed_on = start_day + datetime.timedelta(days=rnd.randint(0, days))
+                    start = odometer
+                    end = odometer + distance if state == 'completed' else 0.0
+                    if state == 'completed':
+                        odometer = end
+                    created = datetime.datetime.combine(completed_on, datetime.time(rnd.randint(6, 20)))
+                    trip_rows.append((
+                        f'TRPGEN-{seed}-{trip_seq:08d}', vehicle_id, driver_id,
+                        round(rnd.uniform(0, max_tons), 2), *rnd.sample(CITIES, 2),
+                        round(rnd.lognormvariate(math.log(600), 0.5), 2), state,
+                        round(start, 1) if state != 'draft' else 0.0, round(end, 1), company.id,
+                        completed_on if state == 'completed' else None,
+                        uid, created, uid, created,
+                    ))
+                    trip_meta.append((vehicle_id, state, distance, consumption, completed_on))
+                for _i in range(poisson(rnd, days / 60)):
+                    maintenance_rows.append((
+                        vehicle_id, company.id, rnd.choice(ISSUES),
+                        round(rnd.lognormvariate(math.log(350), 0.8), 2),
+                        start_day + datetime.timedelta(days=rnd.randint(0, days)), *audit,
+                    ))
+                odometers.append((vehicle_id, round(odometer, 1)))
+
+            trip_ids = insert(cr, 'fleetflow_trip', [
+                'name', 'vehicle_id', 'driver_id', 'cargo_weight', 'origin', 'destination',
+                'revenue', 'state', 'start_odometer', 'end_odometer', 'company_id',
+                'date_completed', *audit_cols,
+            ], trip_rows, returning=True)
+
+            expense_rows = []
+            for trip_id, (vehicle_id, state, distance, consumption, completed_on) in zip(trip_ids, trip_meta):
+                if state != 'completed':
+                    continue
+                liters = distance * consumption / 100 * rnd.uniform(0.85, 1.2)
+                fuel_cost = liters * rnd.uniform(1.6, 2.1)
+                expense_rows.append((
+                    vehicle_id, trip_id, company.id, round(liters, 2), round(fuel_cost, 2),
+                    completed_on, round(fuel_cost / distance, 4), *audit,
+                ))
+            insert(cr, 'fleetflow_expense', [
+                'vehicle_id', 'trip_id', 'company_id', 'liters', 'fuel_cost',
+                'expense_date', 'cost_per_km', *audit_cols,
+            ], expense_rows)
+            insert(cr, 'fleetflow_maintenance', [
+                'vehicle_id', 'company_id', 'issue', 'cost', 'service_date',
+                *audit_cols,
+            ], maintenance_rows)
+            execute_values(cr, """
+                UPDATE fleetflow_vehicle v SET odometer = data.odometer
+                  FROM (VALUES %s) AS data(id, odometer) WHERE v.id = data.id
+            """, odometers, page_size=CHUNK_SIZE)
+
+            recompute(env, vehicle_ids, driver_ids)
+            env.cr.commit()
+            counts['vehicles'] += len(vehicle_ids)
+            counts['drivers'] += len(driver_ids)
+            counts['trips'] += len(trip_ids)
+            counts['expenses'] += len(expense_rows)
+            counts['maintenance'] += len(maintenance_rows)
+            print(f"  {company.name}: {offset + size}/{per_company} vehicles", flush=True)
+
+    env['fleetflow.vehicle.daily.cost']._rebuild()
+    env['fleetflow.dashboard.snapshot']._refresh(company_records)
+    env.cr.commit()
+    return company_records, counts
+
+
+def recompute(env, vehicle_ids, driver_ids):
+    """Fill the stored computes of freshly inserted rows."""
+    env.invalidate_all()
+    for model_name, ids, field_names in [
+        ('fleetflow.vehicle', vehicle_ids, ['trip_count', 'total_revenue', 'total_fuel_cost', 'total_liters',
+                                            'total_maintenance_cost', 'total_operational_cost',
+                                            'fuel_efficiency', 'roi']),
+        ('fleetflow.driver', driver_ids, ['safety_score', 'completion_rate']),
+    ]:
+        records = env[model_name].browse(ids)
+        for fname in field_names:
+            env.add_to_compute(records._fields[fname], records)
+        records._recompute_recordset(field_names)
+    env.flush_all()
+
+
+def main(env):
+    vehicles = int(os.environ.get('FLEETFLOW_VEHICLES', 1000))
+    companies = int(os.environ.get('FLEETFLOW_COMPANIES', 1))
+    seed = int(os.environ.get('FLEETFLOW_SEED', 42))
+    days = int(os.environ.get('FLEETFLOW_DAYS', 365))
+    print(f'Generating {vehicles} vehicles over {companies} companies (seed {seed}, {days} days)')
+    started = time.monotonic()
+    company_records, counts = generate(
+        env(su=True, context=dict(env.context, tracking_disable=True)),
+        vehicles=vehicles, companies=companies, seed=seed, days=days,
+    )
+    print(f"Done in {time.monotonic() - started:.1f}s: "
+          + ', '.join(f'{count} {name}' for name, count in counts.items())
+          + f" in companies {company_records.ids}")
+
+
+if 'env' in globals():
+    main(env)  # noqa: F821 - provided by odoo-bin shell
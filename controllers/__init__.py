@@ -1,2 +1,4 @@
 from . import api
 from . import command_center
+from . import export
+from . import telemetry
@@ -1,5 +1,17 @@
-from odoo import http
+from odoo import api, http
 from odoo.http import request
+from odoo.addons.fleetflow.models.instrumentation import timed
+from odoo.addons.fleetflow.models.sync import TOMBSTONE_RETENTION_DAYS
+from odoo.addons.fleetflow.models.trip import LOCK_MODES
+from odoo.tools import date_utils
+from odoo.tools.lru import LRU
+from dateutil.relativedelta import relativedelta
+from werkzeug.http import http_date
+from .encoding import dumps
+from .response import body_response, json_response, jsonrpc, stream_response
+import base64
+import datetime
+import hashlib
 import json
 import logging
 
@@ -26,16 +38,536 @@ TRIP_STATE_MAP = {
 TRIP_STATE_REVERSE = {v: k for k, v in TRIP_STATE_MAP.items()}
 
 
-def _json_response(data, status=200):
+def _json_response(data, status=200, headers=None):
     """Return a plain-JSON HTTP response. CORS is handled by Odoo's route decorator."""
-    body = json.dumps(data, default=str)
-    return request.make_response(body, headers=[('Content-Type', 'application/json')], status=status)
+    return json_response(data, status=status, headers=headers)
 
 
 def _map(value, mapping):
     return mapping.get(value, value)
 
 
+# ── Pagination ───────────────────────────────────────────────────────────────
+# List endpoints page with a keyset on ``id``: the client passes the
+# ``next_cursor`` of the previous page as ``after`` so every page is an index
+# range scan, no matter how deep into the table it is.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _page_params(kwargs):
+    """Parse ``limit`` / ``after`` from the query string.
+
+    ``limit`` is clamped to MAX_PAGE_SIZE; raises ValueError on garbage.
+    """
+    limit = int(kwargs.get('limit') or DEFAULT_PAGE_SIZE)
+    after = int(kwargs.get('after') or 0)
+    if limit < 1 or after < 0:
+        raise ValueError('limit must be positive and after must not be negative')
+    return min(limit, MAX_PAGE_SIZE), after
+
+
+def _search_page(model, domain, limit):
+    """Return ``(records, next_cursor)`` for one keyset page of ``model``."""
+    # Fetch one extra row to know whether another page exists.
+    records = model.search(domain, limit=limit + 1, order='id')
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = records[-1].id
+    return records, next_cursor
+
+
+# ── Conditional GET ──────────────────────────────────────────────────────────
+# Every list page carries an ETag derived from the ids of the page and the
+# write_date watermarks of its model and of the models whose names it embeds,
+# so pollers sending If-None-Match get a 304 for the price of one keyset page
+# of ids and a few index-backed max() lookups. Unchanged pages are served from
+# a per-worker body cache keyed by the ETag instead of being re-serialized.
+# Last-Modified also covers the model's latest tombstone, so a deletion is
+# seen by If-Modified-Since pollers; dates older than the tombstone retention
+# window are not trusted.
+VALIDATOR_DEPENDS = {
+    'fleetflow.vehicle': ('fleetflow.driver',),
+    'fleetflow.driver': (),
+    'fleetflow.trip': ('fleetflow.vehicle', 'fleetflow.driver'),
+    'fleetflow.maintenance': ('fleetflow.vehicle',),
+    'fleetflow.expense': ('fleetflow.vehicle', 'fleetflow.trip'),
+}
+
+_body_cache = LRU(64)
+
+
+def _validator(model, domain, limit, records, next_cursor):
+    """Return ``(etag, last_modified)`` for the page ``records`` of ``model``."""
+    watermarks = []
+    for name in (model._name, *VALIDATOR_DEPENDS.get(model._name, ())):
+        # Archived rows too: archiving a row takes it out of the page.
+        Model = model.env[name].sudo().with_context(active_test=False)
+        [(write_date,)] = Model._read_group([], aggregates=['write_date:max'])
+        watermarks.append(write_date)
+    cr = model.env.cr
+    cr.execute("""
+        SELECT create_date FROM fleetflow_sync_tombstone
+         WHERE res_model = %s
+         ORDER BY create_date DESC, id DESC
+         LIMIT 1
+    """, [model._name])
+    deleted = cr.fetchone()
+    key = repr((cr.dbname, model.env.company.id, model._name, domain, limit,
+                records.ids, next_cursor, watermarks))
+    etag = hashlib.sha1(key.encode()).hexdigest()
+    known = [w for w in watermarks if w]
+    if deleted:
+        known.append(deleted[0])
+    last_modified = max(known).replace(tzinfo=datetime.timezone.utc, microsecond=0) if known else None
+    return etag, last_modified
+
+
+def _not_modified(etag, last_modified):
+    """Evaluate the request's conditional headers against a validator."""
+    httprequest = request.httprequest
+    if httprequest.if_none_match:
+        return httprequest.if_none_match.contains_weak(etag)
+    if httprequest.if_modified_since and last_modified:
+        # Deletions older than the retention window left no tombstone.
+        oldest = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=TOMBSTONE_RETENTION_DAYS)
+        if httprequest.if_modified_since < oldest:
+            return False
+        return last_modified <= httprequest.if_modified_since
+    return False
+
+
+def _list_response(model, domain, kwargs, serializer):
+    """Serve one page of ``model`` as the standard list envelope."""
+    try:
+        limit, after = _page_params(kwargs)
+    except ValueError as e:
+        return _json_response({'status': 'error', 'message': str(e)}, status=400)
+    if after:
+        domain = domain + [('id', '>', after)]
+
+    records, next_cursor = _search_page(model, domain, limit)
+    etag, last_modified = _validator(model, domain, limit, records, next_cursor)
+    # Weak: the gzip and identity encodings of a page share the validator.
+    headers = [('ETag', f'W/"{etag}"'), ('Cache-Control', 'no-cache')]
+    if last_modified:
+        headers.append(('Last-Modified', http_date(last_modified)))
+    if _not_modified(etag, last_modified):
+        return request.make_response('', headers=headers, status=304)
+
+    body = _body_cache.get(etag)
+    if body is None:
+        data = [serializer(r) for r in records]
+        with timed('serialize'):
+            body = dumps({
+                'status': 'ok',
+                'count': len(data),
+                'limit': limit,
+                'next_cursor': next_cursor,
+                'data': data,
+            })
+        _body_cache[etag] = body
+    return body_response(body, headers=headers)
+
+
+# ── Streaming (NDJSON) ───────────────────────────────────────────────────────
+# ``?format=ndjson`` streams the result set one JSON object per line, from
+# ``after`` on and up to ``limit`` rows when given (MAX_PAGE_SIZE does not
+# apply). Records are read in keyset batches of STREAM_BATCH_SIZE and the ORM
+# cache is dropped after each batch, so memory stays flat however large the
+# table is.
+STREAM_BATCH_SIZE = 2000
+
+
+def _ndjson_response(model_name, domain, kwargs, serializer):
+    """Stream ``model_name`` records matching ``domain`` as NDJSON."""
+    try:
+        _limit, after = _page_params(kwargs)
+        limit = int(kwargs['limit']) if kwargs.get('limit') else None
+    except ValueError as e:
+        return _json_response({'status': 'error', 'message': str(e)}, status=400)
+
+    # The body is consumed after the request cursor has been closed, so the
+    # generator reads through a cursor of its own. REPEATABLE READ keeps all
+    # batches on one consistent snapshot.
+    registry = request.env.registry
+    uid = request.env.uid
+    context = dict(request.env.context)
+
+    def generate():
+        with registry.cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            model = env[model_name].sudo()
+            last_id = after
+            remaining = limit
+            while remaining is None or remaining > 0:
+                batch_size = STREAM_BATCH_SIZE if remaining is None else min(remaining, STREAM_BATCH_SIZE)
+                records = model.search(domain + [('id', '>', last_id)],
+                                       limit=batch_size, order='id')
+                if not records:
+                    break
+                yield b''.join(dumps(serializer(r)) + b'\n' for r in records)
+                last_id = records[-1].id
+                if remaining is not None:
+                    remaining -= len(records)
+                env.invalidate_all()
+
+    return stream_response(generate(), 'application/x-ndjson')
+
+
+# ── Serializers (record → frontend dict) ────────────────────────────────────
+def _vehicle_data(v):
+    return {
+        'id': v.id,
+        'name': v.name,
+        'license_plate': v.license_plate or '',
+        'vin': v.vin if hasattr(v, 'vin') and v.vin else '',
+        'vehicle_type': v.vehicle_type or '',
+        'fuel_type': v.fuel_type if hasattr(v, 'fuel_type') and v.fuel_type else '',
+        'capacity': v.capacity if hasattr(v, 'capacity') else 0,
+        'max_capacity': v.max_capacity or 0,
+        'odometer': v.odometer if hasattr(v, 'odometer') else 0,
+        'status': _map(v.status, VEHICLE_STATUS_MAP),
+        'driver': v.driver_id.name if v.driver_id else '',
+        'driver_id': v.driver_id.id if v.driver_id else False,
+        'total_revenue': v.total_revenue if hasattr(v, 'total_revenue') else 0,
+        'total_operational_cost': v.total_operational_cost if hasattr(v, 'total_operational_cost') else 0,
+        'roi': v.roi if hasattr(v, 'roi') else 0,
+    }
+
+
+def _driver_data(d):
+    return {
+        'id': d.id,
+        'name': d.name,
+        'license_number': d.license_number or '',
+        'license_expiry': str(d.license_expiry) if d.license_expiry else '',
+        'phone': d.phone if hasattr(d, 'phone') and d.phone else '',
+        'status': _map(d.status, DRIVER_STATUS_MAP),
+        'safety_score': d.safety_score or 0,
+    }
+
+
+def _trip_data(t):
+    return {
+        'id': t.id,
+        'name': t.name or '',
+        'vehicle': t.vehicle_id.name if t.vehicle_id else '',
+        'vehicle_id': t.vehicle_id.id if t.vehicle_id else 0,
+        'driver': t.driver_id.name if t.driver_id else '',
+        'driver_id': t.driver_id.id if t.driver_id else 0,
+        'origin': t.origin or '',
+        'destination': t.destination or '',
+        'cargo_weight': t.cargo_weight or 0,
+        'revenue': t.revenue if hasattr(t, 'revenue') else 0,
+        'state': _map(t.state, TRIP_STATE_MAP),
+        'start_odometer': t.start_odometer if hasattr(t, 'start_odometer') else 0,
+        'end_odometer': t.end_odometer if hasattr(t, 'end_odometer') else 0,
+    }
+
+
+def _maintenance_data(l):
+    return {
+        'id': l.id,
+        'vehicle': l.vehicle_id.name,
+        'vehicle_id': l.vehicle_id.id,
+        'issue': l.issue or '',
+        'cost': l.cost or 0,
+        'date': str(l.service_date) if l.service_date else '',
+    }
+
+
+def _expense_data(e):
+    return {
+        'id': e.id,
+        'vehicle': e.vehicle_id.name,
+        'vehicle_id': e.vehicle_id.id,
+        'trip': e.trip_id.name if e.trip_id else 'General',
+        'liters': e.liters or 0,
+        'cost': e.fuel_cost or 0,
+        'date': str(e.expense_date) if e.expense_date else '',
+    }
+
+
+def _trips_label(trips):
+    return trips.name if len(trips) == 1 else f'{len(trips)} trips'
+
+
+# ── Payload → vals (create endpoints) ───────────────────────────────────────
+def _trip_vals(params):
+    vals = {
+        'vehicle_id': int(params.get('vehicle_id', 0)),
+        'driver_id': int(params.get('driver_id', 0)),
+        'origin': params.get('origin', ''),
+        'destination': params.get('destination', ''),
+    }
+    if params.get('cargo_weight'):
+        vals['cargo_weight'] = float(params['cargo_weight'])
+    if params.get('revenue'):
+        vals['revenue'] = float(params['revenue'])
+    if params.get('start_odometer'):
+        vals['start_odometer'] = float(params['start_odometer'])
+    return vals
+
+
+def _maintenance_vals(params):
+    vals = {
+        'vehicle_id': int(params.get('vehicle_id', 0)),
+        'issue': params.get('issue', ''),
+        'cost': float(params.get('cost', 0.0)),
+    }
+    if params.get('date'):
+        vals['service_date'] = params['date']
+    return vals
+
+
+def _expense_vals(params):
+    vals = {
+        'vehicle_id': int(params.get('vehicle_id', 0)),
+        'liters': float(params.get('liters', 0.0)),
+        'fuel_cost': float(params.get('cost', 0.0)),
+    }
+    if params.get('trip_id'):
+        vals['trip_id'] = int(params['trip_id'])
+    if params.get('date'):
+        vals['expense_date'] = params['date']
+    return vals
+
+
+# ── Batch create ─────────────────────────────────────────────────────────────
+# Batch endpoints take ``records`` (a list of the single-create payloads) and
+# create them with one ``create(vals_list)`` per chunk. A failing chunk is
+# rolled back to its savepoint and replayed row by row, so one bad row is
+# reported in its own result instead of aborting the batch.
+BATCH_CHUNK_SIZE = 500
+MAX_BATCH_SIZE = 10000
+
+
+def _create_batch(model, records, vals_builder):
+    """Create ``records`` through ``vals_builder``; return per-item results."""
+    results = [None] * len(records)
+    pending = []
+    for index, params in enumerate(records):
+        try:
+            pending.append((index, vals_builder(params)))
+        except (AttributeError, TypeError, ValueError) as e:
+            results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+
+    for start in range(0, len(pending), BATCH_CHUNK_SIZE):
+        chunk = pending[start:start + BATCH_CHUNK_SIZE]
+        try:
+            with model.env.cr.savepoint():
+                created = model.create([vals for _index, vals in chunk])
+        except Exception:
+            _logger.info('Batch chunk on %s failed, retrying row by row', model._name)
+            for index, vals in chunk:
+                try:
+                    with model.env.cr.savepoint():
+                        record = model.create(vals)
+                except Exception as e:
+                    results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+                else:
+                    results[index] = {'index': index, 'status': 'ok', 'id': record.id}
+        else:
+            for (index, _vals), record in zip(chunk, created):
+                results[index] = {'index': index, 'status': 'ok', 'id': record.id}
+    return results
+
+
+def _batch_response(model, params, vals_builder):
+    records = params.get('records')
+    if not isinstance(records, list):
+        return {'status': 'error', 'message': '"records" must be a list'}
+    if len(records) > MAX_BATCH_SIZE:
+        return {'status': 'error', 'message': f'At most {MAX_BATCH_SIZE} records per batch'}
+    results = _create_batch(model, records, vals_builder)
+    failed = sum(1 for r in results if r['status'] == 'error')
+    return {
+        'status': 'ok',
+        'created': len(results) - failed,
+        'failed': failed,
+        'results': results,
+    }
+
+
+# ── Delta sync ───────────────────────────────────────────────────────────────
+# /fleetflow/sync hands out one opaque cursor per collection: the (write_date,
+# id) watermark of the last row sent and the (create_date, id) watermark of
+# the last tombstone seen. Both are walked in order; archived rows and
+# tombstoned ids are returned as deletions. A cursor is reset to a full sync
+# only when the tombstones following it may have been garbage collected.
+SYNC_COLLECTIONS = {
+    'vehicles': ('fleetflow.vehicle', _vehicle_data),
+    'drivers': ('fleetflow.driver', _driver_data),
+    'trips': ('fleetflow.trip', _trip_data),
+    'maintenance': ('fleetflow.maintenance', _maintenance_data),
+    'expenses': ('fleetflow.expense', _expense_data),
+}
+SYNC_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _decode_sync_cursor(cursor):
+    raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return (datetime.datetime.fromisoformat(raw['w']), int(raw['i']),
+            datetime.datetime.fromisoformat(raw['tw']), int(raw['ti']))
+
+
+def _encode_sync_cursor(write_date, record_id, tombstone_date, tombstone_id):
+    raw = json.dumps({
+        'w': write_date.isoformat(), 'i': record_id,
+        'tw': tombstone_date.isoformat(), 'ti': tombstone_id,
+    })
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _sync_horizon(cr):
+    """Return the start of the oldest transaction running on this database,
+    this one included.
+
+    Rows are stamped with the start of the transaction writing them, which
+    may commit long after a later one. Everything stamped before the horizon
+    has been committed and is visible, so watermarks never pass a row that
+    has yet to appear. Odoo connects every worker with the same role, so
+    ``pg_stat_activity`` shows all their transactions.
+    """
+    cr.execute("""
+        SELECT min(xact_start) AT TIME ZONE 'UTC' FROM pg_stat_activity
+         WHERE datname = current_database() AND xact_start IS NOT NULL
+    """)
+    [horizon] = cr.fetchone()
+    return horizon or cr.now()
+
+
+def _sync_collection(env, model_name, serializer, cursor, limit):
+    """Return the changes of ``model_name`` since ``cursor`` (None = full sync)."""
+    cr = env.cr
+    model = env[model_name].sudo().with_context(active_test=False)
+    horizon = _sync_horizon(cr)
+
+    reset = False
+    if cursor:
+        write_date, last_id, tombstone_date, tombstone_id = _decode_sync_cursor(cursor)
+        # Tombstones past the cursor may have been garbage collected.
+        reset = tombstone_date < cr.now() - datetime.timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    if not cursor or reset:
+        # A full sync only sends live rows: the tombstones before it are moot.
+        write_date, last_id, tombstone_date, tombstone_id = SYNC_EPOCH, 0, horizon, 0
+
+    cr.execute(f"""
+        SELECT id, write_date FROM "{model._table}"
+         WHERE (write_date, id) > (%s, %s) AND write_date < %s
+         ORDER BY write_date, id
+         LIMIT %s
+    """, [write_date, last_id, horizon, limit + 1])
+    rows = cr.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        last_id, write_date = rows[-1]
+
+    changed, deleted = [], []
+    records = model.browse([row[0] for row in rows])
+    for record in records:
+        if 'active' in model._fields and not record.active:
+            deleted.append(record.id)
+        else:
+            changed.append(serializer(record))
+
+    # Tombstone ids are issued when the row is deleted, not when the deleting
+    # transaction commits: they are walked by (create_date, id) as well.
+    cr.execute("""
+        SELECT id, res_id, create_date FROM fleetflow_sync_tombstone
+         WHERE res_model = %s AND (create_date, id) > (%s, %s) AND create_date < %s
+         ORDER BY create_date, id
+         LIMIT %s
+    """, [model_name, tombstone_date, tombstone_id, horizon, limit + 1])
+    tombstones = cr.fetchall()
+    if len(tombstones) > limit:
+        has_more = True
+        tombstones = tombstones[:limit]
+        tombstone_id, _res_id, tombstone_date = tombstones[-1]
+    elif tombstone_date < horizon:
+        # Every tombstone before the horizon has been seen: move up to it so
+        # that a model nobody deletes from does not age into a reset.
+        tombstone_date, tombstone_id = horizon, 0
+    deleted.extend(res_id for _id, res_id, _date in tombstones)
+
+    return {
+        'reset': reset,
+        'changed': changed,
+        'deleted': deleted,
+        'has_more': has_more,
+        'next_cursor': _encode_sync_cursor(write_date, last_id, tombstone_date, tombstone_id),
+    }
+
+
+# ── Analytics (daily cost rollup) ───────────────────────────────────────────
+# Series are read from fleetflow.vehicle.daily.cost, never from the raw
+# expense / maintenance / trip tables.
+ANALYTICS_INTERVALS = {
+    'day': relativedelta(days=1),
+    'week': relativedelta(weeks=1),
+    'month': relativedelta(months=1),
+}
+ANALYTICS_DEFAULT_DAYS = 30
+ANALYTICS_MAX_BUCKETS = 3660
+ANALYTICS_MEASURES = ('fuel_cost', 'liters', 'maintenance_cost', 'revenue', 'distance')
+
+
+def _cost_series(env, interval, date_from, date_to, vehicle_id=None, company_id=None):
+    """Return the bucketed cost series between two dates (inclusive).
+
+    Every bucket is present, empty ones with zeros. ``roi`` relates a
+    bucket's net result to the acquisition cost of the vehicles in scope;
+    ``cumulative_roi`` runs from ``date_from``.
+    """
+    if interval not in ANALYTICS_INTERVALS:
+        raise ValueError("interval must be one of: %s" % ', '.join(ANALYTICS_INTERVALS))
+    if date_from > date_to:
+        raise ValueError("date_from must not be after date_to")
+    domain = [('day', '>=', date_from), ('day', '<=', date_to)]
+    vehicle_domain = []
+    if vehicle_id:
+        domain.append(('vehicle_id', '=', int(vehicle_id)))
+        vehicle_domain.append(('id', '=', int(vehicle_id)))
+    if company_id:
+        domain.append(('company_id', '=', int(company_id)))
+        vehicle_domain.append(('company_id', '=', int(company_id)))
+
+    groups = env['fleetflow.vehicle.daily.cost']._read_group(
+        domain,
+        groupby=[f'day:{interval}'],
+        aggregates=[f'{measure}:sum' for measure in ANALYTICS_MEASURES],
+    )
+    totals = {bucket: values for bucket, *values in groups}
+    [(acquisition_cost,)] = env['fleetflow.vehicle']._read_group(
+        vehicle_domain, aggregates=['acquisition_cost:sum'])
+    acquisition_cost = acquisition_cost or 0.0
+
+    series = []
+    cumulative_net = 0.0
+    bucket = date_utils.start_of(date_from, interval)
+    while bucket <= date_to:
+        if len(series) >= ANALYTICS_MAX_BUCKETS:
+            raise ValueError("Too many buckets; use a coarser interval or a shorter range")
+        values = dict(zip(ANALYTICS_MEASURES, totals.get(bucket) or [0.0] * len(ANALYTICS_MEASURES)))
+        total_cost = values['fuel_cost'] + values['maintenance_cost']
+        net = values['revenue'] - total_cost
+        cumulative_net += net
+        series.append({
+            'period': bucket.isoformat(),
+            **values,
+            'total_cost': total_cost,
+            'net': net,
+            'cost_per_km': total_cost / values['distance'] if values['distance'] > 0 else 0.0,
+            'roi': net / acquisition_cost if acquisition_cost else 0.0,
+            'cumulative_roi': cumulative_net / acquisition_cost if acquisition_cost else 0.0,
+        })
+        bucket += ANALYTICS_INTERVALS[interval]
+    return {'acquisition_cost': acquisition_cost, 'series': series}
+
+
 class FleetflowAPI(http.Controller):
 
 
@@ -45,45 +577,15 @@ class FleetflowAPI(http.Controller):
     @http.route('/fleetflow/vehicles', type='http', auth='public',
                 methods=['GET'], cors='*', csrf=False)
     def get_vehicles(self, **kwargs):
-        vehicles = request.env['fleetflow.vehicle'].sudo().search([])
-        data = []
-        for v in vehicles:
-            data.append({
-                'id': v.id,
-                'name': v.name,
-                'license_plate': v.license_plate or '',
-                'vin': v.vin if hasattr(v, 'vin') and v.vin else '',
-                'vehicle_type': v.vehicle_type or '',
-                'fuel_type': v.fuel_type if hasattr(v, 'fuel_type') and v.fuel_type else '',
-                'capacity': v.capacity if hasattr(v, 'capacity') else 0,
-                'max_capacity': v.max_capacity or 0,
-                'odometer': v.odometer if hasattr(v, 'odometer') else 0,
-                'status': _map(v.status, VEHICLE_STATUS_MAP),
-                'driver': v.driver_id.name if v.driver_id else '',
-                'driver_id': v.driver_id.id if v.driver_id else False,
-                'total_revenue': v.total_revenue if hasattr(v, 'total_revenue') else 0,
-                'total_operational_cost': v.total_operational_cost if hasattr(v, 'total_operational_cost') else 0,
-                'roi': v.roi if hasattr(v, 'roi') else 0,
-            })
-        return _json_response({'status': 'ok', 'count': len(data), 'data': data})
+        Vehicle = request.env['fleetflow.vehicle'].sudo()
+        return _list_response(Vehicle, [], kwargs, _vehicle_data)
 
     # ━━━━━━━━━ GET  /fleetflow/drivers ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     @http.route('/fleetflow/drivers', type='http', auth='public',
                 methods=['GET'], cors='*', csrf=False)
     def get_drivers(self, **kwargs):
-        drivers = request.env['fleetflow.driver'].sudo().search([])
-        data = []
-        for d in drivers:
-            data.append({
-                'id': d.id,
-                'name': d.name,
-                'license_number': d.license_number or '',
-                'license_expiry': str(d.license_expiry) if d.license_expiry else '',
-                'phone': d.phone if hasattr(d, 'phone') and d.phone else '',
-                'status': _map(d.status, DRIVER_STATUS_MAP),
-                'safety_score': d.safety_score or 0,
-            })
-        return _json_response({'status': 'ok', 'count': len(data), 'data': data})
+        Driver = request.env['fleetflow.driver'].sudo()
+        return _list_response(Driver, [], kwargs, _driver_data)
 
     # ━━━━━━━━━ GET  /fleetflow/trips ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     @http.route('/fleetflow/trips', type='http', auth='public',
@@ -98,44 +600,44 @@ class FleetflowAPI(http.Controller):
         if vehicle_id:
             domain.append(('vehicle_id', '=', int(vehicle_id)))
 
-        trips = request.env['fleetflow.trip'].sudo().search(domain)
-        data = []
-        for t in trips:
-            data.append({
-                'id': t.id,
-                'name': t.name or '',
-                'vehicle': t.vehicle_id.name if t.vehicle_id else '',
-                'vehicle_id': t.vehicle_id.id if t.vehicle_id else 0,
-                'driver': t.driver_id.name if t.driver_id else '',
-                'driver_id': t.driver_id.id if t.driver_id else 0,
-                'origin': t.origin or '',
-                'destination': t.destination or '',
-                'cargo_weight': t.cargo_weight or 0,
-                'revenue': t.revenue if hasattr(t, 'revenue') else 0,
-                'state': _map(t.state, TRIP_STATE_MAP),
-                'start_odometer': t.start_odometer if hasattr(t, 'start_odometer') else 0,
-                'end_odometer': t.end_odometer if hasattr(t, 'end_odometer') else 0,
-            })
-        return _json_response({'status': 'ok', 'count': len(data), 'data': data})
+        if kwargs.get('format') == 'ndjson':
+            return _ndjson_response('fleetflow.trip', domain, kwargs, _trip_data)
+        Trip = request.env['fleetflow.trip'].sudo()
+        return _list_response(Trip, domain, kwargs, _trip_data)
+
+    # ━━━━━━━━━ GET  /fleetflow/analytics/costs ━━━━━━━━━━━━━━━━━━━━━━━━
+    # Query: interval (day|week|month, default day), date_from / date_to
+    # (YYYY-MM-DD, default the last 30 days), vehicle_id, company_id.
+    @http.route('/fleetflow/analytics/costs', type='http', auth='public',
+                methods=['GET'], cors='*', csrf=False)
+    def get_cost_analytics(self, **kwargs):
+        try:
+            date_to = (datetime.date.fromisoformat(kwargs['date_to']) if kwargs.get('date_to')
+                       else datetime.date.today())
+            date_from = (datetime.date.fromisoformat(kwargs['date_from']) if kwargs.get('date_from')
+                         else date_to - datetime.timedelta(days=ANALYTICS_DEFAULT_DAYS - 1))
+            interval = kwargs.get('interval') or 'day'
+            result = _cost_series(
+                request.env(su=True), interval, date_from, date_to,
+                vehicle_id=kwargs.get('vehicle_id'), company_id=kwargs.get('company_id'),
+            )
+        except ValueError as e:
+            return _json_response({'status': 'error', 'message': str(e)}, status=400)
+        return _json_response({
+            'status': 'ok',
+            'interval': interval,
+            'date_from': date_from.isoformat(),
+            'date_to': date_to.isoformat(),
+            **result,
+        })
 
     # ━━━━━━━━━ POST  /fleetflow/trip/create  (JSON-RPC) ━━━━━━━━━━━━━━━━
-    @http.route('/fleetflow/trip/create', type='json', auth='public',
+    @http.route('/fleetflow/trip/create', type='http', auth='public',
                 methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
     def create_trip(self, **params):
         try:
-            vals = {
-                'vehicle_id': int(params.get('vehicle_id', 0)),
-                'driver_id': int(params.get('driver_id', 0)),
-                'origin': params.get('origin', ''),
-                'destination': params.get('destination', ''),
-            }
-            if params.get('cargo_weight'):
-                vals['cargo_weight'] = float(params['cargo_weight'])
-            if params.get('revenue'):
-                vals['revenue'] = float(params['revenue'])
-            if params.get('start_odometer'):
-                vals['start_odometer'] = float(params['start_odometer'])
-
+            vals = _trip_vals(params)
             trip = request.env['fleetflow.trip'].sudo().create(vals)
             return {
                 'status': 'ok',
@@ -150,54 +652,147 @@ class FleetflowAPI(http.Controller):
             _logger.exception('Trip creation failed')
             return {'status': 'error', 'message': str(e)}
 
+    # ━━━━━━━━━ POST  /fleetflow/trip/create_batch  (JSON-RPC) ━━━━━━━━━━
+    @http.route('/fleetflow/trip/create_batch', type='http', auth='public',
+                methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
+    def create_trip_batch(self, **params):
+        try:
+            return _batch_response(request.env['fleetflow.trip'].sudo(), params, _trip_vals)
+        except Exception as e:
+            _logger.exception('Trip batch creation failed')
+            return {'status': 'error', 'message': str(e)}
+
     # ━━━━━━━━━ POST  /fleetflow/trip/dispatch  (JSON-RPC) ━━━━━━━━━━━━━━
-    @http.route('/fleetflow/trip/dispatch', type='json', auth='public',
+    # Accepts either ``trip_id`` or ``trip_ids`` (a list). A list is
+    # validated as a whole and dispatched with set-based writes.
+    #
+    # ``lock`` picks what happens when another dispatcher holds one of the
+    # trip, vehicle or driver rows: ``wait`` (default) queues behind it,
+    # ``nowait`` fails at once with a conflict error, and ``skip_locked``
+    # dispatches the trips that are free and returns the others in
+    # ``skipped`` so the client can retry them or pick another vehicle.
+    @http.route('/fleetflow/trip/dispatch', type='http', auth='public',
                 methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
     def dispatch_trip(self, **params):
         try:
-            trip_id = int(params.get('trip_id', 0))
-            trip = request.env['fleetflow.trip'].sudo().browse(trip_id)
-            if not trip.exists():
-                return {'status': 'error', 'message': 'Trip not found'}
-            trip.action_dispatch()
-            return {
+            trip_ids = [int(i) for i in params.get('trip_ids') or [params.get('trip_id', 0)]]
+            lock = params.get('lock') or 'wait'
+            if lock not in LOCK_MODES:
+                return {'status': 'error', 'message': f'lock must be one of {", ".join(LOCK_MODES)}'}
+            trips = request.env['fleetflow.trip'].sudo().browse(trip_ids)
+            missing = set(trip_ids) - set(trips.exists().ids)
+            if missing:
+                return {'status': 'error', 'message': f'Trip not found: {sorted(missing)}'}
+            locked = trips._lock_resources(lock)
+            skipped = trips - locked
+            if locked:
+                locked.action_dispatch()
+            result = {
                 'status': 'ok',
-                'message': f'{trip.name} dispatched successfully',
+                'message': f'{_trips_label(locked)} dispatched successfully' if locked
+                else 'No trip dispatched: all are locked by another dispatcher',
             }
+            if lock == 'skip_locked':
+                result['dispatched'] = locked.ids
+                result['skipped'] = skipped.ids
+            return result
         except Exception as e:
             _logger.exception('Trip dispatch failed')
             return {'status': 'error', 'message': str(e)}
 
+    # ━━━━━━━━━ POST  /fleetflow/trip/match  (JSON-RPC) ━━━━━━━━━━━━━━━━━
+    # Proposes a vehicle and a driver for the draft trips of a company
+    # (``company_id``, default the main one), or for ``trip_ids`` only.
+    # With ``apply`` the proposals are written on the trips, which stay in
+    # draft until they are dispatched.
+    @http.route('/fleetflow/trip/match', type='http', auth='public',
+                methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
+    def match_trips(self, **params):
+        try:
+            env = request.env(su=True)
+            company = env['res.company'].browse(int(params['company_id'])) if params.get('company_id') \
+                else env.company
+            Trip = env['fleetflow.trip']
+            trips = None
+            if params.get('trip_ids'):
+                trips = Trip.browse([int(i) for i in params['trip_ids']]).exists()
+            pairs, unmatched = Trip._match_draft_trips(company, trips)
+            if params.get('apply'):
+                Trip._apply_matches(pairs)
+            return {
+                'status': 'ok',
+                'applied': bool(params.get('apply')),
+                'matched': len(pairs),
+                'data': [
+                    {'trip_id': trip_id, 'vehicle_id': vehicle_id, 'driver_id': driver_id}
+                    for trip_id, (vehicle_id, driver_id) in sorted(pairs.items())
+                ],
+                'unmatched': [
+                    {'trip_id': trip_id, 'reason': reason}
+                    for trip_id, reason in sorted(unmatched.items())
+                ],
+            }
+        except Exception as e:
+            _logger.exception('Trip matching failed')
+            return {'status': 'error', 'message': str(e)}
+
     # ━━━━━━━━━ POST  /fleetflow/trip/complete  (JSON-RPC) ━━━━━━━━━━━━━━
-    @http.route('/fleetflow/trip/complete', type='json', auth='public',
+    # Accepts a single ``trip_id`` payload or ``trips``, a list of such
+    # payloads, which are completed together in one action_complete call.
+    # ``lock`` works as for /fleetflow/trip/dispatch; in ``skip_locked``
+    # mode the trips left are returned in ``skipped``, untouched.
+    @http.route('/fleetflow/trip/complete', type='http', auth='public',
                 methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
     def complete_trip(self, **params):
         try:
-            trip_id = int(params.get('trip_id', 0))
-            trip = request.env['fleetflow.trip'].sudo().browse(trip_id)
-            if not trip.exists():
-                return {'status': 'error', 'message': 'Trip not found'}
-
-            update_vals = {}
-            if params.get('end_odometer'):
-                update_vals['end_odometer'] = float(params['end_odometer'])
-            if params.get('revenue'):
-                update_vals['revenue'] = float(params['revenue'])
-            if update_vals:
-                trip.write(update_vals)
-
-            trip.action_complete()
-            return {
+            items = params.get('trips') or [params]
+            lock = params.get('lock') or 'wait'
+            if lock not in LOCK_MODES:
+                return {'status': 'error', 'message': f'lock must be one of {", ".join(LOCK_MODES)}'}
+            Trip = request.env['fleetflow.trip'].sudo()
+            trips = Trip.browse([int(item.get('trip_id', 0)) for item in items])
+            missing = set(trips.ids) - set(trips.exists().ids)
+            if missing:
+                return {'status': 'error', 'message': f'Trip not found: {sorted(missing)}'}
+
+            # Lock before writing the readings: the writes would otherwise
+            # wait on the trip rows whatever the mode.
+            locked = trips._lock_resources(lock)
+            skipped = trips - locked
+            for trip, item in zip(trips, items):
+                if trip not in locked:
+                    continue
+                update_vals = {}
+                if item.get('end_odometer'):
+                    update_vals['end_odometer'] = float(item['end_odometer'])
+                if item.get('revenue'):
+                    update_vals['revenue'] = float(item['revenue'])
+                if update_vals:
+                    trip.write(update_vals)
+
+            if locked:
+                locked.action_complete()
+            result = {
                 'status': 'ok',
-                'message': f'{trip.name} completed successfully',
+                'message': f'{_trips_label(locked)} completed successfully' if locked
+                else 'No trip completed: all are locked by another dispatcher',
             }
+            if lock == 'skip_locked':
+                result['completed'] = locked.ids
+                result['skipped'] = skipped.ids
+            return result
         except Exception as e:
             _logger.exception('Trip completion failed')
             return {'status': 'error', 'message': str(e)}
 
     # ━━━━━━━━━ POST  /fleetflow/vehicle/create  (JSON-RPC) ━━━━━━━━━━━━━
-    @http.route('/fleetflow/vehicle/create', type='json', auth='public',
+    @http.route('/fleetflow/vehicle/create', type='http', auth='public',
                 methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
     def create_vehicle(self, **params):
         try:
             vals = {
@@ -229,8 +824,9 @@ class FleetflowAPI(http.Controller):
             return {'status': 'error', 'message': str(e)}
 
     # ━━━━━━━━━ POST  /fleetflow/driver/create  (JSON-RPC) ━━━━━━━━━━━━━━
-    @http.route('/fleetflow/driver/create', type='json', auth='public',
+    @http.route('/fleetflow/driver/create', type='http', auth='public',
                 methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
     def create_driver(self, **params):
         try:
             vals = {
@@ -261,32 +857,18 @@ class FleetflowAPI(http.Controller):
     @http.route('/fleetflow/maintenance', type='http', auth='public',
                 methods=['GET'], cors='*', csrf=False)
     def get_maintenance(self, **kwargs):
-        logs = request.env['fleetflow.maintenance'].sudo().search([])
-        data = []
-        for l in logs:
-            data.append({
-                'id': l.id,
-                'vehicle': l.vehicle_id.name,
-                'vehicle_id': l.vehicle_id.id,
-                'issue': l.issue or '',
-                'cost': l.cost or 0,
-                'date': str(l.service_date) if l.service_date else '',
-            })
-        return _json_response({'status': 'ok', 'count': len(data), 'data': data})
+        if kwargs.get('format') == 'ndjson':
+            return _ndjson_response('fleetflow.maintenance', [], kwargs, _maintenance_data)
+        Maintenance = request.env['fleetflow.maintenance'].sudo()
+        return _list_response(Maintenance, [], kwargs, _maintenance_data)
 
     # ━━━━━━━━━ POST  /fleetflow/maintenance/create  (JSON-RPC) ━━━━━━━
-    @http.route('/fleetflow/maintenance/create', type='json', auth='public',
+    @http.route('/fleetflow/maintenance/create', type='http', auth='public',
                 methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
     def create_maintenance(self, **params):
         try:
-            vals = {
-                'vehicle_id': int(params.get('vehicle_id', 0)),
-                'issue': params.get('issue', ''),
-                'cost': float(params.get('cost', 0.0)),
-            }
-            if params.get('date'):
-                vals['service_date'] = params['date']
-            
+            vals = _maintenance_vals(params)
             log = request.env['fleetflow.maintenance'].sudo().create(vals)
             return {
                 'status': 'ok',
@@ -297,39 +879,33 @@ class FleetflowAPI(http.Controller):
             _logger.exception('Maintenance creation failed')
             return {'status': 'error', 'message': str(e)}
 
+    # ━━━━━━━━━ POST  /fleetflow/maintenance/create_batch  (JSON-RPC) ━━
+    @http.route('/fleetflow/maintenance/create_batch', type='http', auth='public',
+                methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
+    def create_maintenance_batch(self, **params):
+        try:
+            return _batch_response(request.env['fleetflow.maintenance'].sudo(), params, _maintenance_vals)
+        except Exception as e:
+            _logger.exception('Maintenance batch creation failed')
+            return {'status': 'error', 'message': str(e)}
+
     # ━━━━━━━━━ GET  /fleetflow/expenses ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     @http.route('/fleetflow/expenses', type='http', auth='public',
                 methods=['GET'], cors='*', csrf=False)
     def get_expenses(self, **kwargs):
-        expenses = request.env['fleetflow.expense'].sudo().search([])
-        data = []
-        for e in expenses:
-            data.append({
-                'id': e.id,
-                'vehicle': e.vehicle_id.name,
-                'vehicle_id': e.vehicle_id.id,
-                'trip': e.trip_id.name if e.trip_id else 'General',
-                'liters': e.liters or 0,
-                'cost': e.fuel_cost or 0,
-                'date': str(e.expense_date) if e.expense_date else '',
-            })
-        return _json_response({'status': 'ok', 'count': len(data), 'data': data})
+        if kwargs.get('format') == 'ndjson':
+            return _ndjson_response('fleetflow.expense', [], kwargs, _expense_data)
+        Expense = request.env['fleetflow.expense'].sudo()
+        return _list_response(Expense, [], kwargs, _expense_data)
 
     # ━━━━━━━━━ POST  /fleetflow/expense/create  (JSON-RPC) ━━━━━━━━━━
-    @http.route('/fleetflow/expense/create', type='json', auth='public',
+    @http.route('/fleetflow/expense/create', type='http', auth='public',
                 methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
     def create_expense(self, **params):
         try:
-            vals = {
-                'vehicle_id': int(params.get('vehicle_id', 0)),
-                'liters': float(params.get('liters', 0.0)),
-                'fuel_cost': float(params.get('cost', 0.0)),
-            }
-            if params.get('trip_id'):
-                vals['trip_id'] = int(params['trip_id'])
-            if params.get('date'):
-                vals['expense_date'] = params['date']
-
+            vals = _expense_vals(params)
             expense = request.env['fleetflow.expense'].sudo().create(vals)
             return {
                 'status': 'ok',
@@ -339,3 +915,38 @@ class FleetflowAPI(http.Controller):
         except Exception as e:
             _logger.exception('Expense creation failed')
             return {'status': 'error', 'message': str(e)}
+
+    # ━━━━━━━━━ POST  /fleetflow/expense/create_batch  (JSON-RPC) ━━━━━━
+    @http.route('/fleetflow/expense/create_batch', type='http', auth='public',
+                methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
+    def create_expense_batch(self, **params):
+        try:
+            return _batch_response(request.env['fleetflow.expense'].sudo(), params, _expense_vals)
+        except Exception as e:
+            _logger.exception('Expense batch creation failed')
+            return {'status': 'error', 'message': str(e)}
+
+    # ━━━━━━━━━ POST  /fleetflow/sync  (JSON-RPC) ━━━━━━━━━━━━━━━━━━━━━━
+    # ``cursors`` maps collection names (vehicles, drivers, trips,
+    # maintenance, expenses) to the ``next_cursor`` of the previous call, or
+    # null for a full initial sync. Collections left out are not synced.
+    # ``reset`` tells the client to drop its local copy of that collection.
+    @http.route('/fleetflow/sync', type='http', auth='public',
+                methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
+    def sync(self, cursors=None, limit=None, **params):
+        try:
+            limit = min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+            cursors = cursors if cursors is not None else dict.fromkeys(SYNC_COLLECTIONS)
+            unknown = set(cursors) - set(SYNC_COLLECTIONS)
+            if unknown:
+                return {'status': 'error', 'message': f'Unknown collections: {sorted(unknown)}'}
+            data = {
+                name: _sync_collection(request.env, *SYNC_COLLECTIONS[name], cursor, limit)
+                for name, cursor in cursors.items()
+            }
+            return {'status': 'ok', 'data': data}
+        except Exception as e:
+            _logger.exception('Sync failed')
+            return {'status': 'error', 'message': str(e)}
@@ -1,17 +1,20 @@
-import json
 import logging
 
 from odoo import http
 from odoo.http import request
 from odoo.exceptions import AccessError
 
+from .response import jsonrpc
+
 _logger = logging.getLogger(__name__)
 
 
 class CommandCenterController(http.Controller):
     """
     Provides a single authenticated JSON endpoint that the QWeb
-    client action calls via fetch() to refresh KPI data.
+    client action calls via fetch() to refresh KPI data. It speaks
+    JSON-RPC through the shared response layer (fast encoder + gzip);
+    CSRF is covered by its application/json-only contract.
 
     Auth: 'user'  → standard Odoo session cookie – RBAC is enforced
     by ir.model.access rules on FleetIQ.vehicle / FleetIQ.trip.
@@ -19,11 +22,12 @@ class CommandCenterController(http.Controller):
 
     @http.route(
         '/fleetflow/command_center/data',
-        type='json',
+        type='http',
         auth='user',
         methods=['POST'],
-        csrf=True,
+        csrf=False,
     )
+    @jsonrpc
     def get_command_center_data(self, vehicle_type=None, vehicle_status=None, **_kw):
         """
         Return live KPI JSON for the Command Center dashboard.
@@ -0,0 +1,63 @@
+"""
+JSON encoding and content-coding helpers shared by the FleetIQ controllers.
+
+Kept free of Odoo imports so the benchmark in benchmarks/ can load it on its
+own. orjson is used when installed; the stdlib fallback produces the same
+output for the types our payloads contain (dates and datetimes as ISO 8601,
+Decimal as float).
+"""
+import datetime
+import decimal
+import gzip
+import json
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bodies smaller than this are sent as-is: the gzip header and the CPU time
+# cost more than the bytes saved.
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 5
+SUPPORTED_CODINGS = ('gzip', 'deflate')
+
+
+def _default(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+
+def _orjson_default(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+
+def dumps(data):
+    """Serialize ``data`` to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def compress(body, coding):
+    """Compress ``body`` with ``coding`` (one of SUPPORTED_CODINGS)."""
+    if coding == 'gzip':
+        return gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+    return zlib.compress(body, COMPRESS_LEVEL)
+
+
+def compress_stream(chunks, coding):
+    """Compress an iterable of byte chunks incrementally."""
+    wbits = 16 + zlib.MAX_WBITS if coding == 'gzip' else zlib.MAX_WBITS
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, wbits)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,109 @@
+import logging
+import os
+
+from odoo import http
+from odoo.http import Stream, request
+
+from .response import json_response, jsonrpc
+
+_logger = logging.getLogger(__name__)
+
+# Collections that can be exported through /fleetflow/export/start.
+EXPORT_COLLECTIONS = {
+    'trips': 'fleetflow.trip',
+    'expenses': 'fleetflow.expense',
+    'maintenance': 'fleetflow.maintenance',
+}
+
+
+def _job_data(job):
+    return {
+        'id': job.id,
+        'name': job.name,
+        'model': job.res_model,
+        'format': job.export_format,
+        'state': job.state,
+        'total': job.total,
+        'processed': job.processed,
+        'progress': job.progress,
+        'file_name': job.file_name or None,
+        'file_size': job.file_size,
+        'download_url': f'/fleetflow/export/{job.id}/download' if job.state == 'done' else None,
+        'error': job.error or None,
+    }
+
+
+class FleetflowExportController(http.Controller):
+    """
+    Background exports (fleetflow.export.job): start one, poll its status,
+    download the result. Files are streamed from the filestore by the WSGI
+    server (X-Sendfile when configured), never loaded into the worker's
+    memory.
+    """
+
+    # ━━━━━━━━━ POST  /fleetflow/export/start ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    @http.route('/fleetflow/export/start', type='http', auth='user', methods=['POST'], csrf=False)
+    @jsonrpc
+    def start(self, **params):
+        """
+        Params: collection (trips|expenses|maintenance), format (parquet|csv,
+        default parquet), date_from, date_to (YYYY-MM-DD, inclusive),
+        company_ids (list).
+        """
+        try:
+            model_name = EXPORT_COLLECTIONS.get(params.get('collection'))
+            if not model_name:
+                raise ValueError("collection must be one of: %s" % ', '.join(EXPORT_COLLECTIONS))
+            export_format = params.get('format') or 'parquet'
+            Model = request.env[model_name]
+            if export_format == 'csv' and not hasattr(Model, '_export_csv_header'):
+                raise ValueError("csv is not available for %s" % params['collection'])
+            if export_format not in ('csv', 'parquet'):
+                raise ValueError("format must be parquet or csv")
+            Model.check_access_rights('read')
+            Job = request.env['fleetflow.export.job']
+            domain = Job._filter_domain(
+                model_name,
+                date_from=params.get('date_from'),
+                date_to=params.get('date_to'),
+                company_ids=params.get('company_ids'),
+            )
+            job = Job._enqueue(Model, export_format=export_format, domain=domain,
+                               company_ids=params.get('company_ids'))
+            return {'status': 'ok', 'job': _job_data(job)}
+        except Exception as e:
+            _logger.exception("FleetIQ export start failed")
+            return {'status': 'error', 'message': str(e)}
+
+    # ━━━━━━━━━ GET  /fleetflow/export/<id> ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    @http.route('/fleetflow/export/<int:job_id>', type='http', auth='user', methods=['GET'])
+    def status(self, job_id, **kwargs):
+        job = request.env['fleetflow.export.job'].browse(job_id).exists()
+        if not job:
+            return json_response({'status': 'error', 'message': 'Export job not found'}, status=404)
+        return json_response({'status': 'ok', 'job': _job_data(job)})
+
+    # ━━━━━━━━━ GET  /fleetflow/export/<id>/download ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    @http.route('/fleetflow/export/<int:job_id>/download', type='http', auth='user', methods=['GET'])
+    def download(self, job_id, **kwargs):
+        # Browsing as the user applies the job record rules.
+        job = request.env['fleetflow.export.job'].browse(job_id).exists()
+        if not job or job.state != 'done':
+            raise request.not_found()
+        path = job._file_path()
+        if not os.path.isfile(path):
+            raise request.not_found()
+        stream = Stream(
+            type='path',
+            path=path,
+            mimetype=job._file_mimetype(),
+            download_name=job.file_name,
+            size=os.path.getsize(path),
+            last_modified=job.date_done,
+            etag=f'{job.id}-{job.file_size}',
+            conditional=True,
+        )
+        return stream.get_response(as_attachment=True)
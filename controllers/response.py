@@ -0,0 +1,90 @@
+"""
+Response layer shared by the FleetIQ controllers: every JSON body goes
+through the fast encoder of encoding.py and is gzip/deflate compressed when
+the client accepts it and the body is large enough to be worth it.
+
+JSON-RPC endpoints are declared as ``type='http'`` routes wrapped with
+``jsonrpc`` so their results use the same encoder and compression instead of
+Odoo's JSON-RPC dispatcher. The request and response envelopes are the
+standard JSON-RPC 2.0 ones, so existing clients are unaffected.
+"""
+import functools
+import json
+
+from odoo.http import request
+from odoo.addons.fleetflow.models.instrumentation import timed
+
+from .encoding import COMPRESS_MIN_SIZE, SUPPORTED_CODINGS, compress, compress_stream, dumps
+
+
+def _negotiated_coding():
+    return request.httprequest.accept_encodings.best_match(SUPPORTED_CODINGS)
+
+
+def body_response(body, status=200, headers=None, content_type='application/json'):
+    """Return an already serialized body, compressed if negotiated."""
+    headers = [('Content-Type', content_type), ('Vary', 'Accept-Encoding')] + (headers or [])
+    if len(body) >= COMPRESS_MIN_SIZE:
+        coding = _negotiated_coding()
+        if coding:
+            with timed('compress'):
+                body = compress(body, coding)
+            headers.append(('Content-Encoding', coding))
+    return request.make_response(body, headers=headers, status=status)
+
+
+def json_response(data, status=200, headers=None):
+    """Serialize ``data`` and return it as a JSON response."""
+    with timed('serialize'):
+        body = dumps(data)
+    return body_response(body, status=status, headers=headers)
+
+
+def stream_response(chunks, content_type, headers=None):
+    """Return a streamed response over ``chunks`` (an iterable of bytes)."""
+    headers = [('Content-Type', content_type), ('Vary', 'Accept-Encoding')] + (headers or [])
+    coding = _negotiated_coding()
+    if coding:
+        chunks = compress_stream(chunks, coding)
+        headers.append(('Content-Encoding', coding))
+    return request.make_response(chunks, headers=headers)
+
+
+def jsonrpc(func):
+    """Serve a ``type='http'`` POST route as a JSON-RPC 2.0 endpoint.
+
+    The ``params`` of the request envelope, an object, are passed as keyword
+    arguments and the return value becomes ``result``. Only ``application/json``
+    bodies are accepted, which keeps the CSRF properties of Odoo's own
+    ``type='json'`` routes: a cross-site form cannot send that content type.
+    """
+    @functools.wraps(func)
+    def wrapper(self, **_query):
+        httprequest = request.httprequest
+        if httprequest.mimetype != 'application/json':
+            return json_response({
+                'jsonrpc': '2.0', 'id': None,
+                'error': {'code': -32600, 'message': 'Content-Type must be application/json'},
+            }, status=415)
+        try:
+            payload = json.loads(httprequest.get_data() or b'{}')
+        except ValueError:
+            return json_response({
+                'jsonrpc': '2.0', 'id': None,
+                'error': {'code': -32700, 'message': 'Parse error'},
+            }, status=400)
+        if not isinstance(payload, dict):
+            return json_response({
+                'jsonrpc': '2.0', 'id': None,
+                'error': {'code': -32600, 'message': 'Invalid Request'},
+            }, status=400)
+        params = payload.get('params') or {}
+        if not isinstance(params, dict):
+            # Positional params have no keywords to map to.
+            return json_response({
+                'jsonrpc': '2.0', 'id': payload.get('id'),
+                'error': {'code': -32600, 'message': 'Invalid Request'},
+            }, status=400)
+        result = func(self, **params)
+        return json_response({'jsonrpc': '2.0', 'id': payload.get('id'), 'result': result})
+    return wrapper
@@ -0,0 +1,46 @@
+import logging
+
+from odoo import http
+from odoo.http import request
+from odoo.addons.fleetflow.models.vehicle_telemetry import TELEMETRY_MAX_BATCH
+
+from .response import jsonrpc
+
+_logger = logging.getLogger(__name__)
+
+
+class FleetflowTelemetryController(http.Controller):
+    """
+    Ingestion of odometer and position pings from in-cab devices. A device
+    or gateway posts its readings in batches; they are appended to
+    fleetflow.vehicle.telemetry with multi-row inserts, and each vehicle's
+    odometer follows at most once per sync interval.
+    """
+
+    # ━━━━━━━━━ POST  /fleetflow/telemetry  (JSON-RPC) ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+    @http.route('/fleetflow/telemetry', type='http', auth='public',
+                methods=['POST'], cors='*', csrf=False)
+    @jsonrpc
+    def ingest(self, **params):
+        """
+        Params: readings, a list of {vehicle_id, odometer, recorded_at (ISO
+        8601 or UNIX timestamp, default now), latitude, longitude, speed}.
+        """
+        try:
+            readings = params.get('readings')
+            if not isinstance(readings, list):
+                return {'status': 'error', 'message': '"readings" must be a list'}
+            if len(readings) > TELEMETRY_MAX_BATCH:
+                return {'status': 'error', 'message': f'At most {TELEMETRY_MAX_BATCH} readings per batch'}
+            accepted, errors, synced = request.env['fleetflow.vehicle.telemetry'].sudo()._ingest(readings)
+            return {
+                'status': 'ok',
+                'accepted': accepted,
+                'failed': len(errors),
+                'synced_vehicles': synced,
+                'errors': errors,
+            }
+        except Exception as e:
+            _logger.exception('Telemetry ingestion failed')
+            return {'status': 'error', 'message': str(e)}
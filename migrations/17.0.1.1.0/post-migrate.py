@@ -0,0 +1,13 @@
+from odoo import SUPERUSER_ID, api
+
+
+def migrate(cr, version):
+    # Trips completed before date_completed existed are placed on the day
+    # of their last write, then the daily cost rollup is built from scratch.
+    cr.execute("""
+        UPDATE fleetflow_trip
+           SET date_completed = write_date::date
+         WHERE state = 'completed' AND date_completed IS NULL
+    """)
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['fleetflow.vehicle.daily.cost']._rebuild()
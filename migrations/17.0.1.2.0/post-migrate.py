@@ -0,0 +1,5 @@
+def migrate(cr, version):
+    # maintenance.vehicle_status and expense.trip_state are no longer
+    # stored; the ORM leaves their columns behind.
+    cr.execute("ALTER TABLE fleetflow_maintenance DROP COLUMN IF EXISTS vehicle_status")
+    cr.execute("ALTER TABLE fleetflow_expense DROP COLUMN IF EXISTS trip_state")
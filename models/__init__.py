@@ -1,3 +1,10 @@
+from . import instrumentation
+from . import throughput
+from . import sync
+from . import dashboard_snapshot
+from . import export_job
+from . import vehicle_daily_cost
+from . import vehicle_telemetry
 from . import fleet_vehicle
 from . import driver
 from . import trip
@@ -5,3 +12,6 @@ from . import maintenance
 from . import expense
 from . import dashboard
 from . import command_center
+from . import dispatch_matcher
+from . import ir_websocket
+from . import ir_sequence
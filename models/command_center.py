@@ -1,5 +1,35 @@
+import time
+from functools import partial
+
 from odoo import api, models
 
+# Bus channel (per company) and notification type of Command Center pushes.
+COMMAND_CENTER_CHANNEL = 'fleetflow_command_center'
+COMMAND_CENTER_NOTIFICATION = 'fleetflow_command_center/update'
+
+VEHICLE_STATUSES = ('available', 'on_trip', 'in_service', 'in_shop',
+                    'maintenance', 'inactive', 'retired')
+VEHICLE_TYPES = ('car', 'truck', 'van', 'bus', 'other')
+
+# Per-worker KPI cache: (db, company, vehicle_type, vehicle_status) →
+# (expiry, data). Changes committed by this worker reset it at once; the TTL
+# bounds how stale another worker's entry can get.
+KPI_CACHE_TTL = 15
+_kpi_cache = {}
+
+
+def _kpi_cache_reset(dbname, company_id, data):
+    """Drop a company's cached KPIs and seed the unfiltered entry with ``data``."""
+    for key in list(_kpi_cache):
+        if key[:2] == (dbname, company_id):
+            _kpi_cache.pop(key, None)
+    _kpi_cache[(dbname, company_id, None, None)] = (time.monotonic() + KPI_CACHE_TTL, data)
+
+
+# Fields whose changes move a Command Center KPI or the live feeds.
+VEHICLE_KPI_FIELDS = {'status', 'vehicle_type', 'company_id', 'active', 'name', 'license_plate'}
+TRIP_KPI_FIELDS = {'state', 'vehicle_id', 'driver_id', 'origin', 'destination', 'cargo_weight'}
+
 
 class FleetCommandCenter(models.Model):
     """
@@ -17,32 +47,62 @@ class FleetCommandCenter(models.Model):
         Return Command Center KPIs, optionally filtered by vehicle_type
         and / or vehicle_status.
 
+        Results are cached per company and filter for KPI_CACHE_TTL
+        seconds. Vehicle and trip changes drop the company's entries once
+        their transaction commits (see _command_center_push).
+
         :param vehicle_type: str|None  – one of 'car','truck','van','bus','other'
         :param vehicle_status: str|None – one of the status selection values
         :return: dict with KPI values and breakdown lists
         """
+        # The cache must not let a user skip the ACL check of a cold read.
+        self.env['fleetflow.vehicle'].check_access_rights('read')
+        self.env['fleetflow.trip'].check_access_rights('read')
+
+        key = (self.env.cr.dbname, self.env.company.id, vehicle_type, vehicle_status)
+        cached = _kpi_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        data = self._compute_command_center_data(vehicle_type, vehicle_status)
+        _kpi_cache[key] = (time.monotonic() + KPI_CACHE_TTL, data)
+        return data
+
+    @api.model
+    def _compute_command_center_data(self, vehicle_type=None, vehicle_status=None):
         Vehicle = self.env['fleetflow.vehicle']
         Trip    = self.env['fleetflow.trip']
         company_id = self.env.company.id
 
-        # ── Base domain (always scoped to current company) ────────────
-        base_domain = [('company_id', '=', company_id)]
-
-        if vehicle_type:
-            base_domain.append(('vehicle_type', '=', vehicle_type))
-
-        # ── KPI 1 – Active Fleet (on_trip) ────────────────────────────
-        active_domain = base_domain + [('status', '=', 'on_trip')]
-        active_fleet_count = Vehicle.search_count(active_domain)
-
-        # ── KPI 2 – Maintenance Alerts (in_shop) ─────────────────────
-        alert_domain = base_domain + [('status', '=', 'in_shop')]
-        maintenance_alerts = Vehicle.search_count(alert_domain)
+        # ── One GROUP BY (status, type) feeds every vehicle KPI ───────
+        # KPIs honour both filters; each breakdown honours the other
+        # filter only, so the filter bar still shows every option.
+        active_fleet_count = maintenance_alerts = total_vehicles = 0
+        status_breakdown = dict.fromkeys(VEHICLE_STATUSES, 0)
+        type_breakdown = dict.fromkeys(VEHICLE_TYPES, 0)
+        groups = Vehicle._read_group(
+            [('company_id', '=', company_id)],
+            groupby=['status', 'vehicle_type'],
+            aggregates=['__count'],
+        )
+        for status, vtype, count in groups:
+            type_match = not vehicle_type or vtype == vehicle_type
+            status_match = not vehicle_status or status == vehicle_status
+            if type_match:
+                status_breakdown[status] = status_breakdown.get(status, 0) + count
+            if status_match:
+                type_breakdown[vtype] = type_breakdown.get(vtype, 0) + count
+            if type_match and status_match:
+                # KPI 1 – Active Fleet (on_trip)
+                if status == 'on_trip':
+                    active_fleet_count += count
+                # KPI 2 – Maintenance Alerts (in_shop)
+                elif status == 'in_shop':
+                    maintenance_alerts += count
+                # Total excludes retired/inactive so the ratio is meaningful
+                if status not in ('inactive', 'retired'):
+                    total_vehicles += count
 
         # ── KPI 3 – Utilization Rate ──────────────────────────────────
-        # Total excludes retired/inactive so the ratio is meaningful
-        total_domain = base_domain + [('status', 'not in', ['inactive', 'retired'])]
-        total_vehicles = Vehicle.search_count(total_domain)
         utilization_rate = (
             round(active_fleet_count / total_vehicles * 100.0, 1)
             if total_vehicles else 0.0
@@ -52,21 +112,6 @@ class FleetCommandCenter(models.Model):
         trip_domain = [('company_id', '=', company_id), ('state', '=', 'draft')]
         pending_cargo = Trip.search_count(trip_domain)
 
-        # ── Breakdown: vehicles by status (for filter bar hint) ───────
-        status_breakdown = {}
-        for sv in ('available', 'on_trip', 'in_service', 'in_shop',
-                   'maintenance', 'inactive', 'retired'):
-            status_breakdown[sv] = Vehicle.search_count(
-                base_domain + [('status', '=', sv)]
-            )
-
-        # ── Breakdown: vehicles by type ───────────────────────────────
-        type_breakdown = {}
-        for tv in ('car', 'truck', 'van', 'bus', 'other'):
-            type_breakdown[tv] = Vehicle.search_count(
-                [('company_id', '=', company_id), ('vehicle_type', '=', tv)]
-            )
-
         # ── Recent active trips for the live feed table ───────────────
         recent_trips = Trip.search_read(
             domain=[('company_id', '=', company_id),
@@ -103,3 +148,73 @@ class FleetCommandCenter(models.Model):
                 'vehicle_status': vehicle_status,
             },
         }
+
+    # ── Push channel ──────────────────────────────────────────────────
+
+    def _command_center_notify(self, companies):
+        """
+        Queue a KPI push for ``companies``. However many vehicles or trips
+        change in the transaction, the KPIs are computed once per company
+        right before commit and sent on the bus to every open Command
+        Center tab of that company.
+        """
+        if not companies:
+            return
+        pending = self.env.cr.precommit.data.setdefault('fleetflow.command_center', set())
+        if not pending:
+            self.env.cr.precommit.add(self.env['fleetflow.vehicle']._command_center_push)
+        pending.update(companies.ids)
+
+    def _command_center_push(self):
+        company_ids = self.env.cr.precommit.data.pop('fleetflow.command_center', set())
+        Vehicle = self.env['fleetflow.vehicle'].sudo()
+        dbname = self.env.cr.dbname
+        for company in self.env['res.company'].sudo().browse(sorted(company_ids)):
+            data = Vehicle.with_company(company)._compute_command_center_data()
+            self.env['bus.bus']._sendone(
+                (company, COMMAND_CENTER_CHANNEL), COMMAND_CENTER_NOTIFICATION, data,
+            )
+            self.env.cr.postcommit.add(partial(_kpi_cache_reset, dbname, company.id, data))
+        self.env.flush_all()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self._command_center_notify(records.company_id)
+        return records
+
+    def write(self, vals):
+        companies = self.company_id if VEHICLE_KPI_FIELDS.intersection(vals) else None
+        res = super().write(vals)
+        if companies is not None:
+            self._command_center_notify(companies | self.company_id)
+        return res
+
+    def unlink(self):
+        companies = self.company_id
+        res = super().unlink()
+        self._command_center_notify(companies)
+        return res
+
+
+class FleetCommandCenterTrip(models.Model):
+    """Pushes Command Center updates when trips move through their lifecycle."""
+    _inherit = 'fleetflow.trip'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['fleetflow.vehicle']._command_center_notify(records.company_id)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if TRIP_KPI_FIELDS.intersection(vals):
+            self.env['fleetflow.vehicle']._command_center_notify(self.company_id)
+        return res
+
+    def unlink(self):
+        companies = self.company_id
+        res = super().unlink()
+        self.env['fleetflow.vehicle']._command_center_notify(companies)
+        return res
@@ -1,5 +1,14 @@
 from odoo import api, fields, models
 
+DASHBOARD_METRICS = (
+    'active_fleet_count',
+    'vehicles_in_shop',
+    'utilization_rate',
+    'pending_trips',
+    'total_revenue',
+    'total_operational_cost',
+)
+
 
 class FleetflowDashboard(models.Model):
     _name = 'fleetflow.dashboard'
@@ -17,54 +26,54 @@ class FleetflowDashboard(models.Model):
     total_operational_cost = fields.Monetary(currency_field='currency_id', compute='_compute_dashboard_metrics')
 
     def get_dashboard_data(self):
+        """Return the dashboard KPIs from the company's latest snapshot."""
         self.ensure_one()
+        snapshot = self.env['fleetflow.dashboard.snapshot'].sudo()._get_current(self.company_id)
+        if not snapshot:
+            return self._aggregate_dashboard_data(self.company_id)
+        return {name: snapshot[name] for name in DASHBOARD_METRICS}
 
+    @api.model
+    def _aggregate_dashboard_data(self, company):
+        """Compute the dashboard KPIs of ``company`` from the live tables."""
         vehicle_obj = self.env['fleetflow.vehicle']
         trip_obj = self.env['fleetflow.trip']
 
-        fleet_domain = [
-            ('company_id', '=', self.company_id.id),
-            ('status', 'not in', ('inactive', 'retired')),
-        ]
-        active_fleet_count = vehicle_obj.search_count(fleet_domain)
-
-        vehicles_in_shop = vehicle_obj.search_count([
-            ('company_id', '=', self.company_id.id),
-            ('status', '=', 'in_shop'),
-        ])
-
-        on_trip_count = vehicle_obj.search_count([
-            ('company_id', '=', self.company_id.id),
-            ('status', '=', 'on_trip'),
-        ])
+        vehicles_by_status = dict(vehicle_obj._read_group(
+            domain=[('company_id', '=', company.id)],
+            groupby=['status'],
+            aggregates=['__count'],
+        ))
+        active_fleet_count = sum(
+            count for status, count in vehicles_by_status.items()
+            if status not in ('inactive', 'retired')
+        )
+        vehicles_in_shop = vehicles_by_status.get('in_shop', 0)
+        on_trip_count = vehicles_by_status.get('on_trip', 0)
         utilization_rate = (on_trip_count / active_fleet_count * 100.0) if active_fleet_count else 0.0
 
         pending_trips = trip_obj.search_count([
-            ('company_id', '=', self.company_id.id),
+            ('company_id', '=', company.id),
             ('state', 'in', ('draft', 'dispatched')),
         ])
 
-        revenue_result = trip_obj.read_group(
-            domain=[('company_id', '=', self.company_id.id), ('state', '=', 'completed')],
-            fields=['revenue'],
-            groupby=[],
+        [(total_revenue,)] = trip_obj._read_group(
+            domain=[('company_id', '=', company.id), ('state', '=', 'completed')],
+            aggregates=['revenue:sum'],
         )
-        total_revenue = revenue_result[0].get('revenue', 0.0) if revenue_result else 0.0
 
-        operational_cost_result = vehicle_obj.read_group(
-            domain=[('company_id', '=', self.company_id.id)],
-            fields=['total_operational_cost'],
-            groupby=[],
+        [(total_operational_cost,)] = vehicle_obj._read_group(
+            domain=[('company_id', '=', company.id)],
+            aggregates=['total_operational_cost:sum'],
         )
-        total_operational_cost = operational_cost_result[0].get('total_operational_cost', 0.0) if operational_cost_result else 0.0
 
         return {
             'active_fleet_count': active_fleet_count,
             'vehicles_in_shop': vehicles_in_shop,
             'utilization_rate': utilization_rate,
             'pending_trips': pending_trips,
-            'total_revenue': total_revenue,
-            'total_operational_cost': total_operational_cost,
+            'total_revenue': total_revenue or 0.0,
+            'total_operational_cost': total_operational_cost or 0.0,
         }
 
     @api.depends_context('uid', 'allowed_company_ids')
@@ -0,0 +1,143 @@
+from odoo import api, fields, models
+
+# Fields whose changes move a dashboard KPI, per source model.
+SNAPSHOT_TRIGGERS = {
+    'fleetflow.vehicle': {'status', 'company_id', 'active', 'acquisition_cost'},
+    'fleetflow.trip': {'state', 'revenue', 'vehicle_id'},
+    'fleetflow.expense': {'fuel_cost', 'vehicle_id'},
+    'fleetflow.maintenance': {'cost', 'vehicle_id'},
+}
+
+
+class FleetflowDashboardSnapshot(models.Model):
+    """
+    Persisted dashboard KPIs, one row per company and day. Transactions
+    touching vehicles, trips, expenses or maintenance only queue their
+    companies right before commit; today's rows are then recomputed by a
+    single refresh cron, woken up by the queue, and reconciled every 15
+    minutes. Older rows are kept as history for trend charts.
+    """
+    _name = 'fleetflow.dashboard.snapshot'
+    _description = 'Fleet Dashboard KPI Snapshot'
+    _order = 'snapshot_date desc, id desc'
+
+    company_id = fields.Many2one('res.company', required=True, readonly=True, index=True)
+    snapshot_date = fields.Date(required=True, readonly=True)
+    currency_id = fields.Many2one(related='company_id.currency_id', readonly=True)
+
+    active_fleet_count = fields.Integer(readonly=True)
+    vehicles_in_shop = fields.Integer(readonly=True)
+    utilization_rate = fields.Float(readonly=True)
+    pending_trips = fields.Integer(readonly=True)
+    total_revenue = fields.Monetary(currency_field='currency_id', readonly=True)
+    total_operational_cost = fields.Monetary(currency_field='currency_id', readonly=True)
+
+    _sql_constraints = [
+        ('fleetflow_snapshot_company_date_unique', 'unique(company_id, snapshot_date)',
+         'Only one KPI snapshot per company and day.'),
+    ]
+
+    @api.model
+    def _get_current(self, company):
+        """Return the latest snapshot of ``company`` (may be empty)."""
+        return self.search([('company_id', '=', company.id)], limit=1)
+
+    @api.model
+    def _refresh(self, companies):
+        """Recompute today's snapshot of each company in ``companies``.
+
+        Outside of data generation only the refresh cron calls this: being
+        the single writer of the snapshot rows, it takes no lock.
+        """
+        today = fields.Date.context_today(self)
+        Dashboard = self.env['fleetflow.dashboard'].sudo()
+        Snapshot = self.sudo()
+        for company in companies:
+            values = Dashboard._aggregate_dashboard_data(company)
+            snapshot = Snapshot.search([('company_id', '=', company.id), ('snapshot_date', '=', today)])
+            if snapshot:
+                snapshot.write(values)
+            else:
+                Snapshot.create({'company_id': company.id, 'snapshot_date': today, **values})
+
+    @api.model
+    def _mark_dirty(self, companies):
+        """Queue a refresh of ``companies`` for the end of the transaction."""
+        if not companies:
+            return
+        pending = self.env.cr.precommit.data.setdefault('fleetflow.dashboard.snapshot', set())
+        if not pending:
+            self.env.cr.precommit.add(self.env['fleetflow.dashboard.snapshot']._flush_dirty)
+        pending.update(companies.ids)
+
+    def _flush_dirty(self):
+        company_ids = self.env.cr.precommit.data.pop('fleetflow.dashboard.snapshot', set())
+        self._enqueue(company_ids)
+        self.env.flush_all()
+
+    @api.model
+    def _enqueue(self, company_ids):
+        """Queue ``company_ids`` for the refresh cron and wake it up.
+
+        Writers only ever insert into the queue, so concurrent transactions
+        never update the same row and cannot fail to serialize on it.
+        """
+        if not company_ids:
+            return
+        self.env.cr.execute("""
+            INSERT INTO fleetflow_dashboard_snapshot_queue (company_id)
+            SELECT unnest(%s::int[])
+        """, [sorted(company_ids)])
+        self.env.ref('fleetflow.ir_cron_fleetflow_dashboard_snapshot_refresh').sudo()._trigger()
+
+    @api.model
+    def _cron_refresh(self):
+        """Recompute the snapshots of the queued companies."""
+        self.env.cr.execute("DELETE FROM fleetflow_dashboard_snapshot_queue RETURNING company_id")
+        company_ids = {company_id for [company_id] in self.env.cr.fetchall()}
+        self._refresh(self.env['res.company'].sudo().browse(sorted(company_ids)))
+
+    @api.model
+    def _cron_reconcile(self):
+        companies = self.env['fleetflow.vehicle'].sudo().with_context(active_test=False) \
+            .search([]).company_id | self.env['fleetflow.dashboard'].sudo().search([]).company_id
+        self._enqueue(companies.ids)
+
+
+class FleetflowDashboardSnapshotQueue(models.Model):
+    """Companies whose snapshot awaits the refresh cron. Append-only for
+    writers; the cron consumes the rows."""
+    _name = 'fleetflow.dashboard.snapshot.queue'
+    _description = 'Fleet Dashboard KPI Snapshot Queue'
+    _log_access = False
+
+    company_id = fields.Many2one('res.company', required=True, ondelete='cascade')
+
+
+class FleetflowSnapshotTriggerMixin(models.AbstractModel):
+    """Marks the touched companies' dashboard snapshots for refresh."""
+    _name = 'fleetflow.dashboard.snapshot.trigger'
+    _description = 'Fleet Dashboard Snapshot Trigger'
+
+    def _snapshot_mark_dirty(self, companies):
+        self.env['fleetflow.dashboard.snapshot']._mark_dirty(companies)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self._snapshot_mark_dirty(records.company_id)
+        return records
+
+    def write(self, vals):
+        triggered = SNAPSHOT_TRIGGERS.get(self._name, set()).intersection(vals)
+        companies = self.company_id if triggered else None
+        res = super().write(vals)
+        if companies is not None:
+            self._snapshot_mark_dirty(companies | self.company_id)
+        return res
+
+    def unlink(self):
+        companies = self.company_id
+        res = super().unlink()
+        self._snapshot_mark_dirty(companies)
+        return res
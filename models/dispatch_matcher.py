@@ -0,0 +1,225 @@
+import bisect
+import logging
+from collections import defaultdict
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+# Cost of a pair: spare capacity in tons, plus MATCH_REASSIGN_COST when the
+# trip does not keep the vehicle (or driver) it already has, so a plan that
+# is already feasible is left alone. INFEASIBLE marks forbidden pairs.
+MATCH_REASSIGN_COST = 1.0
+INFEASIBLE = 1e9
+
+# Rounds given to trips whose vehicle type ran out of drivers.
+MATCH_MAX_ROUNDS = 3
+
+# Vehicle and driver statuses free to take a new trip.
+MATCH_VEHICLE_STATUSES = ('available',)
+MATCH_DRIVER_STATUSES = ('available', 'off_duty')
+
+
+class FleetflowDispatchMatcher(models.Model):
+    """
+    Batch dispatch matcher: proposes a vehicle and a driver for every draft
+    trip of a company at once, instead of a dispatcher picking them by hand
+    and the trip constraints rejecting bad picks one by one.
+
+    Pairs are feasible when the vehicle carries the cargo, the driver holds
+    the vehicle's license category and the license has not expired. Trips
+    are first assigned to vehicles (fewest spare tons), then the chosen
+    vehicles to drivers, each step as a min-cost assignment with scipy, or
+    a greedy best fit when numpy / scipy are not installed.
+    """
+    _inherit = 'fleetflow.trip'
+
+    @api.model
+    def _match_load(self, company, trips=None):
+        """Return the rows (dicts) of the trips, vehicles and drivers to match."""
+        today = fields.Date.context_today(self)
+        if trips is None:
+            trips = self.search([('company_id', '=', company.id), ('state', '=', 'draft')])
+        trips = trips.filtered(lambda t: t.state == 'draft' and t.company_id == company)
+        trip_rows = trips.read(['cargo_weight', 'vehicle_id', 'driver_id'], load=None)
+
+        Vehicle = self.env['fleetflow.vehicle']
+        vehicle_rows = Vehicle.search_read(
+            [('company_id', '=', company.id), ('status', 'in', MATCH_VEHICLE_STATUSES)],
+            ['max_capacity', 'vehicle_type'], load=None,
+        )
+        Driver = self.env['fleetflow.driver']
+        driver_rows = Driver.search_read(
+            [('company_id', '=', company.id), ('status', 'in', MATCH_DRIVER_STATUSES),
+             '|', ('license_expiry', '=', False), ('license_expiry', '>=', today)],
+            ['license_category'], load=None,
+        )
+        # A dispatched trip keeps its vehicle and driver whatever their status.
+        busy_vehicles, busy_drivers = set(), set()
+        for vehicle, driver in self._read_group(
+                [('company_id', '=', company.id), ('state', '=', 'dispatched')], ['vehicle_id', 'driver_id']):
+            busy_vehicles.add(vehicle.id)
+            busy_drivers.add(driver.id)
+        vehicle_rows = [row for row in vehicle_rows if row['id'] not in busy_vehicles]
+        driver_rows = [row for row in driver_rows if row['id'] not in busy_drivers]
+        return trip_rows, vehicle_rows, driver_rows
+
+    @api.model
+    def _match_draft_trips(self, company, trips=None):
+        """
+        Propose a (vehicle, driver) pair for the draft trips of ``company``
+        (or the draft trips among ``trips``).
+
+        Returns ``(pairs, unmatched)``: ``pairs`` maps trip ids to
+        ``(vehicle_id, driver_id)``, ``unmatched`` maps the other trip ids
+        to the reason no pair was found.
+        """
+        trip_rows, vehicle_rows, driver_rows = self._match_load(company, trips)
+        solver = _assign_optimal if np is not None and linear_sum_assignment is not None else _assign_greedy
+        pairs, unmatched = {}, {}
+        # Vehicles are picked before drivers: a trip whose vehicle type runs
+        # out of drivers gets another round with the vehicles left.
+        for _round in range(MATCH_MAX_ROUNDS):
+            matched, missed, short_of_drivers = _match_round(trip_rows, vehicle_rows, driver_rows, solver)
+            pairs.update(matched)
+            for trip_id in matched:
+                unmatched.pop(trip_id, None)
+            unmatched.update(missed)
+            if not matched or not short_of_drivers:
+                break
+            used_vehicles = {vehicle_id for vehicle_id, _driver_id in matched.values()}
+            used_drivers = {driver_id for _vehicle_id, driver_id in matched.values()}
+            vehicle_rows = [row for row in vehicle_rows if row['id'] not in used_vehicles]
+            driver_rows = [row for row in driver_rows if row['id'] not in used_drivers]
+            trip_rows = [row for row in trip_rows if row['id'] in short_of_drivers]
+        _logger.info("Dispatch matcher: %d trips matched, %d unmatched", len(pairs), len(unmatched))
+        return pairs, unmatched
+
+    @api.model
+    def _apply_matches(self, pairs):
+        """Write the proposed vehicle and driver on the trips of ``pairs``."""
+        trips = self.browse(sorted(pairs))
+        for trip in trips:
+            vehicle_id, driver_id = pairs[trip.id]
+            if (trip.vehicle_id.id, trip.driver_id.id) != (vehicle_id, driver_id):
+                trip.write({'vehicle_id': vehicle_id, 'driver_id': driver_id})
+        return trips
+
+
+def _match_round(trip_rows, vehicle_rows, driver_rows, solver):
+    """
+    Assign trips to vehicles, then the chosen vehicles to drivers of their
+    license category. Returns ``(pairs, unmatched, short_of_drivers)``, the
+    last one being the ids of the trips that got a vehicle but no driver.
+    """
+    # Vehicle types nobody can drive are left out.
+    categories = {row['license_category'] for row in driver_rows}
+    vehicle_rows = _shortlist(
+        [row for row in vehicle_rows if row['vehicle_type'] in categories],
+        lambda row: (row['max_capacity'], row['vehicle_type']),
+        {row['vehicle_id'] for row in trip_rows}, len(trip_rows),
+    )
+    vehicle_of = solver(
+        [row['cargo_weight'] or 0.0 for row in trip_rows],
+        [row['max_capacity'] or 0.0 for row in vehicle_rows],
+        [row['vehicle_id'] for row in trip_rows],
+        [row['id'] for row in vehicle_rows],
+    )
+
+    pairs, unmatched, short_of_drivers = {}, {}, set()
+    by_category = defaultdict(list)
+    for index, vehicle in enumerate(vehicle_of):
+        if vehicle is None:
+            unmatched[trip_rows[index]['id']] = 'No available vehicle with enough capacity'
+        else:
+            by_category[vehicle_rows[vehicle]['vehicle_type']].append(index)
+    for category, indexes in by_category.items():
+        drivers = _shortlist(
+            [row for row in driver_rows if row['license_category'] == category],
+            lambda row: None, {trip_rows[index]['driver_id'] for index in indexes}, len(indexes),
+        )
+        # Every driver fits every vehicle of the category: the only cost
+        # left is taking a trip away from its current driver.
+        driver_of = solver(
+            [0.0] * len(indexes),
+            [0.0] * len(drivers),
+            [trip_rows[index]['driver_id'] for index in indexes],
+            [row['id'] for row in drivers],
+        )
+        for index, driver in zip(indexes, driver_of):
+            trip_id = trip_rows[index]['id']
+            if driver is None:
+                unmatched[trip_id] = f'No available driver licensed for {category}'
+                short_of_drivers.add(trip_id)
+            else:
+                pairs[trip_id] = (vehicle_rows[vehicle_of[index]]['id'], drivers[driver]['id'])
+    return pairs, unmatched, short_of_drivers
+
+
+def _shortlist(rows, key, current_ids, limit):
+    """Keep at most ``limit`` rows per ``key`` value, plus the rows of
+    ``current_ids``. Rows with the same key cost the same, so ``limit``
+    (the number of trips) of them are always enough for an optimal
+    assignment, and the cost matrix stays small on a large fleet."""
+    kept, counts = [], defaultdict(int)
+    for row in rows:
+        if row['id'] in current_ids:
+            kept.append(row)
+        elif counts[key(row)] < limit:
+            counts[key(row)] += 1
+            kept.append(row)
+    return kept
+
+
+def _assign_optimal(loads, capacities, current, candidates):
+    """
+    Min-cost assignment of rows (trips, with ``loads`` and their ``current``
+    candidate id) to columns (``candidates`` with ``capacities``). Returns
+    the column index of each row, or None.
+    """
+    if not loads or not capacities:
+        return [None] * len(loads)
+    load = np.asarray(loads, dtype=float)[:, None]
+    capacity = np.asarray(capacities, dtype=float)[None, :]
+    cost = capacity - load
+    cost += MATCH_REASSIGN_COST * (np.asarray(current)[:, None] != np.asarray(candidates)[None, :])
+    cost[capacity < load] = INFEASIBLE
+    rows, columns = linear_sum_assignment(cost)
+    result = [None] * len(loads)
+    for row, column in zip(rows, columns):
+        if cost[row, column] < INFEASIBLE:
+            result[row] = column
+    return result
+
+
+def _assign_greedy(loads, capacities, current, candidates):
+    """Best-fit decreasing fallback of _assign_optimal: heaviest rows first,
+    each keeps its current column if it fits, else takes the smallest free
+    column that fits."""
+    result = [None] * len(loads)
+    position = {candidate: index for index, candidate in enumerate(candidates)}
+    free = sorted((capacity, index) for index, capacity in enumerate(capacities))
+    order = sorted(range(len(loads)), key=lambda row: loads[row], reverse=True)
+    # Keeping the current column wins over a tighter fit, as in the cost.
+    for row in order:
+        column = position.get(current[row])
+        if column is not None and capacities[column] >= loads[row]:
+            slot = bisect.bisect_left(free, (capacities[column], column))
+            if slot < len(free) and free[slot] == (capacities[column], column):
+                result[row] = free.pop(slot)[1]
+    for row in order:
+        if result[row] is not None:
+            continue
+        slot = bisect.bisect_left(free, (loads[row], -1))
+        if slot < len(free):
+            result[row] = free.pop(slot)[1]
+    return result
@@ -1,12 +1,26 @@
+from collections import defaultdict
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
 from datetime import date
 
+from .throughput import throughput
+
+SAFETY_SCORE_LAST_RUN_PARAM = 'fleetflow.safety_score_last_run'
+SAFETY_SCORE_BATCH_SIZE = 1000
+
+
+def _safety_score_today():
+    """The date a license counts as expired from, shared by the safety score
+    and the nightly cron recomputing it, whatever the user's timezone."""
+    return fields.Date.today()
+
 
 class FleetflowDriver(models.Model):
     _name = 'fleetflow.driver'
     _description = 'Fleet Driver'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'fleetflow.sync.mixin', 'fleetflow.instrumentation.mixin']
     _order = 'name'
 
     name = fields.Char(required=True, tracking=True)
@@ -53,19 +67,44 @@ class FleetflowDriver(models.Model):
     vehicle_ids = fields.One2many('fleetflow.vehicle', 'driver_id', string='Vehicles')
     trip_ids = fields.One2many('fleetflow.trip', 'driver_id', string='Trips')
 
+    def init(self):
+        super().init()
+        cr = self.env.cr
+        create_index(cr, 'fleetflow_driver_company_id_status_index', self._table, ['company_id', 'status'])
+        # Range scanned nightly by _cron_recompute_expired_safety_scores.
+        create_index(cr, 'fleetflow_driver_license_expiry_index', self._table, ['license_expiry'],
+                     where='license_expiry IS NOT NULL')
+
     @api.depends('trip_ids.state')
     def _compute_completion_rate(self):
+        # One grouped count over fleetflow.trip for the whole recordset;
+        # unsaved drivers (onchange) are counted from the cache.
+        counts = defaultdict(lambda: {'total': 0, 'completed': 0})
+        saved = self.filtered(lambda d: isinstance(d.id, int))
+        if saved:
+            groups = self.env['fleetflow.trip']._read_group(
+                [('driver_id', 'in', saved.ids)],
+                groupby=['driver_id', 'state'],
+                aggregates=['__count'],
+            )
+            for driver, state, count in groups:
+                counts[driver.id]['total'] += count
+                if state == 'completed':
+                    counts[driver.id]['completed'] += count
+        for record in self - saved:
+            counts[record.id]['total'] = len(record.trip_ids)
+            counts[record.id]['completed'] = len(record.trip_ids.filtered(lambda t: t.state == 'completed'))
+
         for record in self:
-            total = len(record.trip_ids)
+            total = counts[record.id]['total']
             if total > 0:
-                completed = len(record.trip_ids.filtered(lambda t: t.state == 'completed'))
-                record.completion_rate = (completed / total) * 100.0
+                record.completion_rate = (counts[record.id]['completed'] / total) * 100.0
             else:
                 record.completion_rate = 0.0
 
     @api.depends('completion_rate', 'license_expiry')
     def _compute_safety_score(self):
-        today = date.today()
+        today = _safety_score_today()
         for record in self:
             # Base score is completion rate (0-100)
             score = record.completion_rate
@@ -88,3 +127,32 @@ class FleetflowDriver(models.Model):
         for record in self:
             if record.license_expiry and record.license_expiry < date.today():
                 raise ValidationError("Driver license has expired. Please renew it before assigning any trips.")
+
+    @api.model
+    def _cron_recompute_expired_safety_scores(self):
+        """
+        safety_score depends on today's date, which no write ever triggers.
+        Each night, recompute it for the drivers whose license expired since
+        the previous run (expiry in [last run, today)), in committed chunks.
+        The first run covers every driver with an expired license.
+        """
+        today = _safety_score_today()
+        ICP = self.env['ir.config_parameter'].sudo()
+        last_run = fields.Date.to_date(ICP.get_param(SAFETY_SCORE_LAST_RUN_PARAM))
+
+        domain = [('license_expiry', '<', today)]
+        if last_run:
+            domain.append(('license_expiry', '>=', last_run))
+        # Thousands of nightly score changes would each post a chatter
+        # message; throughput mode skips their tracking.
+        drivers = throughput(self.sudo().with_context(active_test=False)).search(domain)
+
+        field = self._fields['safety_score']
+        for start in range(0, len(drivers), SAFETY_SCORE_BATCH_SIZE):
+            batch = drivers[start:start + SAFETY_SCORE_BATCH_SIZE]
+            self.env.add_to_compute(field, batch)
+            batch._recompute_recordset(['safety_score'])
+            self.env.cr.commit()
+            self.env.invalidate_all()
+
+        ICP.set_param(SAFETY_SCORE_LAST_RUN_PARAM, fields.Date.to_string(today))
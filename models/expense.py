@@ -1,21 +1,34 @@
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
 
 
 class FleetflowExpense(models.Model):
     _name = 'fleetflow.expense'
     _description = 'Fleet Expense'
+    _inherit = ['fleetflow.sync.mixin', 'fleetflow.dashboard.snapshot.trigger', 'fleetflow.vehicle.daily.cost.trigger', 'fleetflow.instrumentation.mixin']
 
     vehicle_id = fields.Many2one('fleetflow.vehicle', required=True, ondelete='cascade')
     trip_id = fields.Many2one('fleetflow.trip', required=False, ondelete='cascade', domain="[('vehicle_id', '=', vehicle_id)]")
     company_id = fields.Many2one(related='vehicle_id.company_id', store=True, readonly=True)
-    trip_state = fields.Selection(related='trip_id.state', store=True, readonly=True)
+    # Not stored, for the same reason as maintenance.vehicle_status: every
+    # state change of a trip would rewrite its expenses.
+    trip_state = fields.Selection(related='trip_id.state', readonly=True)
     liters = fields.Float(required=True, default=0.0)
     fuel_cost = fields.Float(required=True, default=0.0)
     expense_date = fields.Date(required=True, default=fields.Date.context_today)
 
     cost_per_km = fields.Float(compute='_compute_cost_per_km', store=True)
 
+    def init(self):
+        super().init()
+        cr = self.env.cr
+        # Date ranges per vehicle (cost report, daily rollup) and per company
+        # (dashboard, exports).
+        create_index(cr, 'fleetflow_expense_vehicle_id_date_index', self._table, ['vehicle_id', 'expense_date'])
+        create_index(cr, 'fleetflow_expense_company_id_date_index', self._table, ['company_id', 'expense_date'])
+        create_index(cr, 'fleetflow_expense_trip_id_index', self._table, ['trip_id'], where='trip_id IS NOT NULL')
+
     @api.depends('fuel_cost', 'trip_id.start_odometer', 'trip_id.end_odometer')
     def _compute_cost_per_km(self):
         for record in self:
@@ -35,3 +48,13 @@ class FleetflowExpense(models.Model):
                 raise ValidationError('Liters cannot be negative.')
             if record.fuel_cost < 0:
                 raise ValidationError('Fuel cost cannot be negative.')
+
+    # ── Export hooks (fleetflow.export.job) ──────────────────────────
+
+    @api.model
+    def _export_columnar_fields(self):
+        return ['vehicle_id', 'trip_id', 'company_id', 'expense_date', 'liters', 'fuel_cost', 'cost_per_km']
+
+    @api.model
+    def _export_date_field(self):
+        return 'expense_date'
@@ -0,0 +1,390 @@
+import ast
+import csv
+import gzip
+import io
+import logging
+import os
+import shutil
+import time
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools import config
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+_logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 2000
+# A cron run stops after this many seconds and re-triggers itself, well under
+# limit_time_real, so an export of any size never gets its worker killed.
+EXPORT_SLICE_SECONDS = 60
+EXPORT_RETENTION_DAYS = 7
+EXPORT_COMPRESS_LEVEL = 6
+
+# File extension and mimetype of each export format.
+EXPORT_FORMATS = {
+    'csv': ('csv.gz', 'application/gzip'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+# Parquet readers parallelize and skip data per row group; a few hundred
+# thousand rows per group is what warehouse loaders expect.
+PARQUET_ROW_GROUP_SIZE = 250000
+PARQUET_COMPRESSION = 'zstd'
+
+
+class FleetflowExportJob(models.Model):
+    """
+    Background export of a FleetIQ model to a file in the filestore.
+
+    Rows are read in keyset batches with ``read()``, which resolves many2one
+    names per batch, as the requesting user so their record rules apply.
+    The exported model provides, per format:
+
+    * csv: ``_export_read_fields()``, ``_export_csv_header()`` and
+      ``_export_csv_row(vals)``;
+    * parquet: ``_export_columnar_fields()``, typed from the field
+      definitions (see ``_arrow_columns``), and optionally
+      ``_export_date_field()`` for date-range filters.
+
+    CSV files are written as a sequence of gzip members, one per cron slice.
+    Concatenated members are a valid gzip file, and ``file_size`` is only
+    committed once a member is complete, so a slice interrupted half-way is
+    truncated away and resumed from ``last_id``. Parquet slices are written
+    as part files named after their starting id, so a rerun overwrites its
+    own part, and are merged row group by row group once the job is done.
+    """
+    _name = 'fleetflow.export.job'
+    _description = 'Fleet Export Job'
+    _order = 'id desc'
+
+    name = fields.Char(required=True, readonly=True)
+    res_model = fields.Char(string='Model', required=True, readonly=True)
+    domain = fields.Text(default='[]', readonly=True)
+    export_format = fields.Selection(
+        [('csv', 'CSV (gzip)'), ('parquet', 'Parquet')],
+        string='Format', required=True, default='csv', readonly=True,
+    )
+    state = fields.Selection(
+        [
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('done', 'Done'),
+            ('failed', 'Failed'),
+        ],
+        default='queued', required=True, readonly=True, index=True,
+    )
+    user_id = fields.Many2one('res.users', required=True, readonly=True, default=lambda self: self.env.user)
+    company_id = fields.Many2one('res.company', required=True, readonly=True, default=lambda self: self.env.company)
+    # The companies the export was requested for (the requesting user's
+    # allowed companies): a cron has only the job's main company otherwise.
+    company_ids = fields.Many2many('res.company', string='Companies', readonly=True,
+                                   default=lambda self: self.env.companies)
+    total = fields.Integer(readonly=True)
+    processed = fields.Integer(readonly=True)
+    progress = fields.Float(compute='_compute_progress')
+    last_id = fields.Integer(readonly=True)
+    file_name = fields.Char(readonly=True)
+    file_size = fields.Integer(readonly=True)
+    date_done = fields.Datetime(readonly=True)
+    error = fields.Text(readonly=True)
+
+    @api.depends('total', 'processed', 'state')
+    def _compute_progress(self):
+        for job in self:
+            if job.state == 'done':
+                job.progress = 100.0
+            elif job.total:
+                job.progress = min(100.0, job.processed * 100.0 / job.total)
+            else:
+                job.progress = 0.0
+
+    # ── Queueing ─────────────────────────────────────────────────────
+
+    @api.model
+    def _enqueue(self, records, export_format='csv', domain=None, company_ids=None):
+        """Queue an export of ``records`` (or of ``domain`` when given, or of
+        the whole model when ``records`` is empty) and wake up the cron.
+
+        The export reads the rows of ``company_ids`` (default: the current
+        allowed companies), which must all be allowed to the user.
+        """
+        # env.companies raises an AccessError on companies of other users.
+        companies = self.env.companies if not company_ids else \
+            self.with_context(allowed_company_ids=[int(cid) for cid in company_ids]).env.companies
+        if domain is None:
+            domain = [('id', 'in', records.ids)] if records else []
+        if export_format == 'parquet' and pyarrow is None:
+            raise UserError(_('Parquet exports require the pyarrow Python package.'))
+        job = self.create({
+            'name': _('%(model)s export %(date)s',
+                      model=records._description, date=fields.Datetime.now()),
+            'res_model': records._name,
+            'domain': repr(domain),
+            'export_format': export_format,
+            'company_id': companies[0].id,
+            'company_ids': [(6, 0, companies.ids)],
+        })
+        self.env.ref('fleetflow.ir_cron_fleetflow_export_job').sudo()._trigger()
+        return job
+
+    @api.model
+    def _filter_domain(self, model_name, date_from=None, date_to=None, company_ids=None):
+        """Domain of an export of ``model_name`` restricted to a date range
+        (inclusive, on the model's ``_export_date_field()``) and companies."""
+        Model = self.env[model_name]
+        domain = []
+        if date_from or date_to:
+            date_field = Model._export_date_field()
+            if date_from:
+                domain.append((date_field, '>=', date_from))
+            if date_to:
+                if Model._fields[date_field].type == 'datetime':
+                    domain.append((date_field, '<', fields.Date.to_date(date_to) + timedelta(days=1)))
+                else:
+                    domain.append((date_field, '<=', date_to))
+        if company_ids:
+            domain.append(('company_id', 'in', list(company_ids)))
+        return domain
+
+    def action_open(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+    def action_download(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/fleetflow/export/{self.id}/download',
+            'target': 'self',
+        }
+
+    # ── Files ────────────────────────────────────────────────────────
+
+    def _file_path(self):
+        self.ensure_one()
+        directory = os.path.join(config.filestore(self.env.cr.dbname), 'fleetflow_exports')
+        return os.path.join(directory, f'{self.id}.{EXPORT_FORMATS[self.export_format][0]}')
+
+    def _file_mimetype(self):
+        self.ensure_one()
+        return EXPORT_FORMATS[self.export_format][1]
+
+    def _parts_path(self):
+        return self._file_path() + '.parts'
+
+    def _remove_file(self):
+        for job in self:
+            try:
+                os.remove(job._file_path())
+            except FileNotFoundError:
+                pass
+            shutil.rmtree(job._parts_path(), ignore_errors=True)
+
+    def unlink(self):
+        self._remove_file()
+        return super().unlink()
+
+    @api.autovacuum
+    def _gc_export_jobs(self):
+        limit = fields.Datetime.now() - timedelta(days=EXPORT_RETENTION_DAYS)
+        self.search([('state', 'in', ('done', 'failed')), ('write_date', '<', limit)]).unlink()
+
+    # ── Processing ───────────────────────────────────────────────────
+
+    def _export_records(self):
+        """The exported model, as the requesting user in the job's companies."""
+        self.ensure_one()
+        companies = self.company_id | self.company_ids
+        return self.env[self.res_model].with_user(self.user_id).with_context(allowed_company_ids=companies.ids)
+
+    def _export_domain(self):
+        return ast.literal_eval(self.domain or '[]')
+
+    def _iter_batches(self, deadline=None):
+        """Yield keyset batches of records after ``last_id`` until exhausted
+        or ``deadline`` (a time.monotonic() value) has passed."""
+        Model = self._export_records()
+        domain = self._export_domain()
+        last_id = self.last_id
+        while deadline is None or time.monotonic() < deadline:
+            batch = Model.search(domain + [('id', '>', last_id)], order='id', limit=EXPORT_BATCH_SIZE)
+            if not batch:
+                return
+            yield batch
+            last_id = batch.ids[-1]
+            batch.invalidate_recordset()
+
+    def _run_slice_csv(self, deadline):
+        Model = self._export_records()
+        read_fields = Model._export_read_fields()
+        path = self._file_path()
+        processed, last_id = self.processed, self.last_id
+        with open(path, 'ab') as fp:
+            fp.truncate(self.file_size)
+            with gzip.GzipFile(fileobj=fp, mode='wb', compresslevel=EXPORT_COMPRESS_LEVEL) as gz, \
+                    io.TextIOWrapper(gz, encoding='utf-8', newline='') as text:
+                writer = csv.writer(text)
+                if not self.file_size:
+                    writer.writerow(Model._export_csv_header())
+                for batch in self._iter_batches(deadline):
+                    writer.writerows(Model._export_csv_row(vals) for vals in batch.read(read_fields))
+                    processed += len(batch)
+                    last_id = batch.ids[-1]
+            fp.flush()
+            os.fsync(fp.fileno())
+            size = os.fstat(fp.fileno()).st_size
+        return {'processed': processed, 'last_id': last_id, 'file_size': size}
+
+    def _arrow_columns(self, Model, field_names):
+        """Return ``[(column, field, schema type, converter)]`` for
+        ``field_names`` of ``Model``, where the converter maps the read()
+        value of ``field`` to a Python value of the column type. A many2one
+        yields an id and a name column."""
+        def value(v):
+            return v if v is not False else None
+
+        columns = []
+        for fname in field_names:
+            field = Model._fields[fname]
+            if field.type == 'many2one':
+                columns.append((fname, fname, pyarrow.int64(), lambda v: v[0] if v else None))
+                columns.append((f'{fname}_name', fname, pyarrow.string(), lambda v: v[1] if v else None))
+            elif field.type in ('float', 'monetary'):
+                columns.append((fname, fname, pyarrow.float64(), value))
+            elif field.type == 'integer':
+                columns.append((fname, fname, pyarrow.int64(), value))
+            elif field.type == 'boolean':
+                columns.append((fname, fname, pyarrow.bool_(), bool))
+            elif field.type == 'date':
+                columns.append((fname, fname, pyarrow.date32(), value))
+            elif field.type == 'datetime':
+                columns.append((fname, fname, pyarrow.timestamp('us', tz='UTC'), value))
+            else:
+                columns.append((fname, fname, pyarrow.string(), value))
+        return columns
+
+    def _run_slice_parquet(self, deadline):
+        Model = self._export_records()
+        field_names = Model._export_columnar_fields()
+        columns = [('id', 'id', pyarrow.int64(), int)] + self._arrow_columns(Model, field_names)
+        read_fields = ['id'] + list(field_names)
+        schema = pyarrow.schema([(name, type_) for name, _source, type_, _convert in columns])
+
+        parts = self._parts_path()
+        os.makedirs(parts, exist_ok=True)
+        part = os.path.join(parts, f'part-{self.last_id:012d}.parquet')
+        processed, last_id = self.processed, self.last_id
+        data = {name: [] for name, _source, _type, _convert in columns}
+
+        def flush_row_group(writer):
+            writer.write_table(pyarrow.Table.from_pydict(data, schema=schema))
+            for values in data.values():
+                values.clear()
+
+        with pyarrow.parquet.ParquetWriter(part + '.tmp', schema, compression=PARQUET_COMPRESSION) as writer:
+            for batch in self._iter_batches(deadline):
+                for vals in batch.read(read_fields):
+                    for name, source, _type, convert in columns:
+                        data[name].append(convert(vals[source]))
+                processed += len(batch)
+                last_id = batch.ids[-1]
+                if len(data['id']) >= PARQUET_ROW_GROUP_SIZE:
+                    flush_row_group(writer)
+            if data['id']:
+                flush_row_group(writer)
+        os.replace(part + '.tmp', part)
+        return {'processed': processed, 'last_id': last_id}
+
+    def _finalize_parquet(self):
+        """Merge the part files into the final file, keeping row groups."""
+        parts = self._parts_path()
+        names = sorted(name for name in os.listdir(parts) if name.endswith('.parquet'))
+        path = self._file_path()
+        writer = None
+        try:
+            for name in names:
+                part = pyarrow.parquet.ParquetFile(os.path.join(parts, name))
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(
+                        path + '.tmp', part.schema_arrow, compression=PARQUET_COMPRESSION)
+                for index in range(part.num_row_groups):
+                    writer.write_table(part.read_row_group(index))
+        finally:
+            if writer is not None:
+                writer.close()
+        os.replace(path + '.tmp', path)
+        shutil.rmtree(parts, ignore_errors=True)
+        return {'file_size': os.path.getsize(path)}
+
+    def _run_slice(self, deadline):
+        """Export as much of the job as fits before ``deadline``; return
+        whether the job is finished."""
+        self.ensure_one()
+        if self.state == 'queued':
+            os.makedirs(os.path.dirname(self._file_path()), exist_ok=True)
+            self._remove_file()
+            Model = self._export_records()
+            self.write({
+                'state': 'running',
+                'total': Model.search_count(self._export_domain()),
+                'processed': 0,
+                'last_id': 0,
+                'file_size': 0,
+                'file_name': f"{Model._table}_export_{fields.Date.context_today(self)}"
+                             f".{EXPORT_FORMATS[self.export_format][0]}",
+            })
+        vals = getattr(self, f'_run_slice_{self.export_format}')(deadline)
+        finished = not self._export_records().search(
+            self._export_domain() + [('id', '>', vals['last_id'])], limit=1)
+        if finished:
+            finalize = getattr(self, f'_finalize_{self.export_format}', None)
+            if finalize:
+                vals.update(finalize())
+            vals.update(state='done', date_done=fields.Datetime.now())
+        self.write(vals)
+        return finished
+
+    def _notify_done(self):
+        for job in self:
+            self.env['bus.bus']._sendone(job.user_id.partner_id, 'simple_notification', {
+                'type': 'success' if job.state == 'done' else 'danger',
+                'title': _('Export %s', job.name),
+                'message': _('Your export is ready to download.') if job.state == 'done' else job.error,
+            })
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Run queued and interrupted jobs, oldest first, for one time slice.
+
+        ir.cron never runs the same cron twice concurrently, so jobs need no
+        locking of their own.
+        """
+        deadline = time.monotonic() + EXPORT_SLICE_SECONDS
+        jobs = self.search([('state', 'in', ('queued', 'running'))], order='id')
+        for job in jobs:
+            try:
+                finished = job._run_slice(deadline)
+            except Exception as e:
+                _logger.exception("FleetIQ export job %s failed", job.id)
+                self.env.cr.rollback()
+                job.write({'state': 'failed', 'error': str(e)})
+                job._remove_file()
+                finished = True
+            if finished:
+                job._notify_done()
+            self.env.cr.commit()
+            if not finished:
+                self.env.ref('fleetflow.ir_cron_fleetflow_export_job').sudo()._trigger()
+                return
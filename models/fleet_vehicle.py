@@ -1,11 +1,12 @@
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
 
 
 class FleetflowVehicle(models.Model):
     _name = 'fleetflow.vehicle'
     _description = 'Fleet Vehicle'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'fleetflow.sync.mixin', 'fleetflow.dashboard.snapshot.trigger', 'fleetflow.instrumentation.mixin']
     _order = 'name'
 
     name = fields.Char(required=True, tracking=True)
@@ -37,6 +38,8 @@ class FleetflowVehicle(models.Model):
     capacity = fields.Integer(string='Capacity', tracking=True)
     max_capacity = fields.Float(string='Max Capacity (Tons)', tracking=True)
     odometer = fields.Float(tracking=True)
+    telemetry_synced_at = fields.Datetime(string='Odometer Synced At', readonly=True, copy=False,
+                                          help='Last time the odometer was moved by device telemetry.')
     acquisition_cost = fields.Monetary(default=0.0, tracking=True)
     status = fields.Selection(
         [
@@ -50,6 +53,7 @@ class FleetflowVehicle(models.Model):
         ],
         default='available',
         required=True,
+        index=True,
         tracking=True,
     )
     active = fields.Boolean(default=True)
@@ -67,13 +71,12 @@ class FleetflowVehicle(models.Model):
     maintenance_ids = fields.One2many('fleetflow.maintenance', 'vehicle_id', string='Maintenance')
     expense_ids = fields.One2many('fleetflow.expense', 'vehicle_id', string='Expenses')
 
-    trip_count = fields.Integer(compute='_compute_trip_count', store=True)
-    maintenance_cost_total = fields.Monetary(compute='_compute_maintenance_cost_total', store=True)
-    total_fuel_cost = fields.Monetary(compute='_compute_total_fuel_cost', store=True)
+    trip_count = fields.Integer(compute='_compute_trip_totals', store=True)
+    total_fuel_cost = fields.Monetary(compute='_compute_expense_totals', store=True)
     total_maintenance_cost = fields.Monetary(compute='_compute_total_maintenance_cost', store=True)
     total_operational_cost = fields.Monetary(compute='_compute_total_operational_cost', store=True)
-    total_revenue = fields.Monetary(compute='_compute_total_revenue', store=True)
-    total_liters = fields.Float(compute='_compute_total_liters', store=True)
+    total_revenue = fields.Monetary(compute='_compute_trip_totals', store=True)
+    total_liters = fields.Float(compute='_compute_expense_totals', store=True)
     fuel_efficiency = fields.Float(compute='_compute_fuel_efficiency', string='Fuel Efficiency (Km/L)', store=True)
     roi = fields.Float(compute='_compute_roi', store=True)
 
@@ -82,47 +85,80 @@ class FleetflowVehicle(models.Model):
         ('FleetIQ_vehicle_vin_unique', 'unique(vin)', 'VIN must be unique.'),
     ]
 
-    @api.depends('trip_ids')
-    def _compute_trip_count(self):
-        for record in self:
-            record.trip_count = len(record.trip_ids)
+    def init(self):
+        super().init()
+        # Command Center and dashboard KPIs filter on the company and group
+        # by status and type; the index covers the whole query.
+        create_index(self.env.cr, 'fleetflow_vehicle_company_id_status_type_index',
+                     self._table, ['company_id', 'status', 'vehicle_type'])
 
-    @api.depends('maintenance_ids.cost')
-    def _compute_maintenance_cost_total(self):
+    def _aggregate_by_vehicle(self, relation, aggregates, domain=()):
+        """
+        Aggregate the ``relation`` one2many of every vehicle in ``self`` with
+        a single GROUP BY, instead of loading each vehicle's lines into
+        Python. ``aggregates`` are ``'field:sum'`` specs or ``'__count'``.
+
+        Returns ``{vehicle id: {spec: value}}``. Vehicles absent from the
+        result have no matching line. Unsaved vehicles (onchange) have
+        nothing in the database yet and are aggregated from the cache.
+        """
+        field = self._fields[relation]
+        comodel = self.env[field.comodel_name]
+        domain = list(domain)
+        result = {}
+        saved = self.filtered(lambda v: isinstance(v.id, int))
+        if saved:
+            groups = comodel._read_group(
+                [(field.inverse_name, 'in', saved.ids)] + domain,
+                groupby=[field.inverse_name],
+                aggregates=aggregates,
+            )
+            for vehicle, *values in groups:
+                result[vehicle.id] = {spec: value or 0 for spec, value in zip(aggregates, values)}
+        for record in self - saved:
+            lines = record[relation].filtered_domain(domain)
+            result[record.id] = {
+                spec: len(lines) if spec == '__count' else sum(lines.mapped(spec.split(':')[0]))
+                for spec in aggregates
+            }
+        return result
+
+    @api.depends('trip_ids', 'trip_ids.revenue', 'trip_ids.state')
+    def _compute_trip_totals(self):
+        counts = self._aggregate_by_vehicle('trip_ids', ['__count'])
+        revenues = self._aggregate_by_vehicle('trip_ids', ['revenue:sum'], [('state', '=', 'completed')])
         for record in self:
-            record.maintenance_cost_total = sum(record.maintenance_ids.mapped('cost'))
+            record.trip_count = counts.get(record.id, {}).get('__count', 0)
+            record.total_revenue = revenues.get(record.id, {}).get('revenue:sum', 0.0)
 
-    @api.depends('expense_ids.fuel_cost')
-    def _compute_total_fuel_cost(self):
+    @api.depends('expense_ids.fuel_cost', 'expense_ids.liters')
+    def _compute_expense_totals(self):
+        totals = self._aggregate_by_vehicle('expense_ids', ['fuel_cost:sum', 'liters:sum'])
         for record in self:
-            record.total_fuel_cost = sum(record.expense_ids.mapped('fuel_cost'))
+            record_totals = totals.get(record.id, {})
+            record.total_fuel_cost = record_totals.get('fuel_cost:sum', 0.0)
+            record.total_liters = record_totals.get('liters:sum', 0.0)
 
     @api.depends('maintenance_ids.cost')
     def _compute_total_maintenance_cost(self):
+        totals = self._aggregate_by_vehicle('maintenance_ids', ['cost:sum'])
         for record in self:
-            record.total_maintenance_cost = sum(record.maintenance_ids.mapped('cost'))
+            record.total_maintenance_cost = totals.get(record.id, {}).get('cost:sum', 0.0)
 
     @api.depends('total_fuel_cost', 'total_maintenance_cost')
     def _compute_total_operational_cost(self):
         for record in self:
             record.total_operational_cost = record.total_fuel_cost + record.total_maintenance_cost
 
-    @api.depends('trip_ids.revenue', 'trip_ids.state')
-    def _compute_total_revenue(self):
-        for record in self:
-            completed_trips = record.trip_ids.filtered(lambda trip: trip.state == 'completed')
-            record.total_revenue = sum(completed_trips.mapped('revenue'))
-
-    @api.depends('expense_ids.liters')
-    def _compute_total_liters(self):
-        for record in self:
-            record.total_liters = sum(record.expense_ids.mapped('liters'))
-
     @api.depends('trip_ids.start_odometer', 'trip_ids.end_odometer', 'trip_ids.state', 'total_liters')
     def _compute_fuel_efficiency(self):
+        # sum(end - start) over completed trips == sum(end) - sum(start)
+        totals = self._aggregate_by_vehicle(
+            'trip_ids', ['end_odometer:sum', 'start_odometer:sum'], [('state', '=', 'completed')],
+        )
         for record in self:
-            completed_trips = record.trip_ids.filtered(lambda t: t.state == 'completed')
-            total_distance = sum((t.end_odometer or 0.0) - (t.start_odometer or 0.0) for t in completed_trips)
+            record_totals = totals.get(record.id, {})
+            total_distance = record_totals.get('end_odometer:sum', 0.0) - record_totals.get('start_odometer:sum', 0.0)
             if record.total_liters > 0:
                 record.fuel_efficiency = total_distance / record.total_liters
             else:
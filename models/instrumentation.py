@@ -0,0 +1,172 @@
+import contextlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+
+from odoo import models
+from odoo.http import request
+
+_logger = logging.getLogger(__name__)
+
+# System parameters. Instrumentation is off unless INSTRUMENTATION_PARAM is
+# set to a true value; it then covers every /fleetflow/ route.
+INSTRUMENTATION_PARAM = 'fleetflow.instrumentation'
+SLOW_REQUEST_PARAM = 'fleetflow.slow_request_ms'
+DEFAULT_SLOW_REQUEST_MS = 500
+# Queries listed in the slow-request log line, slowest first.
+SLOW_REQUEST_MAX_QUERIES = 50
+ROUTE_PREFIX = '/fleetflow/'
+
+
+def current_timing():
+    """Return the RequestTiming of the request served by this thread, if
+    instrumentation is on for it."""
+    return getattr(threading.current_thread(), 'fleetflow_timing', None)
+
+
+@contextlib.contextmanager
+def timed(section):
+    """Add the time spent in the block to ``section`` of the current
+    request's timing (no-op when instrumentation is off)."""
+    timing = current_timing()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.sections[section] += time.perf_counter() - started
+
+
+class RequestTiming:
+    """Counters of one instrumented request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.query_time = 0.0
+        self.queries = []
+        self.sections = Counter()
+        self.recompute_calls = Counter()
+        self.recompute_records = Counter()
+        self.recompute_time = Counter()
+
+    def sql_hook(self, cr, query, params, start, delay):
+        # Called by odoo.sql_db.Cursor.execute for every query of the thread.
+        self.query_count += 1
+        self.query_time += delay
+        self.queries.append((delay, query, params))
+
+    def add_recompute(self, field, count, elapsed):
+        key = f'{field.model_name}.{field.name}'
+        self.recompute_calls[key] += 1
+        self.recompute_records[key] += count
+        self.recompute_time[key] += elapsed
+
+    def server_timing(self, total):
+        """Return the value of the Server-Timing header."""
+        sql = self.query_time * 1000
+        sections = {name: elapsed * 1000 for name, elapsed in self.sections.items()}
+        app = max(0.0, total - sql - sum(sections.values()))
+        entries = [
+            f'sql;dur={sql:.1f};desc="{self.query_count} queries"',
+            f'recompute;dur={sum(self.recompute_time.values()) * 1000:.1f};'
+            f'desc="{sum(self.recompute_calls.values())} calls, {sum(self.recompute_records.values())} records"',
+        ]
+        entries += [f'{name};dur={elapsed:.1f}' for name, elapsed in sorted(sections.items())]
+        entries += [f'app;dur={app:.1f}', f'total;dur={total:.1f}']
+        return ', '.join(entries)
+
+    def summary(self, total):
+        return {
+            'path': request.httprequest.path,
+            'method': request.httprequest.method,
+            'total_ms': round(total, 1),
+            'sql_ms': round(self.query_time * 1000, 1),
+            'query_count': self.query_count,
+            'sections_ms': {name: round(elapsed * 1000, 1) for name, elapsed in self.sections.items()},
+            'recomputes': {
+                key: {
+                    'calls': calls,
+                    'records': self.recompute_records[key],
+                    'ms': round(self.recompute_time[key] * 1000, 1),
+                }
+                for key, calls in self.recompute_calls.most_common()
+            },
+        }
+
+
+def _settings():
+    """Return ``(enabled, slow_request_ms)`` from the system parameters."""
+    ICP = request.env['ir.config_parameter'].sudo()
+    enabled = ICP.get_param(INSTRUMENTATION_PARAM, 'False').lower() in ('1', 'true', 'yes')
+    try:
+        slow_ms = float(ICP.get_param(SLOW_REQUEST_PARAM, DEFAULT_SLOW_REQUEST_MS))
+    except ValueError:
+        slow_ms = DEFAULT_SLOW_REQUEST_MS
+    return enabled, slow_ms
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = 'ir.http'
+
+    @classmethod
+    def _dispatch(cls, endpoint):
+        if not request.httprequest.path.startswith(ROUTE_PREFIX) or not request.db:
+            return super()._dispatch(endpoint)
+        enabled, slow_ms = _settings()
+        if not enabled:
+            return super()._dispatch(endpoint)
+
+        timing = RequestTiming()
+        thread = threading.current_thread()
+        hooks = getattr(thread, 'query_hooks', None)
+        if hooks is None:
+            hooks = thread.query_hooks = []
+        hooks.append(timing.sql_hook)
+        thread.fleetflow_timing = timing
+        try:
+            response = super()._dispatch(endpoint)
+            # Flush and run the precommit hooks (rollups, snapshots, bus
+            # notifications) now, so the work they cause is measured too;
+            # the commit that follows finds nothing left to do.
+            with timed('flush'):
+                request.env.cr.flush()
+            return response
+        finally:
+            hooks.remove(timing.sql_hook)
+            del thread.fleetflow_timing
+            total = (time.perf_counter() - timing.started) * 1000
+            request.future_response.headers.add('Server-Timing', timing.server_timing(total))
+            summary = timing.summary(total)
+            _logger.info("fleetflow.timing %s", json.dumps(summary))
+            if total >= slow_ms:
+                slowest = sorted(timing.queries, key=lambda q: q[0], reverse=True)[:SLOW_REQUEST_MAX_QUERIES]
+                _logger.warning("fleetflow.slow_request %s", json.dumps(dict(summary, queries=[
+                    {
+                        'ms': round(delay * 1000, 2),
+                        'query': query.code if hasattr(query, 'code') else str(query),
+                        'params': repr(query.params if hasattr(query, 'code') else params)[:500],
+                    }
+                    for delay, query, params in slowest
+                ])))
+
+
+class FleetflowInstrumentationMixin(models.AbstractModel):
+    """Counts the stored and non-stored recomputes of the inheriting model
+    while an instrumented request is being served."""
+    _name = 'fleetflow.instrumentation.mixin'
+    _description = 'Fleet Recompute Instrumentation'
+
+    def _compute_field_value(self, field):
+        timing = current_timing()
+        if timing is None:
+            return super()._compute_field_value(field)
+        started = time.perf_counter()
+        try:
+            return super()._compute_field_value(field)
+        finally:
+            timing.add_recompute(field, len(self), time.perf_counter() - started)
@@ -0,0 +1,48 @@
+import logging
+
+from odoo import api, models
+from odoo.addons.base.models.ir_sequence import _update_nogap
+
+_logger = logging.getLogger(__name__)
+
+
+class IrSequence(models.Model):
+    _inherit = 'ir.sequence'
+
+    def _next_batch_do(self, count):
+        """Reserve ``count`` consecutive values of the sequence at once: one
+        ``nextval`` query for a standard sequence, one row update (and row
+        lock) for a no-gap one."""
+        self.ensure_one()
+        if self.implementation == 'standard':
+            self._cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                ['ir_sequence_%03d' % self.id, count],
+            )
+            numbers = sorted(row[0] for row in self._cr.fetchall())
+        else:
+            first = _update_nogap(self, self.number_increment * count)
+            numbers = [first + index * self.number_increment for index in range(count)]
+        return [self.get_next_char(number) for number in numbers]
+
+    @api.model
+    def _next_batch_by_code(self, sequence_code, count, sequence_date=None):
+        """Return ``count`` values of the sequence ``sequence_code``, like
+        ``count`` calls to next_by_code but in a single round trip.
+
+        Sequences using date ranges keep one sub-sequence per range and fall
+        back to allocating one value at a time.
+        """
+        self.check_access_rights('read')
+        company_id = self.env.company.id
+        seq = self.search(
+            [('code', '=', sequence_code), ('company_id', 'in', [company_id, False])],
+            order='company_id', limit=1,
+        )
+        if not seq:
+            _logger.debug("No ir.sequence has been found for code '%s'. Please make sure a sequence "
+                          "is set for current company.", sequence_code)
+            return [False] * count
+        if seq.use_date_range:
+            return [seq._next(sequence_date=sequence_date) for _index in range(count)]
+        return seq._next_batch_do(count)
@@ -0,0 +1,17 @@
+from odoo import models
+
+from .command_center import COMMAND_CENTER_CHANNEL
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        """Subscribe Fleet Managers and Dispatchers to the Command Center
+        push channel of each of their companies."""
+        channels = super()._build_bus_channel_list(channels)
+        user = self.env.user
+        if user.has_group('fleetflow.group_fleetflow_manager') or \
+                user.has_group('fleetflow.group_fleetflow_dispatcher'):
+            channels.extend((company, COMMAND_CENTER_CHANNEL) for company in user.company_ids)
+        return channels
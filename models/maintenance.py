@@ -1,18 +1,29 @@
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
 
 
 class FleetflowMaintenance(models.Model):
     _name = 'fleetflow.maintenance'
     _description = 'Fleet Maintenance'
+    _inherit = ['fleetflow.sync.mixin', 'fleetflow.dashboard.snapshot.trigger', 'fleetflow.vehicle.daily.cost.trigger', 'fleetflow.instrumentation.mixin']
 
     vehicle_id = fields.Many2one('fleetflow.vehicle', required=True, ondelete='cascade')
     company_id = fields.Many2one(related='vehicle_id.company_id', store=True, readonly=True)
-    vehicle_status = fields.Selection(related='vehicle_id.status', store=True, readonly=True)
+    # Not stored: a stored copy would rewrite the whole maintenance history
+    # of a vehicle on each of its status changes. Searching on it joins the
+    # vehicle table instead.
+    vehicle_status = fields.Selection(related='vehicle_id.status', readonly=True)
     issue = fields.Char(required=True)
     cost = fields.Float(default=0.0)
     service_date = fields.Date(required=True, default=fields.Date.context_today)
 
+    def init(self):
+        super().init()
+        cr = self.env.cr
+        create_index(cr, 'fleetflow_maintenance_vehicle_id_date_index', self._table, ['vehicle_id', 'service_date'])
+        create_index(cr, 'fleetflow_maintenance_company_id_date_index', self._table, ['company_id', 'service_date'])
+
     @api.constrains('cost')
     def _check_cost(self):
         for record in self:
@@ -22,5 +33,15 @@ class FleetflowMaintenance(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         records = super().create(vals_list)
-        records.mapped('vehicle_id').write({'status': 'in_shop'})
+        records.vehicle_id.filtered(lambda v: v.status != 'in_shop').write({'status': 'in_shop'})
         return records
+
+    # ── Export hooks (fleetflow.export.job) ──────────────────────────
+
+    @api.model
+    def _export_columnar_fields(self):
+        return ['vehicle_id', 'company_id', 'service_date', 'issue', 'cost']
+
+    @api.model
+    def _export_date_field(self):
+        return 'service_date'
@@ -0,0 +1,36 @@
+from odoo import models
+from odoo.http import request
+
+# System parameter. Throughput mode is on unless it is set to a false value.
+THROUGHPUT_PARAM = 'fleetflow.throughput_mode'
+# mail.thread then skips the creation message, the follower subscription
+# and the field tracking of the records written with this context.
+THROUGHPUT_CONTEXT = {'tracking_disable': True}
+ROUTE_PREFIX = '/fleetflow/'
+
+
+def throughput_enabled(env):
+    value = env['ir.config_parameter'].sudo().get_param(THROUGHPUT_PARAM, 'True')
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def throughput(records):
+    """Return ``records`` with chatter tracking disabled when throughput
+    mode is on. Use it for machine-driven writes: API calls, bulk imports,
+    crons and the side effects of the trip lifecycle."""
+    if records.env.context.get('tracking_disable') or not throughput_enabled(records.env):
+        return records
+    return records.with_context(**THROUGHPUT_CONTEXT)
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = 'ir.http'
+
+    @classmethod
+    def _dispatch(cls, endpoint):
+        # Every /fleetflow/ route is called by the React app or by an
+        # integration: none of their writes is worth a chatter message.
+        if request.httprequest.path.startswith(ROUTE_PREFIX) and request.db \
+                and throughput_enabled(request.env):
+            request.update_context(**THROUGHPUT_CONTEXT)
+        return super()._dispatch(endpoint)
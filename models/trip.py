@@ -1,16 +1,26 @@
-import base64
-import csv
-import io
-
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import groupby
+from odoo.tools.sql import create_index
+from collections import Counter
 from datetime import date
+from psycopg2 import errors
+
+from .throughput import throughput
+
+# Row-lock modes of _lock_resources.
+LOCK_MODES = {
+    'wait': '',
+    'nowait': 'NOWAIT',
+    'skip_locked': 'SKIP LOCKED',
+}
 
 
 class FleetflowTrip(models.Model):
     _name = 'fleetflow.trip'
     _description = 'Fleet Trip'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'fleetflow.sync.mixin', 'fleetflow.dashboard.snapshot.trigger',
+                'fleetflow.vehicle.daily.cost.trigger', 'fleetflow.instrumentation.mixin']
     _order = 'name desc'
 
     name = fields.Char(string='Trip Reference', required=True, copy=False, readonly=True, index=True, default=lambda self: 'New')
@@ -29,6 +39,7 @@ class FleetflowTrip(models.Model):
     start_odometer = fields.Float(string='Start Odometer')
     end_odometer = fields.Float(string='End Odometer')
     company_id = fields.Many2one(related='vehicle_id.company_id', store=True, readonly=True)
+    date_completed = fields.Date(string='Completed On', readonly=True, copy=False, index=True)
     expense_ids = fields.One2many('fleetflow.expense', 'trip_id', string='Expenses')
     # Read-only helper: mirrors vehicle max_capacity so the trip form can display
     # a capacity warning without using invalid relational dot-path XML field refs.
@@ -39,6 +50,24 @@ class FleetflowTrip(models.Model):
         store=False,
     )
 
+    def init(self):
+        super().init()
+        cr = self.env.cr
+        create_index(cr, 'fleetflow_trip_company_id_state_index', self._table, ['company_id', 'state'])
+        # Per-vehicle and per-driver aggregates (vehicle totals, completion
+        # rate) always filter or group on the state as well.
+        create_index(cr, 'fleetflow_trip_vehicle_id_state_index', self._table, ['vehicle_id', 'state'])
+        create_index(cr, 'fleetflow_trip_driver_id_state_index', self._table, ['driver_id', 'state'])
+        # Open trips are a small, hot slice of the table: dispatching and
+        # double-booking checks only ever look at them.
+        create_index(cr, 'fleetflow_trip_open_vehicle_id_index', self._table, ['vehicle_id'],
+                     where="state IN ('draft', 'dispatched')")
+        create_index(cr, 'fleetflow_trip_open_driver_id_index', self._table, ['driver_id'],
+                     where="state IN ('draft', 'dispatched')")
+        # Daily cost rollup refresh: completed trips of a vehicle on a day.
+        create_index(cr, 'fleetflow_trip_completed_vehicle_id_date_index', self._table,
+                     ['vehicle_id', 'date_completed'], where="state = 'completed'")
+
     @api.constrains('cargo_weight', 'vehicle_id')
     def _check_vehicle_capacity(self):
         for record in self:
@@ -63,60 +92,185 @@ class FleetflowTrip(models.Model):
 
     @api.model_create_multi
     def create(self, vals_list):
-        for vals in vals_list:
-            if vals.get('name', 'New') == 'New':
-                vals['name'] = self.env['ir.sequence'].next_by_code('fleetflow.trip') or 'New'
+        # Reserve the references of the whole batch in one sequence call.
+        to_name = [vals for vals in vals_list if vals.get('name', 'New') == 'New']
+        if to_name:
+            names = self.env['ir.sequence']._next_batch_by_code('fleetflow.trip', len(to_name))
+            for vals, name in zip(to_name, names):
+                vals['name'] = name or 'New'
         return super().create(vals_list)
 
+    def unlink(self):
+        # The expenses go with their trip through ondelete='cascade', which
+        # bypasses their own unlink: mark their rollup days and the vehicle
+        # totals summing them here.
+        expenses = self.expense_ids
+        self._daily_cost_mark_dirty(expenses._daily_cost_keys())
+        expenses.modified(['fuel_cost', 'liters'], before=True)
+        return super().unlink()
+
+    # ── Concurrency ──────────────────────────────────────────────────
+
+    def _lock_resources(self, mode='wait'):
+        """
+        Lock the rows of the trips and of their vehicles and drivers until
+        the end of the transaction, so that concurrent dispatchers serialize
+        on them instead of failing at commit and replaying the whole request.
+
+        Rows are locked table by table in id order, the same order for every
+        lifecycle action, so two dispatchers cannot deadlock. ``mode`` is one
+        of LOCK_MODES:
+
+        - ``wait``: block until the rows are free; a row changed by the
+          holder meanwhile raises the conflict UserError below;
+        - ``nowait``: raise a UserError at once if another transaction holds
+          one of the rows;
+        - ``skip_locked``: lock the free rows and leave the others.
+
+        Returns the trips whose trip, vehicle and driver rows are all locked
+        (``self`` except in ``skip_locked`` mode).
+        """
+        if not self:
+            return self
+        cr = self.env.cr
+        clause = LOCK_MODES[mode]
+        self.flush_recordset(['vehicle_id', 'driver_id'])
+        locked = {}
+        try:
+            with cr.savepoint(flush=False):
+                for records in (self, self.vehicle_id, self.driver_id):
+                    cr.execute(f"""
+                        SELECT id FROM "{records._table}"
+                         WHERE id IN %s
+                         ORDER BY id
+                           FOR UPDATE {clause}
+                    """, [tuple(records.ids)])
+                    locked[records._name] = {row[0] for row in cr.fetchall()}
+        except errors.LockNotAvailable:
+            raise UserError(
+                "%s: another dispatcher is updating the same trips, vehicles or drivers. "
+                "Try again or pick another vehicle." % ', '.join(self.mapped('name'))
+            )
+        except errors.SerializationFailure:
+            # A row changed after this transaction took its snapshot: waiting
+            # cannot help, and the API handlers would not replay the request.
+            raise UserError(
+                "%s: the trips, vehicles or drivers were changed by another dispatcher. "
+                "Reload and try again." % ', '.join(self.mapped('name'))
+            )
+        return self.filtered(lambda t: (
+            t.id in locked['fleetflow.trip']
+            and t.vehicle_id.id in locked['fleetflow.vehicle']
+            and t.driver_id.id in locked['fleetflow.driver']
+        ))
+
+    def _check_double_booking(self):
+        """Refuse to dispatch a vehicle or a driver twice: in two trips of
+        ``self``, or while it has another dispatched trip. The rows must be
+        locked (see _lock_resources) for the check to hold until commit."""
+        problems = []
+        for fname, label in (('vehicle_id', 'Vehicle'), ('driver_id', 'Driver')):
+            counts = Counter(trip[fname] for trip in self)
+            busy = {record for record, count in counts.items() if count > 1}
+            busy.update(record for [record] in self._read_group(
+                [(fname, 'in', self[fname].ids), ('state', '=', 'dispatched'), ('id', 'not in', self.ids)],
+                [fname],
+            ))
+            problems += [f"{label} {record.display_name} is already on a trip." for record in busy]
+        if problems:
+            raise ValidationError("\n".join(sorted(problems)))
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+
     def action_dispatch(self):
-        self.ensure_one()
-        if self.state != 'draft':
-            raise ValidationError("Only draft trips can be dispatched.")
-        
-        # Auto-fill start odometer from vehicle if not provided
-        if not self.start_odometer:
-            self.start_odometer = self.vehicle_id.odometer
-
-        self.write({'state': 'dispatched'})
-        self.vehicle_id.write({'status': 'on_trip'})
-        self.driver_id.write({'status': 'on_duty'})
+        self._lock_resources()
+        not_draft = self.filtered(lambda t: t.state != 'draft')
+        if not_draft:
+            raise ValidationError(
+                "Only draft trips can be dispatched: %s" % ', '.join(not_draft.mapped('name'))
+            )
+        self._check_double_booking()
+
+        # Auto-fill start odometer from vehicle if not provided, one write per
+        # distinct reading rather than one per trip.
+        to_fill = self.filtered(lambda t: not t.start_odometer)
+        for odometer, trips in groupby(to_fill, key=lambda t: t.vehicle_id.odometer):
+            self.browse([t.id for t in trips]).write({'state': 'dispatched', 'start_odometer': odometer})
+        (self - to_fill).write({'state': 'dispatched'})
+
+        # Vehicle and driver statuses follow the trip: their flips are not
+        # worth a chatter message each (see throughput mode).
+        throughput(self.vehicle_id).write({'status': 'on_trip'})
+        throughput(self.driver_id).write({'status': 'on_duty'})
 
     def action_complete(self):
-        self.ensure_one()
-        if self.state != 'dispatched':
-            raise ValidationError("Only dispatched trips can be completed.")
-        
-        if not self.end_odometer:
-            raise ValidationError("Please provide the final odometer reading before completing the trip.")
-        
-        if self.end_odometer < self.start_odometer:
+        self._lock_resources()
+        not_dispatched = self.filtered(lambda t: t.state != 'dispatched')
+        if not_dispatched:
+            raise ValidationError(
+                "Only dispatched trips can be completed: %s" % ', '.join(not_dispatched.mapped('name'))
+            )
+
+        missing = self.filtered(lambda t: not t.end_odometer)
+        if missing:
             raise ValidationError(
-                f"End odometer ({self.end_odometer}) cannot be less than start odometer ({self.start_odometer})."
+                "Please provide the final odometer reading before completing the trip: %s"
+                % ', '.join(missing.mapped('name'))
             )
 
-        self.write({'state': 'completed'})
-        
-        # Sync odometer back to vehicle
-        self.vehicle_id.write({
-            'status': 'available',
-            'odometer': self.end_odometer
-        })
-        self.driver_id.write({'status': 'off_duty'})
+        backwards = self.filtered(lambda t: t.end_odometer < t.start_odometer)
+        if backwards:
+            raise ValidationError("\n".join(
+                f"{t.name}: end odometer ({t.end_odometer}) cannot be less than start odometer ({t.start_odometer})."
+                for t in backwards
+            ))
+
+        self.write({'state': 'completed', 'date_completed': fields.Date.context_today(self)})
+
+        # Sync odometer back to vehicles. A vehicle finishing several trips in
+        # the same batch keeps its highest reading; vehicles ending on the same
+        # reading share one write.
+        end_odometers = {}
+        for trip in self:
+            vehicle = trip.vehicle_id
+            end_odometers[vehicle] = max(end_odometers.get(vehicle, 0.0), trip.end_odometer)
+        for odometer, vehicles in groupby(end_odometers, key=end_odometers.get):
+            throughput(self.env['fleetflow.vehicle'].concat(*vehicles)).write({
+                'status': 'available',
+                'odometer': odometer,
+            })
+        throughput(self.driver_id).write({'status': 'off_duty'})
 
     def action_cancel(self):
-        self.ensure_one()
+        self._lock_resources()
         self.write({'state': 'cancelled'})
-        if self.vehicle_id.status == 'on_trip':
-            self.vehicle_id.write({'status': 'available'})
-        if self.driver_id.status == 'on_duty':
-            self.driver_id.write({'status': 'off_duty'})
+        throughput(self.vehicle_id.filtered(lambda v: v.status == 'on_trip')).write({'status': 'available'})
+        throughput(self.driver_id.filtered(lambda d: d.status == 'on_duty')).write({'status': 'off_duty'})
 
     def action_export_csv(self):
-        trips = self if self else self.search([])
+        """Queue a background CSV export of the selected trips (all trips
+        when nothing is selected) and open its job."""
+        return self.env['fleetflow.export.job']._enqueue(self).action_open()
+
+    # ── Export hooks (fleetflow.export.job) ──────────────────────────
+
+    @api.model
+    def _export_read_fields(self):
+        return ['name', 'vehicle_id', 'driver_id', 'origin', 'destination', 'state',
+                'start_odometer', 'end_odometer', 'revenue']
 
-        buffer = io.StringIO()
-        writer = csv.writer(buffer)
-        writer.writerow([
+    @api.model
+    def _export_columnar_fields(self):
+        return ['name', 'vehicle_id', 'driver_id', 'company_id', 'origin', 'destination', 'state',
+                'cargo_weight', 'revenue', 'start_odometer', 'end_odometer', 'create_date']
+
+    @api.model
+    def _export_date_field(self):
+        return 'create_date'
+
+    @api.model
+    def _export_csv_header(self):
+        return [
             'Reference',
             'Vehicle',
             'Driver',
@@ -127,34 +281,21 @@ class FleetflowTrip(models.Model):
             'End Odometer',
             'Distance',
             'Revenue',
-        ])
-
-        for trip in trips:
-            distance = (trip.end_odometer or 0.0) - (trip.start_odometer or 0.0)
-            writer.writerow([
-                trip.name or '',
-                trip.vehicle_id.name or '',
-                trip.driver_id.name or '',
-                trip.origin or '',
-                trip.destination or '',
-                trip.state or '',
-                trip.start_odometer or 0.0,
-                trip.end_odometer or 0.0,
-                distance,
-                trip.revenue or 0.0,
-            ])
-
-        csv_content = buffer.getvalue().encode('utf-8')
-        attachment = self.env['ir.attachment'].create({
-            'name': 'fleetflow_trips_export.csv',
-            'type': 'binary',
-            'datas': base64.b64encode(csv_content),
-            'mimetype': 'text/csv',
-            'res_model': 'fleetflow.trip',
-        })
-
-        return {
-            'type': 'ir.actions.act_url',
-            'url': f'/web/content/{attachment.id}?download=true',
-            'target': 'self',
-        }
+        ]
+
+    @api.model
+    def _export_csv_row(self, vals):
+        start = vals['start_odometer'] or 0.0
+        end = vals['end_odometer'] or 0.0
+        return [
+            vals['name'] or '',
+            vals['vehicle_id'][1] if vals['vehicle_id'] else '',
+            vals['driver_id'][1] if vals['driver_id'] else '',
+            vals['origin'] or '',
+            vals['destination'] or '',
+            vals['state'] or '',
+            start,
+            end,
+            end - start,
+            vals['revenue'] or 0.0,
+        ]
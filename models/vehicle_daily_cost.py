@@ -0,0 +1,178 @@
+from odoo import api, fields, models
+from odoo.tools.sql import create_index
+
+# Per source model: the date placing a row on a day, and the fields whose
+# changes move that day's totals.
+DAILY_COST_SOURCES = {
+    'fleetflow.expense': ('expense_date', {'vehicle_id', 'expense_date', 'fuel_cost', 'liters'}),
+    'fleetflow.maintenance': ('service_date', {'vehicle_id', 'service_date', 'cost'}),
+    'fleetflow.trip': ('date_completed', {'vehicle_id', 'date_completed', 'state', 'revenue',
+                                          'start_odometer', 'end_odometer'}),
+}
+
+# Recomputes the given (vehicle, day) keys from the raw tables and upserts
+# them. Only completed trips count, on the day they were completed.
+_UPSERT_QUERY = """
+    WITH keys AS (
+        SELECT DISTINCT * FROM unnest(%(vehicle_ids)s::int[], %(days)s::date[]) AS k(vehicle_id, day)
+    ),
+    fuel AS (
+        SELECT k.vehicle_id, k.day, SUM(e.fuel_cost) AS fuel_cost, SUM(e.liters) AS liters
+          FROM keys k
+          JOIN fleetflow_expense e ON e.vehicle_id = k.vehicle_id AND e.expense_date = k.day
+      GROUP BY k.vehicle_id, k.day
+    ),
+    maintenance AS (
+        SELECT k.vehicle_id, k.day, SUM(m.cost) AS maintenance_cost
+          FROM keys k
+          JOIN fleetflow_maintenance m ON m.vehicle_id = k.vehicle_id AND m.service_date = k.day
+      GROUP BY k.vehicle_id, k.day
+    ),
+    trips AS (
+        SELECT k.vehicle_id, k.day, SUM(t.revenue) AS revenue,
+               SUM(COALESCE(t.end_odometer, 0) - COALESCE(t.start_odometer, 0)) AS distance
+          FROM keys k
+          JOIN fleetflow_trip t ON t.vehicle_id = k.vehicle_id AND t.date_completed = k.day
+                               AND t.state = 'completed'
+      GROUP BY k.vehicle_id, k.day
+    )
+    INSERT INTO fleetflow_vehicle_daily_cost
+           (vehicle_id, company_id, day, fuel_cost, liters, maintenance_cost, revenue, distance,
+            create_uid, create_date, write_uid, write_date)
+    SELECT k.vehicle_id, v.company_id, k.day,
+           COALESCE(f.fuel_cost, 0), COALESCE(f.liters, 0), COALESCE(m.maintenance_cost, 0),
+           COALESCE(t.revenue, 0), COALESCE(t.distance, 0),
+           %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+      FROM keys k
+      JOIN fleetflow_vehicle v ON v.id = k.vehicle_id
+ LEFT JOIN fuel f ON f.vehicle_id = k.vehicle_id AND f.day = k.day
+ LEFT JOIN maintenance m ON m.vehicle_id = k.vehicle_id AND m.day = k.day
+ LEFT JOIN trips t ON t.vehicle_id = k.vehicle_id AND t.day = k.day
+  ORDER BY k.vehicle_id, k.day
+        ON CONFLICT (vehicle_id, day) DO UPDATE
+       SET company_id = EXCLUDED.company_id,
+           fuel_cost = EXCLUDED.fuel_cost,
+           liters = EXCLUDED.liters,
+           maintenance_cost = EXCLUDED.maintenance_cost,
+           revenue = EXCLUDED.revenue,
+           distance = EXCLUDED.distance,
+           write_uid = EXCLUDED.write_uid,
+           write_date = EXCLUDED.write_date
+"""
+
+# Every (vehicle, day) that has source rows, for a full rebuild.
+_ALL_KEYS_QUERY = """
+    SELECT vehicle_id, expense_date FROM fleetflow_expense WHERE expense_date IS NOT NULL
+     UNION
+    SELECT vehicle_id, service_date FROM fleetflow_maintenance WHERE service_date IS NOT NULL
+     UNION
+    SELECT vehicle_id, date_completed FROM fleetflow_trip
+     WHERE state = 'completed' AND date_completed IS NOT NULL
+"""
+
+
+class FleetflowVehicleDailyCost(models.Model):
+    """
+    Daily rollup of costs and revenue per vehicle, the fact table behind the
+    time-series analytics endpoint. Rows are maintained right before commit:
+    every (vehicle, day) touched by an expense, maintenance or trip change
+    is recomputed from the raw tables with a single upsert, so concurrent
+    transactions converge on the committed totals. Days whose sources all
+    disappear keep a zero row.
+    """
+    _name = 'fleetflow.vehicle.daily.cost'
+    _description = 'Fleet Vehicle Daily Cost'
+    _order = 'day desc, vehicle_id'
+    _rec_name = 'day'
+
+    vehicle_id = fields.Many2one('fleetflow.vehicle', required=True, readonly=True, ondelete='cascade')
+    company_id = fields.Many2one(related='vehicle_id.company_id', store=True, readonly=True, index=True)
+    day = fields.Date(required=True, readonly=True, index=True)
+    fuel_cost = fields.Float(readonly=True)
+    liters = fields.Float(readonly=True)
+    maintenance_cost = fields.Float(readonly=True)
+    revenue = fields.Float(readonly=True)
+    distance = fields.Float(readonly=True)
+
+    _sql_constraints = [
+        ('fleetflow_daily_cost_vehicle_day_unique', 'unique(vehicle_id, day)',
+         'Only one daily cost row per vehicle and day.'),
+    ]
+
+    def init(self):
+        super().init()
+        create_index(self.env.cr, 'fleetflow_vehicle_daily_cost_company_id_day_index',
+                     self._table, ['company_id', 'day'])
+
+    @api.model
+    def _refresh(self, keys):
+        """Recompute the rows of ``keys``, an iterable of (vehicle_id, day)."""
+        keys = sorted(keys)
+        if not keys:
+            return
+        self.env.flush_all()
+        self.env.cr.execute(_UPSERT_QUERY, {
+            'vehicle_ids': [vehicle_id for vehicle_id, _day in keys],
+            'days': [day for _vehicle_id, day in keys],
+            'uid': self.env.uid,
+        })
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the whole table from the raw rows (install, repair)."""
+        self.env.flush_all()
+        self.env.cr.execute("DELETE FROM fleetflow_vehicle_daily_cost")
+        self.env.cr.execute(_ALL_KEYS_QUERY)
+        self._refresh(self.env.cr.fetchall())
+
+    @api.model
+    def _mark_dirty(self, keys):
+        """Queue a refresh of ``keys`` for the end of the transaction."""
+        if not keys:
+            return
+        pending = self.env.cr.precommit.data.setdefault('fleetflow.vehicle.daily.cost', set())
+        if not pending:
+            self.env.cr.precommit.add(self.env['fleetflow.vehicle.daily.cost']._flush_dirty)
+        pending.update(keys)
+
+    def _flush_dirty(self):
+        keys = self.env.cr.precommit.data.pop('fleetflow.vehicle.daily.cost', set())
+        self.sudo()._refresh(keys)
+
+
+class FleetflowDailyCostTriggerMixin(models.AbstractModel):
+    """Marks the (vehicle, day) rollup rows touched by a change as dirty."""
+    _name = 'fleetflow.vehicle.daily.cost.trigger'
+    _description = 'Fleet Vehicle Daily Cost Trigger'
+
+    def _daily_cost_keys(self):
+        date_field = DAILY_COST_SOURCES[self._name][0]
+        return {
+            (record.vehicle_id.id, record[date_field])
+            for record in self
+            if record.vehicle_id and record[date_field]
+        }
+
+    def _daily_cost_mark_dirty(self, keys):
+        self.env['fleetflow.vehicle.daily.cost']._mark_dirty(keys)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self._daily_cost_mark_dirty(records._daily_cost_keys())
+        return records
+
+    def write(self, vals):
+        if not DAILY_COST_SOURCES[self._name][1].intersection(vals):
+            return super().write(vals)
+        keys = self._daily_cost_keys()
+        res = super().write(vals)
+        self._daily_cost_mark_dirty(keys | self._daily_cost_keys())
+        return res
+
+    def unlink(self):
+        keys = self._daily_cost_keys()
+        res = super().unlink()
+        self._daily_cost_mark_dirty(keys)
+        return res
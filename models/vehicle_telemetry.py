@@ -0,0 +1,196 @@
+import datetime
+from collections import defaultdict
+from datetime import timedelta
+
+from psycopg2.extras import execute_values
+
+from odoo import api, fields, models
+from odoo.tools.sql import create_index
+
+# System parameter. A vehicle's odometer is moved by telemetry at most once
+# per TELEMETRY_SYNC_INTERVAL_PARAM seconds; the readings held back in
+# between are flagged unsynced and applied by the sync cron.
+TELEMETRY_SYNC_INTERVAL_PARAM = 'fleetflow.telemetry_sync_interval'
+DEFAULT_TELEMETRY_SYNC_INTERVAL = 300
+TELEMETRY_MAX_BATCH = 10000
+TELEMETRY_PAGE_SIZE = 1000
+TELEMETRY_RETENTION_DAYS = 90
+
+_INSERT_QUERY = """
+    INSERT INTO fleetflow_vehicle_telemetry
+           (vehicle_id, company_id, recorded_at, received_at, odometer, latitude, longitude, speed, synced)
+    VALUES %s
+"""
+
+# Moves the odometer of the given vehicles forward, skipping those synced
+# less than an interval ago (%(synced_before)s) and stale readings. Returns
+# the ids of the vehicles moved.
+_SYNC_QUERY = """
+    UPDATE fleetflow_vehicle v
+       SET odometer = d.odometer,
+           telemetry_synced_at = now() at time zone 'UTC',
+           write_uid = %(uid)s,
+           write_date = now() at time zone 'UTC'
+      FROM unnest(%(vehicle_ids)s::int[], %(odometers)s::float8[]) AS d(vehicle_id, odometer)
+     WHERE v.id = d.vehicle_id
+       AND d.odometer > COALESCE(v.odometer, 0)
+       AND (v.telemetry_synced_at IS NULL OR v.telemetry_synced_at <= %(synced_before)s)
+ RETURNING v.id
+"""
+
+
+def _parse_recorded_at(value):
+    """Return a naive UTC datetime from an ISO 8601 string or a UNIX
+    timestamp."""
+    if isinstance(value, (int, float)):
+        return datetime.datetime.fromtimestamp(value, datetime.timezone.utc).replace(tzinfo=None)
+    parsed = datetime.datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _optional_float(reading, key):
+    value = reading.get(key)
+    return None if value is None else float(value)
+
+
+class FleetflowVehicleTelemetry(models.Model):
+    """
+    Append-only log of the odometer and position pings sent by in-cab
+    devices. Rows are bulk-inserted with plain SQL by _ingest and never
+    written through the ORM: no audit columns, no tracking, no computes.
+    The vehicle odometer follows the log at most once per sync interval;
+    rows not applied yet are flagged ``synced = False`` for the cron.
+    """
+    _name = 'fleetflow.vehicle.telemetry'
+    _description = 'Fleet Vehicle Telemetry'
+    _order = 'id desc'
+    _log_access = False
+
+    vehicle_id = fields.Many2one('fleetflow.vehicle', required=True, readonly=True, ondelete='cascade')
+    company_id = fields.Many2one('res.company', required=True, readonly=True)
+    recorded_at = fields.Datetime(required=True, readonly=True)
+    received_at = fields.Datetime(required=True, readonly=True)
+    odometer = fields.Float(required=True, readonly=True)
+    latitude = fields.Float(readonly=True, digits=(10, 7))
+    longitude = fields.Float(readonly=True, digits=(10, 7))
+    speed = fields.Float(string='Speed (km/h)', readonly=True)
+    synced = fields.Boolean(readonly=True)
+
+    def init(self):
+        super().init()
+        cr = self.env.cr
+        create_index(cr, 'fleetflow_vehicle_telemetry_vehicle_id_recorded_at_index',
+                     self._table, ['vehicle_id', 'recorded_at'])
+        # Rows arrive roughly in time order: a BRIN index serves the
+        # retention purge at a fraction of a B-tree's size and write cost.
+        create_index(cr, 'fleetflow_vehicle_telemetry_recorded_at_brin_index',
+                     self._table, ['recorded_at'], method='brin')
+        # Only the readings held back by the sync interval are unsynced.
+        create_index(cr, 'fleetflow_vehicle_telemetry_unsynced_index',
+                     self._table, ['id'], where='NOT synced')
+
+    @api.model
+    def _sync_interval(self):
+        value = self.env['ir.config_parameter'].sudo().get_param(TELEMETRY_SYNC_INTERVAL_PARAM)
+        try:
+            return int(value) if value else DEFAULT_TELEMETRY_SYNC_INTERVAL
+        except ValueError:
+            return DEFAULT_TELEMETRY_SYNC_INTERVAL
+
+    @api.model
+    def _ingest(self, readings):
+        """
+        Append ``readings`` (dicts with vehicle_id, odometer, and optionally
+        recorded_at, latitude, longitude, speed) to the log, then move the
+        odometer of the vehicles not synced during the last interval to
+        their highest new reading. The readings of the other vehicles are
+        left to the sync cron.
+
+        Returns ``(accepted, errors, synced)``: the number of rows inserted,
+        the per-item errors (same shape as the batch create endpoints) and
+        the number of vehicles whose odometer moved.
+        """
+        now = fields.Datetime.now()
+        parsed, errors = [], []
+        for index, reading in enumerate(readings):
+            try:
+                odometer = float(reading['odometer'])
+                if odometer < 0:
+                    raise ValueError('odometer cannot be negative')
+                recorded_at = reading.get('recorded_at')
+                parsed.append((index, int(reading['vehicle_id']), (
+                    _parse_recorded_at(recorded_at) if recorded_at is not None else now,
+                    now,
+                    odometer,
+                    _optional_float(reading, 'latitude'),
+                    _optional_float(reading, 'longitude'),
+                    _optional_float(reading, 'speed'),
+                )))
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                errors.append({'index': index, 'status': 'error', 'message': str(e)})
+
+        cr = self.env.cr
+        cr.execute("SELECT id, company_id FROM fleetflow_vehicle WHERE id = ANY(%s)",
+                   [list({vehicle_id for _index, vehicle_id, _values in parsed})])
+        companies = dict(cr.fetchall())
+        rows, highest = [], defaultdict(float)
+        for index, vehicle_id, values in parsed:
+            if vehicle_id not in companies:
+                errors.append({'index': index, 'status': 'error', 'message': f'Vehicle not found: {vehicle_id}'})
+                continue
+            rows.append((vehicle_id, companies[vehicle_id], *values))
+            highest[vehicle_id] = max(highest[vehicle_id], values[2])
+        synced = self._sync_odometers(highest, now - timedelta(seconds=self._sync_interval()))
+        if rows:
+            execute_values(cr, _INSERT_QUERY, [(*row, row[0] in synced) for row in rows],
+                           page_size=TELEMETRY_PAGE_SIZE)
+        errors.sort(key=lambda error: error['index'])
+        return len(rows), errors, len(synced)
+
+    @api.model
+    def _sync_odometers(self, highest, synced_before):
+        """Move the odometer of the vehicles in ``highest`` ({vehicle id:
+        reading}) not synced since ``synced_before``. Returns the ids of the
+        vehicles moved."""
+        if not highest:
+            return set()
+        vehicle_ids = sorted(highest)
+        self.env['fleetflow.vehicle'].flush_model(['odometer'])
+        self.env.cr.execute(_SYNC_QUERY, {
+            'vehicle_ids': vehicle_ids,
+            'odometers': [highest[vehicle_id] for vehicle_id in vehicle_ids],
+            'synced_before': synced_before,
+            'uid': self.env.uid,
+        })
+        synced = {vehicle_id for [vehicle_id] in self.env.cr.fetchall()}
+        self.env['fleetflow.vehicle'].invalidate_model(
+            ['odometer', 'telemetry_synced_at', 'write_uid', 'write_date'])
+        return synced
+
+    @api.model
+    def _cron_sync_odometers(self):
+        """Apply the readings that _ingest held back because their vehicle
+        had been synced less than an interval before.
+
+        Rows are picked by their flag rather than by an id watermark, so
+        those of transactions still in flight are left for the next run.
+        """
+        cr = self.env.cr
+        cr.execute("""
+            UPDATE fleetflow_vehicle_telemetry
+               SET synced = true
+             WHERE NOT synced
+         RETURNING vehicle_id, odometer
+        """)
+        highest = defaultdict(float)
+        for vehicle_id, odometer in cr.fetchall():
+            highest[vehicle_id] = max(highest[vehicle_id], odometer)
+        # The cron runs once per interval: no vehicle is held back here.
+        self._sync_odometers(highest, fields.Datetime.now())
+
+    @api.autovacuum
+    def _gc_telemetry(self):
+        limit = fields.Datetime.now() - timedelta(days=TELEMETRY_RETENTION_DAYS)
+        self.env.cr.execute("DELETE FROM fleetflow_vehicle_telemetry WHERE recorded_at < %s", [limit])
@@ -1,41 +1,139 @@
-from datetime import date
+from collections import defaultdict
+
+from dateutil.relativedelta import relativedelta
 
 from odoo import fields, models
+from odoo.tools import date_utils, pdf, split_every
+
+COST_REPORT_NAME = 'fleetflow.report_vehicle_monthly_cost_template'
+# Vehicles per grouped query: bounds the IN list and the rows fetched at once.
+REPORT_CHUNK_SIZE = 1000
+# Vehicles per wkhtmltopdf pass: bounds the HTML and the pages held at once.
+REPORT_RENDER_BATCH_SIZE = 200
+PERIOD_STEPS = {
+    'month': relativedelta(months=1),
+    'quarter': relativedelta(months=3),
+}
+
+
+def _period_label(period_start, grouping):
+    if grouping == 'quarter':
+        return f'Q{(period_start.month - 1) // 3 + 1} {period_start.year}'
+    return period_start.strftime('%B %Y')
+
+
+class IrActionsReport(models.Model):
+    _inherit = 'ir.actions.report'
+
+    def _render_qweb_pdf(self, report_ref, res_ids=None, data=None):
+        """Render the cost report of a large fleet in batches of vehicles,
+        one wkhtmltopdf pass each, and merge the documents."""
+        if self._get_report(report_ref).report_name != COST_REPORT_NAME:
+            return super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+        if data and data.get('all_vehicles'):
+            vehicle_ids = self.env['fleetflow.vehicle'].search([]).ids
+        else:
+            vehicle_ids = list(res_ids or [])
+        if len(vehicle_ids) <= REPORT_RENDER_BATCH_SIZE:
+            return super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+
+        batch_data = dict(data or {}, all_vehicles=False)
+        documents = []
+        for batch in split_every(REPORT_RENDER_BATCH_SIZE, vehicle_ids, list):
+            content, report_type = super()._render_qweb_pdf(report_ref, res_ids=batch, data=batch_data)
+            if report_type != 'pdf':
+                # Test runs render HTML, which does not merge.
+                return super()._render_qweb_pdf(report_ref, res_ids=res_ids, data=data)
+            documents.append(content)
+        return pdf.merge_pdf(documents), 'pdf'
 
 
 class ReportFleetflowVehicleMonthlyCost(models.AbstractModel):
     _name = 'report.fleetflow.report_vehicle_monthly_cost_template'
     _description = 'fleetflow Monthly Vehicle Cost Report'
 
+    def _get_periods(self, date_from, date_to, grouping):
+        """Return the ``(start, end)`` of every period between the two dates,
+        clipped to them."""
+        periods = []
+        start = date_utils.start_of(date_from, grouping)
+        while start <= date_to:
+            end = start + PERIOD_STEPS[grouping] - relativedelta(days=1)
+            periods.append((max(start, date_from), min(end, date_to)))
+            start += PERIOD_STEPS[grouping]
+        return periods
+
+    def _get_cost_totals(self, vehicles, date_from, date_to, grouping):
+        """Return ``{(vehicle_id, period_start): [fuel_cost, maintenance_cost]}``
+        with one grouped query per cost table and chunk of vehicles."""
+        totals = defaultdict(lambda: [0.0, 0.0])
+        sources = [
+            ('fleetflow.expense', 'expense_date', 'fuel_cost', 0),
+            ('fleetflow.maintenance', 'service_date', 'cost', 1),
+        ]
+        for vehicle_ids in split_every(REPORT_CHUNK_SIZE, vehicles.ids, list):
+            for model_name, date_field, amount_field, index in sources:
+                groups = self.env[model_name]._read_group(
+                    [
+                        ('vehicle_id', 'in', vehicle_ids),
+                        (date_field, '>=', date_from),
+                        (date_field, '<=', date_to),
+                    ],
+                    groupby=['vehicle_id', f'{date_field}:{grouping}'],
+                    aggregates=[f'{amount_field}:sum'],
+                )
+                for vehicle, period_start, amount in groups:
+                    totals[vehicle.id, max(period_start, date_from)][index] += amount or 0.0
+        return totals
+
     def _get_report_values(self, docids, data=None):
-        vehicles = self.env['fleetflow.vehicle'].browse(docids)
-        today = fields.Date.today() or date.today()
-        month_start = today.replace(day=1)
+        """
+        ``data`` (from the cost report wizard) may hold ``date_from``,
+        ``date_to``, ``grouping`` (month or quarter) and ``all_vehicles``.
+        Printing straight from the vehicles keeps the original behaviour:
+        the current month up to today.
+        """
+        data = data or {}
+        today = fields.Date.context_today(self)
+        date_from = fields.Date.to_date(data.get('date_from')) or today.replace(day=1)
+        date_to = fields.Date.to_date(data.get('date_to')) or today
+        grouping = data.get('grouping') if data.get('grouping') in PERIOD_STEPS else 'month'
+
+        Vehicle = self.env['fleetflow.vehicle']
+        vehicles = Vehicle.search([]) if data.get('all_vehicles') else Vehicle.browse(docids)
+        periods = self._get_periods(date_from, date_to, grouping)
+        totals = self._get_cost_totals(vehicles, date_from, date_to, grouping)
 
         docs = []
         for vehicle in vehicles:
-            monthly_expenses = vehicle.expense_ids.filtered(
-                lambda e: e.expense_date and month_start <= e.expense_date <= today
-            )
-            monthly_maintenance = vehicle.maintenance_ids.filtered(
-                lambda m: m.service_date and month_start <= m.service_date <= today
-            )
-            fuel_cost = sum(monthly_expenses.mapped('fuel_cost'))
-            maintenance_cost = sum(monthly_maintenance.mapped('cost'))
-            total_cost = fuel_cost + maintenance_cost
+            lines = []
+            for start, end in periods:
+                fuel_cost, maintenance_cost = totals.get((vehicle.id, start), (0.0, 0.0))
+                lines.append({
+                    'label': _period_label(start, grouping),
+                    'date_start': start,
+                    'date_end': end,
+                    'fuel_cost': fuel_cost,
+                    'maintenance_cost': maintenance_cost,
+                    'total_cost': fuel_cost + maintenance_cost,
+                })
+            fuel_cost = sum(line['fuel_cost'] for line in lines)
+            maintenance_cost = sum(line['maintenance_cost'] for line in lines)
             docs.append({
                 'vehicle': vehicle,
+                'periods': lines,
                 'fuel_cost': fuel_cost,
                 'maintenance_cost': maintenance_cost,
-                'total_cost': total_cost,
-                'month_start': month_start,
-                'today': today,
+                'total_cost': fuel_cost + maintenance_cost,
+                'date_from': date_from,
+                'date_to': date_to,
             })
 
         return {
-            'doc_ids': docids,
+            'doc_ids': vehicles.ids,
             'doc_model': 'fleetflow.vehicle',
             'docs': docs,
-            'month_start': month_start,
-            'today': today,
+            'date_from': date_from,
+            'date_to': date_to,
+            'grouping': grouping,
         }
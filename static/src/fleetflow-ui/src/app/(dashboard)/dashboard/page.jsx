@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { useAuth } from "@/context/AuthContext";
 import {
   Truck, Wrench, TrendingUp,
@@ -14,6 +14,7 @@ import { Button } from "@/components/ui/Button";
 import { Table, TableRow, TableCell } from "@/components/ui/Table";
 import NewTripModal from "@/components/NewTripModal";
 import { getDrivers } from "@/lib/api";
+import { usePagedList } from "@/lib/usePagedList";
 
 function StatCard({ title, value, icon: Icon, trend, color = "blue"
 
@@ -40,25 +41,19 @@ function StatCard({ title, value, icon: Icon, trend, color = "blue"
 
 export default function DashboardPage() {
   const { user } = useAuth();
-  const [data, setData] = useState({ vehicles: [], trips: [], drivers: [] });
-  const [loading, setLoading] = useState(true);
+  const vehicles = usePagedList(getVehicles);
+  const trips = usePagedList(getTrips);
+  const drivers = usePagedList(getDrivers);
+  const [createdTrips, setCreatedTrips] = useState([]);
+  const data = {
+    vehicles: vehicles.rows,
+    trips: [...createdTrips, ...trips.rows],
+    drivers: drivers.rows
+  };
+  const loading = [vehicles, trips, drivers].some((list) => list.loading && list.rows.length === 0);
   const [filterType, setFilterType] = useState("all");
   const [showNewTripModal, setShowNewTripModal] = useState(false);
 
-  useEffect(() => {
-    const fetchAll = async () => {
-      try {
-        const [vData, tData, dData] = await Promise.all([getVehicles(), getTrips(), getDrivers()]);
-        setData({ vehicles: vData, trips: tData, drivers: dData });
-      } catch (error) {
-        console.error("Dashboard fetch failed:", error);
-      } finally {
-        setLoading(false);
-      }
-    };
-    fetchAll();
-  }, []);
-
   const activeFleet = data.vehicles.filter((v) => v.status === "in_use").length;
   const maintenanceAlerts = data.vehicles.filter((v) => v.status === "maintenance").length;
   const utilizationRate = data.vehicles.length > 0 ?
@@ -134,6 +129,8 @@ export default function DashboardPage() {
         onClose={() => setShowNewTripModal(false)}
         vehicles={data.vehicles}
         drivers={data.drivers}
+        onLoadMoreVehicles={vehicles.hasMore ? vehicles.loadMore : null}
+        onLoadMoreDrivers={drivers.hasMore ? drivers.loadMore : null}
         onSubmit={(tripData) => {
           // Implement standard save behavior if connected properly,
           // for now we'll mock update the table
@@ -146,7 +143,7 @@ export default function DashboardPage() {
             destination: tripData.destination,
             state: 'draft'
           };
-          setData(prev => ({ ...prev, trips: [newTrip, ...prev.trips] }));
+          setCreatedTrips(prev => [newTrip, ...prev]);
           alert("Trip created successfully!");
         }}
       />
@@ -1,12 +1,14 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { Users, ShieldCheck, AlertCircle, Star, Search, Filter, Mail, Phone, ExternalLink, Loader2 } from "lucide-react";
 import { getDrivers, toggleDriverStatus, createDriver } from "@/lib/api";
 import { Card } from "@/components/ui/Card";
 import { Badge } from "@/components/ui/Badge";
 import { Button } from "@/components/ui/Button";
+import { LoadMore } from "@/components/ui/LoadMore";
 import AddDriverModal from "@/components/AddDriverModal";
+import { usePagedList } from "@/lib/usePagedList";
 
 function DriverCard({ driver, onStatusChange }) {
   const completionRate = 85; // Mock data
@@ -74,30 +76,14 @@ function DriverCard({ driver, onStatusChange }) {
 }
 
 export default function DriversPage() {
-  const [drivers, setDrivers] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const { rows: drivers, loading, hasMore, loadMore, reload } = usePagedList(getDrivers);
   const [searchQuery, setSearchQuery] = useState("");
   const [showAddModal, setShowAddModal] = useState(false);
 
-  const fetchDrivers = async () => {
-    try {
-      const data = await getDrivers();
-      setDrivers(data);
-    } catch (error) {
-      console.error("Failed to fetch drivers:", error);
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  useEffect(() => {
-    fetchDrivers();
-  }, []);
-
   const handleStatusChange = async (driverId, newStatus) => {
     try {
       await toggleDriverStatus(driverId, newStatus);
-      await fetchDrivers();
+      await reload();
     } catch (err) {
       alert("Failed to update status");
     }
@@ -107,7 +93,7 @@ export default function DriversPage() {
     d.name.toLowerCase().includes(searchQuery.toLowerCase())
   );
 
-  if (loading) return (
+  if (loading && drivers.length === 0) return (
     <div className="flex flex-col items-center justify-center p-32 gap-4">
       <Loader2 className="w-10 h-10 text-blue-600 animate-spin" />
       <p className="text-sm text-gray-400 font-medium">Loading Drivers...</p>
@@ -153,6 +139,8 @@ export default function DriversPage() {
         </div>
       }
 
+      <LoadMore hasMore={hasMore} loading={loading} onClick={loadMore} label="Load more drivers" />
+
       <AddDriverModal
         isOpen={showAddModal}
         onClose={() => setShowAddModal(false)}
@@ -164,7 +152,7 @@ export default function DriversPage() {
               email: driverData.email,
               license_expiry: driverData.license_expiry
             });
-            await fetchDrivers();
+            await reload();
             alert("Driver added successfully!");
           } catch (e) {
             alert("Failed to add driver.");
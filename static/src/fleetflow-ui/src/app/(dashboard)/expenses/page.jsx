@@ -1,10 +1,12 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { DollarSign, Loader2, Search, Fuel, TrendingDown, PieChart, Plus } from "lucide-react";
 import { getExpenses, getVehicles, createExpense } from "@/lib/api";
 import { Button } from "@/components/ui/Button";
+import { LoadMore } from "@/components/ui/LoadMore";
 import AddExpenseModal from "@/components/AddExpenseModal";
+import { usePagedList } from "@/lib/usePagedList";
 
 const TYPE_BADGE = {
   fuel: "bg-[#F59E0B]/10 text-[#F59E0B]",
@@ -16,28 +18,12 @@ const TYPE_BADGE = {
 };
 
 export default function ExpensesPage() {
-  const [expenses, setExpenses] = useState([]);
-  const [vehicles, setVehicles] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const { rows: expenses, loading, hasMore, loadMore, reload } = usePagedList(getExpenses);
+  const vehicles = usePagedList(getVehicles);
   const [search, setSearch] = useState("");
   const [filterType, setFilterType] = useState("all");
   const [showModal, setShowModal] = useState(false);
 
-  useEffect(() => {
-    const fetchData = async () => {
-      try {
-        const [eData, vData] = await Promise.all([getExpenses(), getVehicles()]);
-        setExpenses(eData);
-        setVehicles(vData);
-      } catch (e) {
-        console.error(e);
-      } finally {
-        setLoading(false);
-      }
-    };
-    fetchData();
-  }, []);
-
   const filtered = expenses.filter((e) => {
     const matchSearch = ((e.vehicle || "") + (e.trip || "")).toLowerCase().includes(search.toLowerCase());
     const eType = e.liters ? "fuel" : "other";
@@ -96,7 +82,7 @@ export default function ExpensesPage() {
 
       {/* Table */}
       <div className="bg-white rounded-2xl border border-gray-100 shadow-sm overflow-hidden">
-        {loading ?
+        {loading && expenses.length === 0 ?
           <div className="flex items-center justify-center p-16"><Loader2 className="w-7 h-7 text-[#2563EB] animate-spin" /></div> :
 
           <div className="overflow-x-auto">
@@ -135,16 +121,17 @@ export default function ExpensesPage() {
             </table>
           </div>
         }
+        <LoadMore hasMore={hasMore} loading={loading} onClick={loadMore} label="Load more expenses" />
       </div>
 
       <AddExpenseModal
         isOpen={showModal}
-        vehicles={vehicles}
+        vehicles={vehicles.rows}
+        onLoadMoreVehicles={vehicles.hasMore ? vehicles.loadMore : null}
         onClose={() => setShowModal(false)}
         onSubmit={async (data) => {
           await createExpense(data);
-          const eData = await getExpenses();
-          setExpenses(eData);
+          await reload();
           alert("Expense logged successfully!");
         }}
       />
@@ -1,37 +1,23 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { Wrench, Calendar, AlertCircle, CheckCircle2, Search, Filter, MoreHorizontal, Plus, Loader2 } from "lucide-react";
 import { Card } from "@/components/ui/Card";
 import { Badge } from "@/components/ui/Badge";
 import { Button } from "@/components/ui/Button";
 import { Table, TableRow, TableCell } from "@/components/ui/Table";
+import { LoadMore } from "@/components/ui/LoadMore";
 import LogMaintenanceModal from "@/components/LogMaintenanceModal";
 import { getMaintenance, getVehicles, createMaintenance } from "@/lib/api";
+import { usePagedList } from "@/lib/usePagedList";
 
 export default function MaintenancePage() {
   const [searchQuery, setSearchQuery] = useState("");
-  const [maintenance, setMaintenance] = useState([]);
-  const [vehicles, setVehicles] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const { rows: maintenance, loading, hasMore, loadMore, reload } = usePagedList(getMaintenance);
+  const vehicles = usePagedList(getVehicles);
   const [showModal, setShowModal] = useState(false);
 
-  useEffect(() => {
-    const fetchData = async () => {
-      try {
-        const [mData, vData] = await Promise.all([getMaintenance(), getVehicles()]);
-        setMaintenance(mData);
-        setVehicles(vData);
-      } catch (e) {
-        console.error("Failed to fetch maintenance:", e);
-      } finally {
-        setLoading(false);
-      }
-    };
-    fetchData();
-  }, []);
-
-  if (loading) return (
+  if (loading && maintenance.length === 0) return (
     <div className="flex flex-col items-center justify-center p-32 gap-4">
       <Loader2 className="w-10 h-10 text-blue-600 animate-spin" />
       <p className="text-sm text-gray-400 font-medium">Loading Maintenance Logs...</p>
@@ -95,19 +81,20 @@ export default function MaintenancePage() {
             </TableRow>
           )}
         </Table>
+        <LoadMore hasMore={hasMore} loading={loading} onClick={loadMore} label="Load more logs" />
       </Card>
 
       <LogMaintenanceModal
         isOpen={showModal}
-        vehicles={vehicles}
+        vehicles={vehicles.rows}
+        onLoadMoreVehicles={vehicles.hasMore ? vehicles.loadMore : null}
         onClose={() => setShowModal(false)}
         onSubmit={async (data) => {
           await createMaintenance({
             ...data,
             status: 'scheduled'
           });
-          const mData = await getMaintenance();
-          setMaintenance(mData);
+          await reload();
           alert("Maintenance logged. Vehicle is now In Shop.");
         }}
       />
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { Plus, Search, Filter, MapPin, Loader2 } from "lucide-react";
 import { getTrips, createTrip, dispatchTrip, completeTrip } from "@/lib/api";
 import { Card } from "@/components/ui/Card";
@@ -9,43 +9,27 @@ import { Button } from "@/components/ui/Button";
 import { Table, TableRow, TableCell } from "@/components/ui/Table";
 import NewTripModal from "@/components/NewTripModal";
 import CompleteTripModal from "@/components/CompleteTripModal";
+import { LoadMore } from "@/components/ui/LoadMore";
 import { getVehicles, getDrivers } from "@/lib/api";
+import { usePagedList } from "@/lib/usePagedList";
 
 export default function TripsPage() {
-  const [trips, setTrips] = useState([]);
-  const [vehicles, setVehicles] = useState([]);
-  const [drivers, setDrivers] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const trips = usePagedList(getTrips);
+  const vehicles = usePagedList(getVehicles);
+  const drivers = usePagedList(getDrivers);
   const [showNewTripModal, setShowNewTripModal] = useState(false);
   const [completingTrip, setCompletingTrip] = useState(null);
 
   const handleDispatch = async (tripId) => {
     try {
       await dispatchTrip(tripId);
-      const newTrips = await getTrips();
-      setTrips(newTrips);
+      await trips.reload();
     } catch (e) {
       alert(e.message || "Failed to dispatch");
     }
   };
 
-  useEffect(() => {
-    const fetchData = async () => {
-      try {
-        const [tData, vData, dData] = await Promise.all([getTrips(), getVehicles(), getDrivers()]);
-        setTrips(tData);
-        setVehicles(vData);
-        setDrivers(dData);
-      } catch (error) {
-        console.error("Failed to fetch trips:", error);
-      } finally {
-        setLoading(false);
-      }
-    };
-    fetchData();
-  }, []);
-
-  if (loading) return (
+  if (trips.loading && trips.rows.length === 0) return (
     <div className="flex flex-col items-center justify-center p-32 gap-4">
       <Loader2 className="w-10 h-10 text-blue-600 animate-spin" />
       <p className="text-sm text-gray-400 font-medium">Loading Trips...</p>
@@ -72,7 +56,7 @@ export default function TripsPage() {
               <h3 className="font-bold text-gray-900">Active Shipments</h3>
             </div>
             <Table headers={["ID", "Route", "Vehicle/Driver", "Status", "Actions"]}>
-              {trips.map((trip) =>
+              {trips.rows.map((trip) =>
                 <TableRow key={trip.id}>
                   <TableCell className="font-bold">#{trip.name.split('/').pop()}</TableCell>
                   <TableCell>
@@ -103,14 +87,17 @@ export default function TripsPage() {
                 </TableRow>
               )}
             </Table>
+            <LoadMore hasMore={trips.hasMore} loading={trips.loading} onClick={trips.loadMore} label="Load more trips" />
           </Card>
         </div>
 
         <NewTripModal
           isOpen={showNewTripModal}
           onClose={() => setShowNewTripModal(false)}
-          vehicles={vehicles}
-          drivers={drivers}
+          vehicles={vehicles.rows}
+          drivers={drivers.rows}
+          onLoadMoreVehicles={vehicles.hasMore ? vehicles.loadMore : null}
+          onLoadMoreDrivers={drivers.hasMore ? drivers.loadMore : null}
           onSubmit={async (tripData) => {
             try {
               const result = await createTrip({
@@ -123,8 +110,7 @@ export default function TripsPage() {
               });
               // Result comes back with simple vehicle name instead of tuple. We need to format it or just re-fetch.
               // Let's just re-fetch to ensure all nested joins are consistent.
-              const newTrips = await getTrips();
-              setTrips(newTrips);
+              await trips.reload();
               alert("Trip created successfully!");
               setShowNewTripModal(false);
             } catch (error) {
@@ -139,11 +125,8 @@ export default function TripsPage() {
           onClose={() => setCompletingTrip(null)}
           onSubmit={async (tripId, endOdometer) => {
             await completeTrip({ trip_id: tripId, end_odometer: endOdometer });
-            const newTrips = await getTrips();
-            setTrips(newTrips);
             // also refresh vehicles to get new odometer
-            setVehicles(await getVehicles());
-            setDrivers(await getDrivers());
+            await Promise.all([trips.reload(), vehicles.reload(), drivers.reload()]);
             alert("Trip completed successfully!");
           }}
         />
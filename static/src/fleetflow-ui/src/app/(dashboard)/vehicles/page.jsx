@@ -1,35 +1,21 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { Truck, Search, Plus, Filter, MoreVertical, Loader2 } from "lucide-react";
 import { getVehicles, createVehicle } from "@/lib/api";
 import { Card } from "@/components/ui/Card";
 import { Badge } from "@/components/ui/Badge";
 import { Button } from "@/components/ui/Button";
 import { Table, TableRow, TableCell } from "@/components/ui/Table";
+import { LoadMore } from "@/components/ui/LoadMore";
 import AddVehicleModal from "@/components/AddVehicleModal";
+import { usePagedList } from "@/lib/usePagedList";
 
 export default function VehiclesPage() {
-  const [vehicles, setVehicles] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const { rows: vehicles, loading, hasMore, loadMore, reload } = usePagedList(getVehicles);
   const [searchQuery, setSearchQuery] = useState("");
   const [showAddModal, setShowAddModal] = useState(false);
 
-  const fetchVehicles = async () => {
-    try {
-      const data = await getVehicles();
-      setVehicles(data);
-    } catch (error) {
-      console.error("Failed to fetch vehicles:", error);
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  useEffect(() => {
-    fetchVehicles();
-  }, []);
-
   const filteredVehicles = vehicles.filter((v) =>
     v.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
     v.license_plate.toLowerCase().includes(searchQuery.toLowerCase())
@@ -45,7 +31,7 @@ export default function VehiclesPage() {
     }
   };
 
-  if (loading) return (
+  if (loading && vehicles.length === 0) return (
     <div className="flex flex-col items-center justify-center p-32 gap-4">
       <Loader2 className="w-10 h-10 text-blue-600 animate-spin" />
       <p className="text-sm text-gray-400 font-medium">Loading Fleet...</p>
@@ -106,6 +92,7 @@ export default function VehiclesPage() {
             <p className="text-gray-400">No vehicles found matching your search.</p>
           </div>
         }
+        <LoadMore hasMore={hasMore} loading={loading} onClick={loadMore} label="Load more vehicles" />
       </Card>
 
       <AddVehicleModal
@@ -119,7 +106,7 @@ export default function VehiclesPage() {
               vehicle_type: vehicleData.vehicle_type,
               capacity: vehicleData.capacity,
             });
-            await fetchVehicles();
+            await reload();
             alert("Vehicle added successfully!");
             setShowAddModal(false);
           } catch (e) {
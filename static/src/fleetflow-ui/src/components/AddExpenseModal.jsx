@@ -2,7 +2,7 @@ import { useState } from 'react';
 import { X, AlertCircle } from 'lucide-react';
 import { Button } from '@/components/ui/Button';
 
-export default function AddExpenseModal({ isOpen, onClose, vehicles, onSubmit }) {
+export default function AddExpenseModal({ isOpen, onClose, vehicles, onLoadMoreVehicles, onSubmit }) {
     const [formData, setFormData] = useState({
         vehicle_id: '',
         liters: '',
@@ -62,6 +62,9 @@ export default function AddExpenseModal({ isOpen, onClose, vehicles, onSubmit })
                                     <option key={v.id} value={v.id}>{v.name} ({v.license_plate})</option>
                                 ))}
                             </select>
+                            {onLoadMoreVehicles && (
+                                <button type="button" onClick={onLoadMoreVehicles} className="text-xs font-medium text-blue-600 hover:underline">Load more vehicles</button>
+                            )}
                         </div>
 
                         <div className="space-y-2">
@@ -2,7 +2,7 @@ import { useState } from 'react';
 import { X, AlertCircle } from 'lucide-react';
 import { Button } from '@/components/ui/Button';
 
-export default function LogMaintenanceModal({ isOpen, onClose, vehicles, onSubmit }) {
+export default function LogMaintenanceModal({ isOpen, onClose, vehicles, onLoadMoreVehicles, onSubmit }) {
     const [formData, setFormData] = useState({
         vehicle_id: '',
         issue: '',
@@ -60,6 +60,9 @@ export default function LogMaintenanceModal({ isOpen, onClose, vehicles, onSubmi
                                     <option key={v.id} value={v.id}>{v.name} ({v.license_plate})</option>
                                 ))}
                             </select>
+                            {onLoadMoreVehicles && (
+                                <button type="button" onClick={onLoadMoreVehicles} className="text-xs font-medium text-blue-600 hover:underline">Load more vehicles</button>
+                            )}
                         </div>
 
                         <div className="space-y-2">
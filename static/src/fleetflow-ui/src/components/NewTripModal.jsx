@@ -2,7 +2,7 @@ import { useState } from 'react';
 import { X, MapPin, Truck, AlertCircle, Calendar } from 'lucide-react';
 import { Button } from '@/components/ui/Button';
 
-export default function NewTripModal({ isOpen, onClose, vehicles, drivers, onSubmit }) {
+export default function NewTripModal({ isOpen, onClose, vehicles, drivers, onLoadMoreVehicles, onLoadMoreDrivers, onSubmit }) {
     const [formData, setFormData] = useState({
         origin: '',
         destination: '',
@@ -93,6 +93,9 @@ export default function NewTripModal({ isOpen, onClose, vehicles, drivers, onSub
                                     ))}
                                 </select>
                             </div>
+                            {onLoadMoreVehicles && (
+                                <button type="button" onClick=onLoadMoreVehicles className="text-xs font-medium text-blue-600 hover:underline">Load more vehicles</button>
+                            )}
                         </div>
 
                         <div className="grid grid-cols-2 gap-4">
@@ -109,6 +112,9 @@ export default function NewTripModal({ isOpen, onClose, vehicles, drivers, onSub
                                         ))}
                                     </select>
                                 </div>
+                                {onLoadMoreDrivers && (
+                                    <button type="button" onClick=onLoadMoreDrivers className="text-xs font-medium text-blue-600 hover:underline">Load more drivers</button>
+                                )}
                             </div>
                             <div className="space-y-2">
                                 <div className="space-y-2">
@@ -0,0 +1,14 @@
+import React from "react";
+import { Button } from "./Button";
+
+// "Load more" footer of a paged list (see usePagedList); hidden on the last page.
+export const LoadMore = ({ hasMore, loading, onClick, label = "Load more" }) => {
+  if (!hasMore) return null;
+  return (
+    <div className="flex justify-center pt-4">
+      <Button variant="outline" size="sm" isLoading={loading} onClick={onClick}>
+        {label}
+      </Button>
+    </div>);
+
+};
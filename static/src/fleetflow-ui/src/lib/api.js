@@ -40,6 +40,31 @@ async function apiFetch(endpoint, options = {}) {
   }
 }
 
+// ── Helper: Paged list fetch ──────────────────────────────────────────
+// List endpoints return at most `limit` rows plus a `next_cursor`. Screens
+// load one page at a time (see usePagedList) and pass the cursor back as
+// `after` when the user asks for more.
+const PAGE_SIZE = 100;
+
+async function apiFetchPage(endpoint, after = null) {
+  const sep = endpoint.includes("?") ? "&" : "?";
+  const cursor = after ? `&after=${after}` : "";
+  const res = await apiFetch(`${endpoint}${sep}limit=${PAGE_SIZE}${cursor}`);
+  return { rows: res.data ?? [], nextCursor: res.next_cursor ?? null };
+}
+
+// Whole collections, for the client-side analytics below only.
+async function apiFetchAll(endpoint) {
+  let rows = [];
+  let cursor = null;
+  do {
+    const page = await apiFetchPage(endpoint, cursor);
+    rows = rows.concat(page.rows);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return rows;
+}
+
 // ── Helper: JSON-RPC (with demo fallback) ─────────────────────────────
 async function apiPostJson(endpoint, params = {}) {
   try {
@@ -252,9 +277,8 @@ function demoMutate(endpoint, params) {
 }
 
 // ── Vehicles ────────────────────────────────────────────────────────
-export async function getVehicles() {
-  const res = await apiFetch("/fleetflow/vehicles");
-  return res.data;
+export async function getVehicles(after = null) {
+  return apiFetchPage("/fleetflow/vehicles", after);
 }
 
 export async function createVehicle(data) {
@@ -262,9 +286,8 @@ export async function createVehicle(data) {
 }
 
 // ── Drivers ─────────────────────────────────────────────────────────
-export async function getDrivers() {
-  const res = await apiFetch("/fleetflow/drivers");
-  return res.data;
+export async function getDrivers(after = null) {
+  return apiFetchPage("/fleetflow/drivers", after);
 }
 
 export async function createDriver(data) {
@@ -272,12 +295,14 @@ export async function createDriver(data) {
 }
 
 // ── Trips ───────────────────────────────────────────────────────────
-export async function getTrips(state) {
-  const endpoint = state ?
+function tripsEndpoint(state) {
+  return state ?
     `/fleetflow/trips?state=${state}` :
     "/fleetflow/trips";
-  const res = await apiFetch(endpoint);
-  return res.data;
+}
+
+export async function getTrips(after = null, state = null) {
+  return apiFetchPage(tripsEndpoint(state), after);
 }
 
 export async function createTrip(data) {
@@ -292,9 +317,8 @@ export async function completeTrip(params) {
   return apiPostJson("/fleetflow/trip/complete", params);
 }
 // ── Maintenance ────────────────────────────────────────────────────
-export async function getMaintenance() {
-  const res = await apiFetch("/fleetflow/maintenance");
-  return res.data;
+export async function getMaintenance(after = null) {
+  return apiFetchPage("/fleetflow/maintenance", after);
 }
 
 export async function createMaintenance(data) {
@@ -302,9 +326,8 @@ export async function createMaintenance(data) {
 }
 
 // ── Expenses ───────────────────────────────────────────────────────
-export async function getExpenses() {
-  const res = await apiFetch("/fleetflow/expenses");
-  return res.data;
+export async function getExpenses(after = null) {
+  return apiFetchPage("/fleetflow/expenses", after);
 }
 
 export async function createExpense(data) {
@@ -334,10 +357,10 @@ export async function cancelTrip(tripId) {
 // ── Analytics helpers (computed from mock data) ────────────────────
 export async function getAnalytics() {
   const [vehicles, trips, expenses, maintenance] = await Promise.all([
-    getVehicles(),
-    getTrips(),
-    getExpenses(),
-    getMaintenance()]
+    apiFetchAll("/fleetflow/vehicles"),
+    apiFetchAll(tripsEndpoint()),
+    apiFetchAll("/fleetflow/expenses"),
+    apiFetchAll("/fleetflow/maintenance")]
   );
 
   // Fuel efficiency per vehicle
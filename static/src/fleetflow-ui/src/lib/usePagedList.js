@@ -0,0 +1,35 @@
+import { useCallback, useEffect, useState } from "react";
+
+// ── Paged list state ──────────────────────────────────────────────────
+// Loads the first page of `fetchPage(after)` (one of the list getters in
+// api.js) on mount; `loadMore` appends the next page, `reload` starts over.
+export function usePagedList(fetchPage) {
+  const [rows, setRows] = useState([]);
+  const [cursor, setCursor] = useState(null);
+  const [loading, setLoading] = useState(true);
+
+  const load = useCallback(async (after) => {
+    setLoading(true);
+    try {
+      const page = await fetchPage(after);
+      setRows((prev) => (after ? [...prev, ...page.rows] : page.rows));
+      setCursor(page.nextCursor);
+    } catch (error) {
+      console.error("Failed to fetch page:", error);
+    } finally {
+      setLoading(false);
+    }
+  }, [fetchPage]);
+
+  useEffect(() => {
+    load(null);
+  }, [load]);
+
+  return {
+    rows,
+    loading,
+    hasMore: cursor !== null,
+    loadMore: () => (cursor !== null ? load(cursor) : Promise.resolve()),
+    reload: () => load(null),
+  };
+}
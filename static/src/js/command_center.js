@@ -4,7 +4,9 @@
  * FleetIQ – Command Center Client Action (Odoo 17 / OWL 2)
  *
  * Registers as the "fleetflow_command_center" client action tag.
- * Fetches KPI data from /fleetflow/command_center/data via JSON-RPC.
+ * Fetches KPI data from /fleetflow/command_center/data via JSON-RPC, then
+ * listens on the bus for KPI pushes sent by the server whenever vehicles or
+ * trips change, so open tabs no longer poll.
  * QWeb template is in static/src/xml/command_center.xml.
  */
 
@@ -13,6 +15,10 @@ import { useService } from "@web/core/utils/hooks";
 import { Component, useState, onMounted, onWillUnmount } from "@odoo/owl";
 
 // ── Constants ────────────────────────────────────────────────────────
+const PUSH_NOTIFICATION = "fleetflow_command_center/update";
+// Safety-net refresh in case a push is missed (e.g. websocket reconnect).
+const FALLBACK_REFRESH_MS = 5 * 60_000;
+
 const VEHICLE_TYPES = ["", "truck", "van", "car", "bus", "other"];
 const VEHICLE_STATUS = ["", "available", "on_trip", "in_service", "in_shop", "maintenance", "inactive"];
 
@@ -39,6 +45,7 @@ export class CommandCenterDashboard extends Component {
 
   setup() {
     this.rpc = useService("rpc");
+    this.busService = useService("bus_service");
 
     this.state = useState({
       loading: true,
@@ -58,13 +65,16 @@ export class CommandCenterDashboard extends Component {
     });
 
     this._refreshInterval = null;
+    this._onPush = this._onPush.bind(this);
 
     onMounted(() => {
       this._load();
-      this._refreshInterval = setInterval(() => this._load(), 60_000);
+      this.busService.subscribe(PUSH_NOTIFICATION, this._onPush);
+      this._refreshInterval = setInterval(() => this._load(), FALLBACK_REFRESH_MS);
     });
 
     onWillUnmount(() => {
+      this.busService.unsubscribe(PUSH_NOTIFICATION, this._onPush);
       if (this._refreshInterval) {
         clearInterval(this._refreshInterval);
       }
@@ -85,19 +95,7 @@ export class CommandCenterDashboard extends Component {
         this.state.error = (result && result.message) || "Server error. Please retry.";
         return;
       }
-
-      Object.assign(this.state, {
-        active_fleet: result.active_fleet_count ?? 0,
-        alerts: result.maintenance_alerts ?? 0,
-        utilization: result.utilization_rate ?? 0,
-        pending_cargo: result.pending_cargo ?? 0,
-        total_vehicles: result.total_vehicles ?? 0,
-        status_breakdown: result.status_breakdown ?? {},
-        type_breakdown: result.type_breakdown ?? {},
-        recent_trips: result.recent_trips ?? [],
-        shop_vehicles: result.shop_vehicles ?? [],
-        last_updated: new Date().toLocaleTimeString(),
-      });
+      this._apply(result);
     } catch (e) {
       this.state.error = "Failed to fetch dashboard data. Check your connection.";
     } finally {
@@ -105,6 +103,33 @@ export class CommandCenterDashboard extends Component {
     }
   }
 
+  /**
+   * Pushed payloads are computed without filters; a filtered board
+   * re-requests its own view instead of showing company-wide numbers.
+   */
+  _onPush(payload) {
+    if (this.state.vehicle_type || this.state.vehicle_status) {
+      this._load();
+    } else {
+      this._apply(payload);
+    }
+  }
+
+  _apply(result) {
+    Object.assign(this.state, {
+      active_fleet: result.active_fleet_count ?? 0,
+      alerts: result.maintenance_alerts ?? 0,
+      utilization: result.utilization_rate ?? 0,
+      pending_cargo: result.pending_cargo ?? 0,
+      total_vehicles: result.total_vehicles ?? 0,
+      status_breakdown: result.status_breakdown ?? {},
+      type_breakdown: result.type_breakdown ?? {},
+      recent_trips: result.recent_trips ?? [],
+      shop_vehicles: result.shop_vehicles ?? [],
+      last_updated: new Date().toLocaleTimeString(),
+    });
+  }
+
   // ── Event handlers ───────────────────────────────────────────────
   onTypeChange(ev) {
     this.state.vehicle_type = ev.target.value;
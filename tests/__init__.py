@@ -0,0 +1,10 @@
+from . import test_batch_create
+from . import test_dispatch_matcher
+from . import test_driver
+from . import test_jsonrpc
+from . import test_performance
+from . import test_query_plans
+from . import test_sequence
+from . import test_sync
+from . import test_trip_locking
+from . import test_vehicle_totals
@@ -0,0 +1,104 @@
+from datetime import date, timedelta
+
+from odoo.tests import TransactionCase
+
+# Seeded per company: one vehicle and one driver per type below, and per
+# vehicle TRIP_STATES trips, a fuel expense per completed trip plus one
+# without a trip, and MAINTENANCE_PER_VEHICLE maintenance jobs.
+VEHICLE_TYPES = ('truck', 'truck', 'van', 'van', 'car', 'car')
+TRIP_STATES = ('completed', 'completed', 'completed', 'cancelled', 'draft')
+MAINTENANCE_PER_VEHICLE = 2
+
+
+class FleetflowCommon(TransactionCase):
+    """A small fleet in two companies, with trips, expenses and maintenance
+    in every state, shared by the FleetIQ tests."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.company = cls.env.company
+        cls.other_company = cls.env['res.company'].create({'name': 'FleetIQ Test Company'})
+        cls.companies = cls.company | cls.other_company
+        cls.vehicles = cls.env['fleetflow.vehicle']
+        cls.drivers = cls.env['fleetflow.driver']
+        for company in cls.companies:
+            cls._seed_company(company)
+        # An archived vehicle and one without any history.
+        cls.vehicles[-1].active = False
+        cls.idle_vehicle = cls.env['fleetflow.vehicle'].create({
+            'name': 'Idle Van', 'license_plate': 'FF-IDLE', 'vehicle_type': 'van',
+            'max_capacity': 2.0, 'company_id': cls.company.id,
+        })
+        cls.vehicles |= cls.idle_vehicle
+
+        # Run the precommit hooks (daily cost rollup) as a commit would,
+        # then age the seed: delta sync holds back the rows stamped after
+        # the oldest running transaction started, this one included.
+        cls.env.cr.flush()
+        for table in ('fleetflow_vehicle', 'fleetflow_driver', 'fleetflow_trip',
+                      'fleetflow_expense', 'fleetflow_maintenance'):
+            cls.env.cr.execute(f"UPDATE {table} SET write_date = write_date - interval '1 hour'")
+        cls.env.invalidate_all()
+
+    @classmethod
+    def _seed_company(cls, company):
+        today = date.today()
+        vehicles = cls.env['fleetflow.vehicle'].create([{
+            'name': f'{company.name} {vehicle_type} {index}',
+            'license_plate': f'FF-{company.id}-{index}',
+            'vehicle_type': vehicle_type,
+            'max_capacity': 20.0 if vehicle_type == 'truck' else 2.0,
+            'odometer': 10000.0 * (index + 1),
+            'acquisition_cost': 50000.0,
+            'company_id': company.id,
+        } for index, vehicle_type in enumerate(VEHICLE_TYPES)])
+        drivers = cls.env['fleetflow.driver'].create([{
+            'name': f'{company.name} Driver {index}',
+            'license_number': f'DL-{company.id}-{index}',
+            'license_category': vehicle_type,
+            'license_expiry': today + timedelta(days=365),
+            'company_id': company.id,
+        } for index, vehicle_type in enumerate(VEHICLE_TYPES)])
+
+        trip_vals = []
+        for index, (vehicle, driver) in enumerate(zip(vehicles, drivers)):
+            for number, state in enumerate(TRIP_STATES):
+                start = vehicle.odometer + 100.0 * number
+                trip_vals.append({
+                    'vehicle_id': vehicle.id,
+                    'driver_id': driver.id,
+                    'origin': 'Lyon',
+                    'destination': 'Paris',
+                    'cargo_weight': 1.0,
+                    'revenue': 400.0 + 10 * index + number,
+                    'state': state,
+                    'start_odometer': start,
+                    'end_odometer': start + 90.0 + index if state == 'completed' else 0.0,
+                    'date_completed': today - timedelta(days=number) if state == 'completed' else False,
+                })
+        trips = cls.env['fleetflow.trip'].create(trip_vals)
+
+        completed = trips.filtered(lambda t: t.state == 'completed')
+        cls.env['fleetflow.expense'].create([{
+            'vehicle_id': trip.vehicle_id.id,
+            'trip_id': trip.id,
+            'liters': 30.0 + index,
+            'fuel_cost': 55.0 + index,
+            'expense_date': trip.date_completed,
+        } for index, trip in enumerate(completed)] + [{
+            'vehicle_id': vehicle.id,
+            'liters': 12.5,
+            'fuel_cost': 21.0,
+            'expense_date': today - timedelta(days=40),
+        } for vehicle in vehicles])
+        cls.env['fleetflow.maintenance'].create([{
+            'vehicle_id': vehicle.id,
+            'issue': 'Inspection',
+            'cost': 150.0 * (index + 1) + number,
+            'service_date': today - timedelta(days=30 * number),
+        } for index, vehicle in enumerate(vehicles) for number in range(MAINTENANCE_PER_VEHICLE)])
+
+        cls.vehicles |= vehicles
+        cls.drivers |= drivers
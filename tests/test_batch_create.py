@@ -0,0 +1,48 @@
+from odoo.tests import tagged
+
+from odoo.addons.fleetflow.controllers.api import _create_batch, _trip_vals
+from .common import FleetflowCommon
+
+
+@tagged('post_install', '-at_install')
+class TestBatchCreate(FleetflowCommon):
+    """A bad row of a batch gets its own error result; the rest of its chunk
+    is still created."""
+
+    def payload(self, **values):
+        vehicle, driver = self.vehicles[4], self.drivers[4]
+        return dict({
+            'vehicle_id': vehicle.id, 'driver_id': driver.id,
+            'origin': 'Lyon', 'destination': 'Nice', 'cargo_weight': 1.0,
+        }, **values)
+
+    def test_bad_rows(self):
+        Trip = self.env['fleetflow.trip']
+        before = Trip.search_count([])
+        records = [
+            self.payload(),
+            self.payload(revenue=250.0),
+            # Over the car's capacity: fails in create, replayed row by row.
+            self.payload(cargo_weight=50.0),
+            self.payload(destination='Toulouse'),
+            # Fails in the vals builder, before any create.
+            self.payload(cargo_weight='heavy'),
+        ]
+        results = _create_batch(Trip, records, _trip_vals)
+
+        self.assertEqual([r['index'] for r in results], list(range(len(records))))
+        self.assertEqual([r['status'] for r in results], ['ok', 'ok', 'error', 'ok', 'error'])
+        self.assertIn('exceeds vehicle max capacity', results[2]['message'])
+        self.assertIn('heavy', results[4]['message'])
+
+        created = Trip.browse([r['id'] for r in results if r['status'] == 'ok'])
+        self.assertEqual(len(created.exists()), 3)
+        self.assertEqual(created.mapped('destination'), ['Nice', 'Nice', 'Toulouse'])
+        self.assertEqual(created.mapped('revenue'), [0.0, 250.0, 0.0])
+        self.assertEqual(Trip.search_count([]), before + 3)
+
+    def test_clean_batch(self):
+        Trip = self.env['fleetflow.trip']
+        results = _create_batch(Trip, [self.payload(), self.payload()], _trip_vals)
+        self.assertEqual([r['status'] for r in results], ['ok', 'ok'])
+        self.assertEqual(len(Trip.browse([r['id'] for r in results]).exists()), 2)
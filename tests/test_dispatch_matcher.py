@@ -0,0 +1,135 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.fleetflow.models import dispatch_matcher
+from odoo.addons.fleetflow.models.dispatch_matcher import _assign_greedy, _assign_optimal
+
+
+@tagged('post_install', '-at_install')
+class TestDispatchMatcher(TransactionCase):
+    """
+    A van and two equal trucks in a company of their own, with a driver
+    each. Pairs must carry the cargo and match the license category, and
+    trips keep their vehicle and driver when nothing better fits.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.company = cls.env['res.company'].create({'name': 'FleetIQ Matcher Company'})
+        Vehicle = cls.env['fleetflow.vehicle']
+        cls.van, cls.truck_1, cls.truck_2 = Vehicle.create([{
+            'name': name, 'license_plate': f'MATCH-{index}', 'vehicle_type': vehicle_type,
+            'max_capacity': capacity, 'company_id': cls.company.id,
+        } for index, (name, vehicle_type, capacity) in enumerate([
+            ('Van', 'van', 2.0), ('Truck 1', 'truck', 20.0), ('Truck 2', 'truck', 20.0),
+        ])])
+        Driver = cls.env['fleetflow.driver']
+        cls.van_driver, cls.truck_driver_1, cls.truck_driver_2 = Driver.create([{
+            'name': name, 'license_number': f'DL-MATCH-{index}', 'license_category': category,
+            'license_expiry': date.today() + timedelta(days=365), 'company_id': cls.company.id,
+        } for index, (name, category) in enumerate([
+            ('Van Driver', 'van'), ('Truck Driver 1', 'truck'), ('Truck Driver 2', 'truck'),
+        ])])
+
+    def trip(self, cargo_weight, vehicle, driver):
+        return self.env['fleetflow.trip'].create({
+            'vehicle_id': vehicle.id, 'driver_id': driver.id, 'cargo_weight': cargo_weight,
+            'origin': 'Lyon', 'destination': 'Paris',
+        })
+
+    def match(self):
+        return self.env['fleetflow.trip']._match_draft_trips(self.company)
+
+    def assertFeasible(self, pairs):
+        Trip, Vehicle, Driver = (self.env[name] for name in
+                                 ('fleetflow.trip', 'fleetflow.vehicle', 'fleetflow.driver'))
+        for trip_id, (vehicle_id, driver_id) in pairs.items():
+            trip, vehicle, driver = Trip.browse(trip_id), Vehicle.browse(vehicle_id), Driver.browse(driver_id)
+            self.assertGreaterEqual(vehicle.max_capacity, trip.cargo_weight)
+            self.assertEqual(driver.license_category, vehicle.vehicle_type)
+        vehicles = [vehicle_id for vehicle_id, _driver_id in pairs.values()]
+        drivers = [driver_id for _vehicle_id, driver_id in pairs.values()]
+        self.assertEqual(len(vehicles), len(set(vehicles)))
+        self.assertEqual(len(drivers), len(set(drivers)))
+
+    def test_keeps_current_pairs(self):
+        heavy = self.trip(15.0, self.truck_2, self.truck_driver_2)
+        light = self.trip(1.5, self.van, self.van_driver)
+        pairs, unmatched = self.match()
+        self.assertFeasible(pairs)
+        self.assertFalse(unmatched)
+        self.assertEqual(pairs[heavy.id], (self.truck_2.id, self.truck_driver_2.id))
+        self.assertEqual(pairs[light.id], (self.van.id, self.van_driver.id))
+
+    def test_capacity(self):
+        # Three heavy trips for two trucks, the van being too small.
+        first = self.trip(15.0, self.truck_2, self.truck_driver_2)
+        second = self.trip(12.0, self.truck_2, self.truck_driver_2)
+        third = self.trip(10.0, self.truck_1, self.truck_driver_1)
+        pairs, unmatched = self.match()
+        self.assertFeasible(pairs)
+        self.assertEqual(len(pairs), 2)
+        [(trip_id, reason)] = unmatched.items()
+        self.assertIn(trip_id, (first | second | third).ids)
+        self.assertEqual(reason, 'No available vehicle with enough capacity')
+
+    def test_license_category(self):
+        light = self.trip(1.5, self.van, self.van_driver)
+        # Nobody left to drive the van: the trip goes to a truck and a
+        # truck driver instead.
+        self.van_driver.status = 'suspended'
+        pairs, unmatched = self.match()
+        self.assertFeasible(pairs)
+        self.assertFalse(unmatched)
+        vehicle_id, driver_id = pairs[light.id]
+        self.assertIn(vehicle_id, (self.truck_1 | self.truck_2).ids)
+        self.assertIn(driver_id, (self.truck_driver_1 | self.truck_driver_2).ids)
+
+    def test_short_of_drivers(self):
+        # Two trucks for two heavy trips, but a single truck driver.
+        self.truck_driver_2.status = 'suspended'
+        trips = (self.trip(15.0, self.truck_1, self.truck_driver_1)
+                 | self.trip(12.0, self.truck_1, self.truck_driver_1))
+        pairs, unmatched = self.match()
+        self.assertFeasible(pairs)
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual(set(pairs) | set(unmatched), set(trips.ids))
+        [(_vehicle_id, driver_id)] = pairs.values()
+        self.assertEqual(driver_id, self.truck_driver_1.id)
+
+    def test_greedy_matches_optimal(self):
+        # A single optimal plan: the light trip leaves Truck 1 for the van.
+        self.trip(15.0, self.truck_2, self.truck_driver_2)
+        self.trip(12.0, self.truck_1, self.truck_driver_1)
+        self.trip(1.5, self.truck_1, self.truck_driver_1)
+        with patch.object(dispatch_matcher, 'linear_sum_assignment', None):
+            greedy = self.match()
+        self.assertFeasible(greedy[0])
+        if dispatch_matcher.np is None or dispatch_matcher.linear_sum_assignment is None:
+            self.skipTest('numpy / scipy are not installed')
+        self.assertEqual(self.match(), greedy)
+
+    def test_solvers(self):
+        cases = [
+            # Current columns kept; the last row's is taken, it gets the van.
+            ([15.0, 12.0, 1.5], [2.0, 20.0, 20.0], ['t2', 't1', 't1'], ['v', 't1', 't2'], [2, 1, 0]),
+            # No current column: the tightest fits.
+            ([5.0, 1.0], [20.0, 6.0, 2.0], [None, None], ['a', 'b', 'c'], [1, 2]),
+            # An infeasible row, the other takes the only column it fits.
+            ([30.0, 5.0], [20.0, 2.0], [None, None], ['t1', 'v'], [None, 0]),
+            # No columns at all.
+            ([1.0], [], [None], [], [None]),
+        ]
+        solvers = [_assign_greedy]
+        if dispatch_matcher.np is not None and dispatch_matcher.linear_sum_assignment is not None:
+            solvers.append(_assign_optimal)
+        for loads, capacities, current, candidates, expected in cases:
+            for solver in solvers:
+                with self.subTest(solver=solver.__name__, loads=loads):
+                    result = [None if column is None else int(column)
+                              for column in solver(loads, capacities, current, candidates)]
+                    self.assertEqual(result, expected)
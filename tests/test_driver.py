@@ -0,0 +1,41 @@
+from datetime import datetime, time, timedelta
+from unittest.mock import patch
+
+from freezegun import freeze_time
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.fleetflow.models.driver import SAFETY_SCORE_LAST_RUN_PARAM
+from .common import FleetflowCommon
+
+
+@tagged('post_install', '-at_install')
+class TestSafetyScore(FleetflowCommon):
+    """The nightly cron penalises a license on the day it expires, whatever
+    the timezone it runs in."""
+
+    def run_cron(self, moment):
+        # UTC+14: the local date is a day ahead of the UTC one at noon.
+        Driver = self.env['fleetflow.driver'].with_context(tz='Pacific/Kiritimati')
+        with freeze_time(moment), patch.object(self.env.cr, 'commit'):
+            Driver._cron_recompute_expired_safety_scores()
+
+    def test_cron_across_expiry(self):
+        today = fields.Date.today()
+        expiry = today + timedelta(days=1)
+        driver = self.drivers[0]
+        driver.license_expiry = expiry
+        score = driver.safety_score
+        self.assertGreater(score, 0.0)
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.set_param(SAFETY_SCORE_LAST_RUN_PARAM, fields.Date.to_string(today))
+
+        # The night of the expiry day: the license is still valid.
+        self.run_cron(datetime.combine(expiry, time(12)))
+        self.assertEqual(driver.safety_score, score)
+        self.assertEqual(ICP.get_param(SAFETY_SCORE_LAST_RUN_PARAM), fields.Date.to_string(expiry))
+
+        # The next night it has expired, and is penalised.
+        self.run_cron(datetime.combine(expiry + timedelta(days=1), time(12)))
+        self.assertEqual(driver.safety_score, max(0.0, score - 20.0))
@@ -0,0 +1,32 @@
+import json
+
+from odoo.tests import HttpCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestJsonRpc(HttpCase):
+    """Envelope handling of the ``jsonrpc`` routes."""
+
+    def post(self, body):
+        response = self.url_open('/fleetflow/trip/dispatch', data=body,
+                                 headers={'Content-Type': 'application/json'})
+        return response.status_code, response.json()
+
+    def test_invalid_request(self):
+        for body in ('[1, 2]', '"dispatch"', '42', '{"id": 7, "params": [1]}', '{"id": 7, "params": "x"}'):
+            with self.subTest(body=body):
+                status, reply = self.post(body)
+                self.assertEqual(status, 400)
+                self.assertEqual(reply['error']['code'], -32600)
+                self.assertEqual(reply['id'], 7 if 'params' in body else None)
+
+    def test_parse_error(self):
+        status, reply = self.post('{"params":')
+        self.assertEqual(status, 400)
+        self.assertEqual(reply['error']['code'], -32700)
+
+    def test_call(self):
+        status, reply = self.post(json.dumps({'jsonrpc': '2.0', 'id': 3, 'params': {'trip_id': 0}}))
+        self.assertEqual(status, 200)
+        self.assertEqual(reply['id'], 3)
+        self.assertEqual(reply['result']['status'], 'error')
@@ -0,0 +1,148 @@
+import os
+import time
+from datetime import date, timedelta
+
+from odoo.tests import tagged
+
+from odoo.addons.fleetflow.controllers.api import (
+    SYNC_COLLECTIONS, _cost_series, _search_page, _sync_collection, _trip_data, _validator,
+)
+from .common import FleetflowCommon
+
+# (queries, milliseconds) allowed per scenario. Every scenario runs on the
+# test companies only, so the query budgets hold whatever else the database
+# contains; the time budgets are scaled by FLEETFLOW_PERF_TIME_FACTOR on
+# slower runners. benchmarks/bench_fleetflow.py measures the same paths at
+# fleet scale.
+PERF_BUDGETS = {
+    'api page': (10, 150),
+    'sync': (10, 200),
+    'analytics series': (6, 150),
+    'dashboard aggregate': (6, 150),
+    'command center': (8, 200),
+    'vehicle totals': (8, 200),
+    'dispatch matcher': (8, 300),
+    'cost report': (6, 200),
+    'telemetry ingest': (6, 200),
+    'csv export': (20, 1000),
+}
+PERF_TIME_FACTOR = float(os.environ.get('FLEETFLOW_PERF_TIME_FACTOR') or 1.0)
+
+VEHICLE_TOTAL_FIELDS = ['trip_count', 'total_revenue', 'total_fuel_cost', 'total_liters',
+                        'total_maintenance_cost', 'total_operational_cost', 'fuel_efficiency', 'roi']
+
+
+@tagged('fleetflow_perf', '-standard', 'post_install', '-at_install')
+class TestPerformance(FleetflowCommon):
+    """
+    Query-count and wall-time budgets of the hot paths. Paged and batched
+    paths must also issue the same number of queries for a few rows as for
+    many. Run with ``--test-tags fleetflow_perf``.
+    """
+
+    def measure(self, func):
+        """Run ``func`` on a cold cache; return ``(queries, milliseconds)``."""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries = self.cr.sql_log_count
+        started = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - started) * 1000
+        return self.cr.sql_log_count - queries, elapsed
+
+    def assertBudget(self, name, func):
+        queries, elapsed = self.measure(func)
+        max_queries, max_ms = PERF_BUDGETS[name]
+        max_ms *= PERF_TIME_FACTOR
+        self.assertLessEqual(queries, max_queries, f"{name}: {queries} queries, budget is {max_queries}")
+        self.assertLessEqual(elapsed, max_ms, f"{name}: {elapsed:.1f} ms, budget is {max_ms:.0f} ms")
+        return queries
+
+    def assertConstantQueries(self, name, func, few, many):
+        """``func(size)`` issues as many queries for ``few`` as for ``many``."""
+        # Warm the registry caches (ormcache, sequences) first.
+        func(few)
+        queries_few, _elapsed = self.measure(lambda: func(few))
+        queries_many = self.assertBudget(name, lambda: func(many))
+        self.assertEqual(queries_few, queries_many,
+                         f"{name}: {queries_few} queries for {few}, {queries_many} for {many}")
+
+    # ── API ──────────────────────────────────────────────────────────
+
+    def test_api_page(self):
+        Trip = self.env['fleetflow.trip']
+        domain = [('company_id', 'in', self.companies.ids)]
+
+        def page(limit):
+            records, next_cursor = _search_page(Trip, domain, limit)
+            _validator(Trip, domain, limit, records, next_cursor)
+            return [_trip_data(record) for record in records]
+        self.assertConstantQueries('api page', page, 2, 40)
+
+    def test_sync(self):
+        for name, (model_name, serializer) in SYNC_COLLECTIONS.items():
+            with self.subTest(collection=name):
+                self.assertConstantQueries('sync', lambda limit: _sync_collection(
+                    self.env, model_name, serializer, None, limit), 2, 12)
+
+    def test_analytics_series(self):
+        today = date.today()
+        self.assertBudget('analytics series', lambda: _cost_series(
+            self.env, 'month', today - timedelta(days=365), today, company_id=self.company.id))
+
+    # ── Models ───────────────────────────────────────────────────────
+
+    def test_dashboard_aggregate(self):
+        self.assertBudget('dashboard aggregate',
+                          lambda: self.env['fleetflow.dashboard']._aggregate_dashboard_data(self.company))
+
+    def test_command_center(self):
+        Vehicle = self.env['fleetflow.vehicle'].with_company(self.company)
+        self.assertBudget('command center', lambda: Vehicle._compute_command_center_data(None, None))
+
+    def test_vehicle_totals(self):
+        Vehicle = self.env['fleetflow.vehicle']
+
+        def recompute(size):
+            vehicles = self.vehicles[:size]
+            for fname in VEHICLE_TOTAL_FIELDS:
+                self.env.add_to_compute(Vehicle._fields[fname], vehicles)
+            vehicles._recompute_recordset(VEHICLE_TOTAL_FIELDS)
+        self.assertConstantQueries('vehicle totals', recompute, 2, len(self.vehicles))
+
+    def test_dispatch_matcher(self):
+        self.assertBudget('dispatch matcher',
+                          lambda: self.env['fleetflow.trip']._match_draft_trips(self.company))
+
+    # ── Reports, exports and ingestion ───────────────────────────────
+
+    def test_cost_report(self):
+        Report = self.env['report.fleetflow.report_vehicle_monthly_cost_template']
+        today = date.today()
+        data = {
+            'date_from': str(today - timedelta(days=365)),
+            'date_to': str(today),
+            'grouping': 'month',
+        }
+        self.assertConstantQueries('cost report', lambda size: Report._get_report_values(
+            self.vehicles[:size].ids, data), 2, len(self.vehicles))
+
+    def test_telemetry_ingest(self):
+        Telemetry = self.env['fleetflow.vehicle.telemetry']
+        vehicles = self.vehicles.filtered('active')
+
+        def ingest(size):
+            Telemetry._ingest([{
+                'vehicle_id': vehicles[index % len(vehicles)].id,
+                'odometer': 200000.0 + index,
+            } for index in range(size)])
+        self.assertConstantQueries('telemetry ingest', ingest, 10, 500)
+
+    def test_csv_export(self):
+        Trip = self.env['fleetflow.trip']
+        job = self.env['fleetflow.export.job']._enqueue(
+            Trip, domain=[('company_id', 'in', self.companies.ids)], company_ids=self.companies.ids)
+        self.addCleanup(job._remove_file)
+        self.assertBudget('csv export', lambda: job._run_slice(deadline=float('inf')))
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(job.processed, Trip.search_count([('company_id', 'in', self.companies.ids)]))
@@ -0,0 +1,150 @@
+import datetime
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.fleetflow.controllers.api import SYNC_COLLECTIONS, _search_page, _sync_collection, _validator
+
+TABLE_RE = re.compile(r'\bfleetflow_\w+')
+
+# A sequential scan fails the test only when the table has more than
+# FLEETFLOW_EXPLAIN_MIN_ROWS rows and the planner expects to keep less than
+# FLEETFLOW_EXPLAIN_MAX_RATIO of them: reading most of a table sequentially
+# is the right plan, not a regression.
+EXPLAIN_MIN_ROWS = float(os.environ.get('FLEETFLOW_EXPLAIN_MIN_ROWS') or 10000)
+EXPLAIN_MAX_RATIO = float(os.environ.get('FLEETFLOW_EXPLAIN_MAX_RATIO') or 0.2)
+
+
+@contextmanager
+def capture_queries():
+    """Record ``(query, params)`` of every SELECT on a fleetflow_* table
+    executed by this thread."""
+    captured = []
+
+    def hook(cr, query, params, start, delay):
+        # odoo.tools.SQL objects carry their own parameters.
+        text, args = (query.code, query.params) if hasattr(query, 'code') else (str(query), params)
+        if text.lstrip().upper().startswith(('SELECT', 'WITH')) and TABLE_RE.search(text):
+            captured.append((text, args))
+
+    thread = threading.current_thread()
+    hooks = getattr(thread, 'query_hooks', None)
+    if hooks is None:
+        hooks = thread.query_hooks = []
+    hooks.append(hook)
+    try:
+        yield captured
+    finally:
+        hooks.remove(hook)
+
+
+def seq_scans(plan):
+    """Yield every Seq Scan node of a JSON plan."""
+    if plan.get('Node Type') == 'Seq Scan':
+        yield plan
+    for child in plan.get('Plans', ()):
+        yield from seq_scans(child)
+
+
+@tagged('fleetflow_perf', '-standard', 'post_install', '-at_install')
+class TestQueryPlans(TransactionCase):
+    """
+    EXPLAIN every query the Command Center, dashboard, API, sync, cost
+    report, daily rollup and vehicle / driver computes send to the
+    fleetflow_* tables, and fail when a selective one falls back to a
+    sequential scan on a large table.
+
+    Run on a database seeded by benchmarks/generate_fleet_data.py, with
+    several companies (FLEETFLOW_COMPANIES=4 or more) so that per-company
+    filters are selective; the test is skipped on smaller databases.
+    """
+
+    def scenarios(self):
+        """Yield ``(name, callable)`` for each hot path to check."""
+        env = self.env
+        Vehicle = env['fleetflow.vehicle']
+        Trip = env['fleetflow.trip']
+        company = Vehicle.search([]).company_id[-1:]
+        vehicle = Vehicle.search([('company_id', '=', company.id)], limit=1)
+        vehicles = Vehicle.search([('company_id', '=', company.id)], limit=500)
+        drivers = env['fleetflow.driver'].search([('company_id', '=', company.id)], limit=500)
+        today = datetime.date.today()
+        year_ago = today - datetime.timedelta(days=365)
+
+        yield 'command center KPIs', lambda: Vehicle.with_company(company)._compute_command_center_data()
+        yield 'command center KPIs (filtered)', lambda: Vehicle.with_company(company)._compute_command_center_data(
+            vehicle_type='truck', vehicle_status='available')
+        yield 'dashboard aggregate', lambda: env['fleetflow.dashboard']._aggregate_dashboard_data(company)
+
+        for model_name, domain in [
+            ('fleetflow.vehicle', []),
+            ('fleetflow.trip', [('state', '=', 'dispatched')]),
+            ('fleetflow.trip', [('vehicle_id', '=', vehicle.id)]),
+            ('fleetflow.expense', []),
+            ('fleetflow.maintenance', []),
+        ]:
+            model = env[model_name].with_company(company)
+            yield f'API page {model_name} {domain}', lambda model=model, domain=domain: _validator(
+                model, domain, 100, *_search_page(model, domain + [('id', '>', 0)], 100))
+
+        for name, (model_name, serializer) in SYNC_COLLECTIONS.items():
+            yield f'sync {name}', lambda model_name=model_name, serializer=serializer: _sync_collection(
+                env, model_name, serializer, None, 100)
+
+        Report = env['report.fleetflow.report_vehicle_monthly_cost_template']
+        yield 'cost report totals', lambda: Report._get_cost_totals(vehicles, year_ago, today, 'month')
+        yield 'daily cost refresh', lambda: env['fleetflow.vehicle.daily.cost']._refresh(
+            {(vehicle.id, today - datetime.timedelta(days=n)) for n in range(30)})
+        yield 'analytics series', lambda: env['fleetflow.vehicle.daily.cost']._read_group(
+            [('company_id', '=', company.id), ('day', '>=', year_ago)], ['day:month'], ['fuel_cost:sum'])
+
+        def recompute(records, fnames):
+            for fname in fnames:
+                env.add_to_compute(records._fields[fname], records)
+            records._recompute_recordset(fnames)
+        yield 'vehicle computes', lambda: recompute(vehicles, [
+            'trip_count', 'total_revenue', 'total_fuel_cost', 'total_maintenance_cost', 'fuel_efficiency'])
+        yield 'driver completion rate', lambda: recompute(drivers, ['completion_rate'])
+        yield 'open trips of vehicles', lambda: Trip.search_count(
+            [('vehicle_id', 'in', vehicles.ids), ('state', 'in', ('draft', 'dispatched'))])
+
+    def test_no_seq_scan_on_selective_queries(self):
+        cr = self.env.cr
+        cr.execute("SELECT relname FROM pg_class WHERE relname LIKE %s AND relkind = 'r'", ['fleetflow\\_%'])
+        for [table] in cr.fetchall():
+            cr.execute(f'ANALYZE "{table}"')
+        cr.execute("SELECT relname, reltuples FROM pg_class WHERE relname LIKE %s AND relkind = 'r'",
+                   ['fleetflow\\_%'])
+        rows = dict(cr.fetchall())
+        if max(rows.values(), default=0) <= EXPLAIN_MIN_ROWS:
+            self.skipTest("needs a database seeded by benchmarks/generate_fleet_data.py")
+
+        failures, checked = [], 0
+        for name, func in self.scenarios():
+            self.env.invalidate_all()
+            with cr.savepoint(flush=False) as savepoint:
+                with capture_queries() as queries:
+                    func()
+                    self.env.flush_all()
+                for query, params in queries:
+                    cr.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+                    plan = cr.fetchone()[0][0]['Plan']
+                    checked += 1
+                    for node in seq_scans(plan):
+                        table = node.get('Relation Name', '')
+                        total = rows.get(table, 0)
+                        if total > EXPLAIN_MIN_ROWS and node['Plan Rows'] < total * EXPLAIN_MAX_RATIO:
+                            failures.append(
+                                f"Seq Scan in {name!r} on {table} ({node['Plan Rows']:.0f} of {total:.0f} rows)\n"
+                                f"{query}\n{json.dumps(plan, indent=2)}"
+                            )
+                savepoint.rollback()
+
+        self.assertTrue(checked, "no query captured")
+        if failures:
+            self.fail(f"{len(failures)} of {checked} queries scan a large table sequentially:\n\n"
+                      + "\n\n".join(failures))
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from .common import FleetflowCommon
+
+
+@tagged('post_install', '-at_install')
+class TestTripSequence(FleetflowCommon):
+    """A trip batch gets distinct, consecutive references in one allocation."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sequence = cls.env.ref('fleetflow.seq_fleetflow_trip')
+
+    def numbers(self, references):
+        return [int(reference.rsplit('-', 1)[1]) for reference in references]
+
+    def assertConsecutive(self, references):
+        numbers = self.numbers(references)
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + len(numbers))), references)
+
+    def test_implementations(self):
+        Sequence = self.env['ir.sequence']
+        for implementation in ('standard', 'no_gap'):
+            with self.subTest(implementation=implementation):
+                self.sequence.implementation = implementation
+                references = Sequence._next_batch_by_code('fleetflow.trip', 5)
+                self.assertEqual(len(set(references)), 5)
+                self.assertConsecutive(references)
+                # The next single value follows the batch.
+                [after] = self.numbers([Sequence.next_by_code('fleetflow.trip')])
+                self.assertEqual(after, self.numbers(references)[-1] + 1)
+
+    def test_trip_batch(self):
+        self.sequence.implementation = 'no_gap'
+        vehicle, driver = self.vehicles[0], self.drivers[0]
+        trips = self.env['fleetflow.trip'].create([{
+            'vehicle_id': vehicle.id, 'driver_id': driver.id,
+            'origin': 'Lyon', 'destination': destination,
+        } for destination in ('Paris', 'Lille', 'Nantes')])
+        self.assertConsecutive(trips.mapped('name'))
+
+    def test_date_range_fallback(self):
+        self.sequence.use_date_range = True
+        IrSequence = type(self.env['ir.sequence'])
+        with patch.object(IrSequence, '_next', autospec=True, side_effect=IrSequence._next) as next_value, \
+                patch.object(IrSequence, '_next_batch_do', autospec=True) as next_batch:
+            references = self.env['ir.sequence']._next_batch_by_code('fleetflow.trip', 3)
+        self.assertEqual(next_value.call_count, 3)
+        next_batch.assert_not_called()
+        self.assertEqual(len(set(references)), 3)
+        self.assertConsecutive(references)
@@ -0,0 +1,89 @@
+import time
+
+from odoo import SUPERUSER_ID, api
+from odoo.modules.registry import Registry
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase, get_db_name
+
+from odoo.addons.fleetflow.controllers.api import _driver_data, _sync_collection
+
+# Longer than any fixed lag behind now() that delta sync could hold back.
+WRITER_GAP = 2.5
+
+
+@tagged('post_install', '-at_install')
+class TestDeltaSync(BaseCase):
+    """
+    Delta sync against transactions that commit out of order. Runs on
+    cursors of its own that really commit: a test transaction would itself
+    hold the sync horizon back.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.registry = Registry(get_db_name())
+
+    def cursor_env(self):
+        cr = self.registry.cursor()
+        self.addCleanup(cr.close)
+        return api.Environment(cr, SUPERUSER_ID, {'tracking_disable': True})
+
+    def create_drivers(self, env, count):
+        drivers = env['fleetflow.driver'].create([{
+            'name': f'Sync Driver {index}',
+            'license_number': f'DL-SYNC-{time.time_ns()}-{index}',
+        } for index in range(count)])
+        self.addCleanup(self.purge, drivers.ids)
+        return drivers
+
+    def purge(self, ids):
+        with self.registry.cursor() as cr:
+            api.Environment(cr, SUPERUSER_ID, {})['fleetflow.driver'].browse(ids).exists().unlink()
+            cr.execute("DELETE FROM fleetflow_sync_tombstone WHERE res_model = %s AND res_id = ANY(%s)",
+                       ['fleetflow.driver', ids])
+
+    def sync(self, cursor):
+        """Sync the drivers from ``cursor`` to the end, in a transaction of its own."""
+        changed, deleted = set(), set()
+        with self.registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            while True:
+                page = _sync_collection(env, 'fleetflow.driver', _driver_data, cursor, 500)
+                changed.update(row['id'] for row in page['changed'])
+                deleted.update(page['deleted'])
+                cursor = page['next_cursor']
+                if not page['has_more']:
+                    return cursor, changed, deleted
+
+    def test_reversed_commit_order(self):
+        with self.registry.cursor() as cr:
+            doomed = self.create_drivers(api.Environment(cr, SUPERUSER_ID, {'tracking_disable': True}), 2).ids
+        cursor, _changed, _deleted = self.sync(None)
+
+        # The early transaction writes first and commits last.
+        early, late = self.cursor_env(), self.cursor_env()
+        early_driver = self.create_drivers(early, 1)
+        early['fleetflow.driver'].browse(doomed[0]).unlink()
+        early.flush_all()
+        time.sleep(WRITER_GAP)
+        late_driver = self.create_drivers(late, 1)
+        late['fleetflow.driver'].browse(doomed[1]).unlink()
+        late.cr.commit()
+
+        cursor, changed, deleted = self.sync(cursor)
+        self.assertNotIn(late_driver.id, changed, "Rows are held back while an older transaction runs")
+        self.assertNotIn(doomed[1], deleted, "Tombstones are held back while an older transaction runs")
+
+        early.cr.commit()
+        cursor, more_changed, more_deleted = self.sync(cursor)
+        changed |= more_changed
+        deleted |= more_deleted
+        self.assertIn(early_driver.id, changed)
+        self.assertIn(late_driver.id, changed)
+        self.assertIn(doomed[0], deleted)
+        self.assertIn(doomed[1], deleted)
+
+        _cursor, changed, deleted = self.sync(cursor)
+        self.assertFalse(changed & {early_driver.id, late_driver.id})
+        self.assertFalse(deleted & set(doomed))
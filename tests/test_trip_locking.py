@@ -0,0 +1,121 @@
+import re
+import time
+from datetime import date, timedelta
+
+from odoo import SUPERUSER_ID, api
+from odoo.exceptions import UserError, ValidationError
+from odoo.modules.registry import Registry
+from odoo.tests import tagged
+from odoo.tests.common import BaseCase, get_db_name
+
+from .common import FleetflowCommon
+
+
+@tagged('post_install', '-at_install')
+class TestDoubleBooking(FleetflowCommon):
+    """Dispatching refuses a vehicle or a driver already on a trip."""
+
+    def draft_trip(self, vehicle, driver):
+        return self.env['fleetflow.trip'].create({
+            'vehicle_id': vehicle.id, 'driver_id': driver.id,
+            'origin': 'Lyon', 'destination': 'Marseille', 'cargo_weight': 1.0,
+        })
+
+    def test_same_vehicle_in_one_batch(self):
+        vehicle, driver, other_driver = self.vehicles[0], self.drivers[0], self.drivers[1]
+        trips = self.draft_trip(vehicle, driver) | self.draft_trip(vehicle, other_driver)
+        with self.assertRaisesRegex(ValidationError, re.escape(vehicle.display_name)):
+            trips.action_dispatch()
+
+    def test_vehicle_already_dispatched(self):
+        vehicle, driver, other_driver = self.vehicles[0], self.drivers[0], self.drivers[1]
+        self.draft_trip(vehicle, driver).action_dispatch()
+        with self.assertRaisesRegex(ValidationError, re.escape(vehicle.display_name)):
+            self.draft_trip(vehicle, other_driver).action_dispatch()
+
+    def test_driver_already_dispatched(self):
+        driver = self.drivers[0]
+        self.draft_trip(self.vehicles[0], driver).action_dispatch()
+        with self.assertRaisesRegex(ValidationError, re.escape(driver.display_name)):
+            self.draft_trip(self.vehicles[1], driver).action_dispatch()
+
+
+@tagged('post_install', '-at_install')
+class TestTripLocking(BaseCase):
+    """
+    _lock_resources against another transaction holding or changing the
+    rows. Runs on cursors of its own on committed rows: a lock only blocks
+    other transactions.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.registry = Registry(get_db_name())
+
+    def setUp(self):
+        super().setUp()
+        tag = time.time_ns()
+        with self.registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {'tracking_disable': True})
+            vehicles = env['fleetflow.vehicle'].create([{
+                'name': f'Lock Van {index}', 'license_plate': f'LOCK-{tag}-{index}',
+                'vehicle_type': 'van', 'max_capacity': 2.0,
+            } for index in range(2)])
+            drivers = env['fleetflow.driver'].create([{
+                'name': f'Lock Driver {index}', 'license_number': f'DL-LOCK-{tag}-{index}',
+                'license_category': 'van', 'license_expiry': date.today() + timedelta(days=365),
+            } for index in range(2)])
+            trips = env['fleetflow.trip'].create([{
+                'vehicle_id': vehicle.id, 'driver_id': driver.id,
+                'origin': 'Lyon', 'destination': 'Paris', 'cargo_weight': 1.0,
+            } for vehicle, driver in zip(vehicles, drivers)])
+            self.trip_ids, self.vehicle_ids, self.driver_ids = trips.ids, vehicles.ids, drivers.ids
+        self.addCleanup(self.purge)
+
+    def purge(self):
+        with self.registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {'tracking_disable': True})
+            env['fleetflow.trip'].browse(self.trip_ids).unlink()
+            env['fleetflow.vehicle'].browse(self.vehicle_ids).unlink()
+            env['fleetflow.driver'].browse(self.driver_ids).unlink()
+            cr.execute("DELETE FROM fleetflow_sync_tombstone WHERE res_model = 'fleetflow.trip' AND res_id = ANY(%s)"
+                       " OR res_model = 'fleetflow.vehicle' AND res_id = ANY(%s)"
+                       " OR res_model = 'fleetflow.driver' AND res_id = ANY(%s)",
+                       [self.trip_ids, self.vehicle_ids, self.driver_ids])
+
+    def trips(self):
+        """The test trips in a new transaction."""
+        cr = self.registry.cursor()
+        self.addCleanup(cr.close)
+        return api.Environment(cr, SUPERUSER_ID, {'tracking_disable': True})['fleetflow.trip'].browse(self.trip_ids)
+
+    def hold(self, table, record_id):
+        """Lock a row from another transaction until the end of the test."""
+        cr = self.registry.cursor()
+        self.addCleanup(cr.close)
+        cr.execute(f'SELECT id FROM "{table}" WHERE id = %s FOR UPDATE', [record_id])
+        return cr
+
+    def test_nowait(self):
+        self.hold('fleetflow_driver', self.driver_ids[1])
+        with self.assertRaisesRegex(UserError, 'another dispatcher is updating'):
+            self.trips()._lock_resources('nowait')
+
+    def test_skip_locked(self):
+        self.hold('fleetflow_vehicle', self.vehicle_ids[0])
+        trips = self.trips()
+        locked = trips._lock_resources('skip_locked')
+        self.assertEqual(locked, trips[1])
+        locked.action_dispatch()
+        self.assertEqual(trips.mapped('state'), ['draft', 'dispatched'])
+
+    def test_wait_after_concurrent_change(self):
+        trips = self.trips()
+        # Take the snapshot, then let another transaction change a trip.
+        trips.mapped('name')
+        holder = self.hold('fleetflow_trip', self.trip_ids[0])
+        holder.execute("UPDATE fleetflow_trip SET revenue = 100 WHERE id = %s", [self.trip_ids[0]])
+        holder.commit()
+        with self.assertRaisesRegex(UserError, 'changed by another dispatcher'):
+            trips._lock_resources()
@@ -0,0 +1,66 @@
+from odoo.tests import tagged
+
+from .common import FleetflowCommon
+
+
+@tagged('post_install', '-at_install')
+class TestVehicleTotals(FleetflowCommon):
+    """The grouped-SQL vehicle totals equal plain sums over the same rows."""
+
+    def expected_totals(self, vehicle):
+        trips = self.env['fleetflow.trip'].search([('vehicle_id', '=', vehicle.id)])
+        completed = trips.filtered(lambda t: t.state == 'completed')
+        expenses = self.env['fleetflow.expense'].search([('vehicle_id', '=', vehicle.id)])
+        maintenance = self.env['fleetflow.maintenance'].search([('vehicle_id', '=', vehicle.id)])
+        fuel_cost = sum(expense.fuel_cost for expense in expenses)
+        liters = sum(expense.liters for expense in expenses)
+        maintenance_cost = sum(job.cost for job in maintenance)
+        distance = sum(trip.end_odometer - trip.start_odometer for trip in completed)
+        revenue = sum(trip.revenue for trip in completed)
+        operational_cost = fuel_cost + maintenance_cost
+        return {
+            'trip_count': len(trips),
+            'total_revenue': revenue,
+            'total_fuel_cost': fuel_cost,
+            'total_liters': liters,
+            'total_maintenance_cost': maintenance_cost,
+            'total_operational_cost': operational_cost,
+            'fuel_efficiency': distance / liters if liters else 0.0,
+            'roi': (revenue - operational_cost) / vehicle.acquisition_cost if vehicle.acquisition_cost else 0.0,
+        }
+
+    def assertTotals(self, vehicles):
+        self.env.flush_all()
+        self.env.invalidate_all()
+        for vehicle in vehicles:
+            with self.subTest(vehicle=vehicle.name):
+                for fname, expected in self.expected_totals(vehicle).items():
+                    self.assertAlmostEqual(vehicle[fname], expected, places=6, msg=fname)
+
+    def test_seeded_totals(self):
+        self.assertTrue(self.vehicles.filtered(lambda v: not v.active))
+        self.assertTrue(self.vehicles.filtered(lambda v: v.company_id == self.other_company))
+        self.assertTotals(self.vehicles.with_context(active_test=False))
+
+    def test_idle_vehicle(self):
+        self.assertRecordValues(self.idle_vehicle, [{
+            'trip_count': 0,
+            'total_revenue': 0.0,
+            'total_operational_cost': 0.0,
+            'fuel_efficiency': 0.0,
+            'roi': 0.0,
+        }])
+
+    def test_totals_follow_changes(self):
+        vehicle = self.vehicles.filtered(lambda v: v.company_id == self.other_company)[0]
+        trips = self.env['fleetflow.trip'].search([('vehicle_id', '=', vehicle.id)])
+        draft = trips.filtered(lambda t: t.state == 'draft')
+        completed = trips.filtered(lambda t: t.state == 'completed')
+
+        draft.write({'state': 'cancelled'})
+        completed[0].revenue += 125.0
+        completed[1].expense_ids.unlink()
+        completed[2].unlink()
+        self.env['fleetflow.expense'].create({'vehicle_id': vehicle.id, 'liters': 8.0, 'fuel_cost': 14.5})
+        self.env['fleetflow.maintenance'].search([('vehicle_id', '=', vehicle.id)], limit=1).cost = 999.0
+        self.assertTotals(vehicle)
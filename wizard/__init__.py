@@ -0,0 +1 @@
+from . import vehicle_cost_report_wizard
@@ -0,0 +1,47 @@
+from odoo import api, fields, models
+from odoo.exceptions import ValidationError
+from odoo.tools import date_utils
+
+
+class FleetflowVehicleCostReportWizard(models.TransientModel):
+    """Prints the vehicle cost summary for any period, grouped by month or
+    quarter. Leaving vehicles empty prints the whole fleet."""
+    _name = 'fleetflow.vehicle.cost.report.wizard'
+    _description = 'Vehicle Cost Report Wizard'
+
+    date_from = fields.Date(required=True, default=lambda self: date_utils.start_of(fields.Date.context_today(self), 'month'))
+    date_to = fields.Date(required=True, default=fields.Date.context_today)
+    grouping = fields.Selection(
+        [('month', 'Month'), ('quarter', 'Quarter')],
+        required=True,
+        default='month',
+    )
+    vehicle_ids = fields.Many2many(
+        'fleetflow.vehicle',
+        string='Vehicles',
+        default=lambda self: self._default_vehicle_ids(),
+        help='Leave empty to report on the whole fleet.',
+    )
+
+    @api.model
+    def _default_vehicle_ids(self):
+        if self.env.context.get('active_model') == 'fleetflow.vehicle':
+            return [(6, 0, self.env.context.get('active_ids', []))]
+        return []
+
+    @api.constrains('date_from', 'date_to')
+    def _check_dates(self):
+        for wizard in self:
+            if wizard.date_from > wizard.date_to:
+                raise ValidationError('The start date must be before the end date.')
+
+    def action_print(self):
+        self.ensure_one()
+        data = {
+            'date_from': fields.Date.to_string(self.date_from),
+            'date_to': fields.Date.to_string(self.date_to),
+            'grouping': self.grouping,
+            'all_vehicles': not self.vehicle_ids,
+        }
+        return self.env.ref('fleetflow.action_report_vehicle_monthly_cost_summary').report_action(
+            self.vehicle_ids, data=data)